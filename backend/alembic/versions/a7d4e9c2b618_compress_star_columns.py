@@ -0,0 +1,109 @@
+"""compress star columns
+
+Revision ID: a7d4e9c2b618
+Revises: f5b1d3e7a920
+Create Date: 2026-10-19 16:40:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.base_class import compress_text, decompress_text
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d4e9c2b618'
+down_revision: Union[str, None] = 'f5b1d3e7a920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+COMPRESSED_COLUMNS = {
+    'problems': ('situation', 'task', 'action', 'result'),
+    'interview_questions': ('answer',),
+}
+
+
+def _rewrite(bind, table, columns, convert) -> None:
+    """Convert every row, one set-based UPDATE per batch.
+
+    Run inside ``autocommit_block()``: each batch commits on its own, so
+    no row lock outlives its batch and the table stays writable.
+    """
+    names = ', '.join(columns)
+    assignments = ', '.join(f"{column} = v.{column}" for column in columns)
+    last_id = ''
+    while True:
+        rows = bind.execute(
+            sa.text(
+                f"SELECT id, {names} FROM {table} "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        params = {}
+        values = []
+        for i, row in enumerate(rows):
+            params[f"id_{i}"] = row[0]
+            for column, value in zip(columns, row[1:]):
+                params[f"{column}_{i}"] = convert(value)
+            values.append(
+                f"(:id_{i}, {', '.join(f':{column}_{i}' for column in columns)})"
+            )
+        bind.execute(
+            sa.text(
+                f"WITH v (id, {names}) AS (VALUES {', '.join(values)}) "
+                f"UPDATE {table} SET {assignments} FROM v WHERE {table}.id = v.id"
+            ),
+            params,
+        )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == 'postgresql'
+    for table, columns in COMPRESSED_COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(
+                    column,
+                    type_=sa.LargeBinary(),
+                    existing_nullable=False,
+                    postgresql_using=f"convert_to({column}, 'UTF8')",
+                )
+        if is_postgres:
+            # Values arrive compressed; stop TOAST from compressing them again
+            for column in columns:
+                op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET STORAGE EXTERNAL")
+        # Commits the type change first, releasing its ACCESS EXCLUSIVE lock
+        with op.get_context().autocommit_block():
+            _rewrite(bind, table, columns, lambda value: compress_text(decompress_text(value)))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == 'postgresql'
+    # bytea takes raw UTF-8; SQLite keeps whatever is written, so give it str
+    if is_postgres:
+        to_text = lambda value: decompress_text(value).encode()  # noqa: E731
+    else:
+        to_text = decompress_text
+    for table, columns in COMPRESSED_COLUMNS.items():
+        with op.get_context().autocommit_block():
+            _rewrite(bind, table, columns, to_text)
+        if is_postgres:
+            for column in columns:
+                op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET STORAGE EXTENDED")
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(
+                    column,
+                    type_=sa.Text(),
+                    existing_nullable=False,
+                    postgresql_using=f"convert_from({column}, 'UTF8')",
+                )
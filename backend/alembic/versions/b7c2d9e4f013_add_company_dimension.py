@@ -0,0 +1,118 @@
+"""add company dimension and interview question indexes
+
+Revision ID: b7c2d9e4f013
+Revises: a1b60ade52db
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+import re
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c2d9e4f013'
+down_revision: Union[str, None] = 'a1b60ade52db'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# A frozen copy of app.services.companies.normalize_company_name, so later
+# changes there can't change what this migration wrote
+_LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation",
+    "co", "company", "gmbh", "plc", "pvt", "private", "sa", "ag", "bv",
+}
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def _normalize(name: str) -> str:
+    words = _NON_ALNUM.sub(" ", name.lower()).split()
+    while len(words) > 1 and words[-1] in _LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == "postgresql"
+    if is_postgres:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_table('companies',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('normalized_name', sa.String(length=255), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('normalized_name')
+    )
+    op.create_index(
+        'ix_companies_normalized_name_trgm',
+        'companies',
+        ['normalized_name'],
+        postgresql_using='gin',
+        postgresql_ops={'normalized_name': 'gin_trgm_ops'},
+    )
+    op.create_table('company_aliases',
+    sa.Column('alias', sa.String(length=255), nullable=False),
+    sa.Column('company_id', sa.String(length=36), nullable=False),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+    sa.PrimaryKeyConstraint('alias')
+    )
+    op.create_index(op.f('ix_company_aliases_company_id'), 'company_aliases', ['company_id'], unique=False)
+
+    with op.batch_alter_table('interview_questions') as batch_op:
+        batch_op.add_column(sa.Column('company_id', sa.String(length=36), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_interview_questions_company_id', 'companies', ['company_id'], ['id']
+        )
+    op.create_index('ix_interview_questions_user_asked_date', 'interview_questions', ['user_id', 'asked_date'], unique=False)
+    op.create_index('ix_interview_questions_user_company', 'interview_questions', ['user_id', 'company_id'], unique=False)
+
+    # Backfill: one company per normalized name, every raw spelling an alias
+    raw_names = [
+        row[0]
+        for row in bind.execute(
+            sa.text("SELECT DISTINCT company FROM interview_questions")
+        )
+    ]
+    company_ids: dict[str, str] = {}
+    aliases: set[str] = set()
+    for raw in raw_names:
+        normalized = _normalize(raw) or raw.strip().lower()
+        if normalized not in company_ids:
+            company_ids[normalized] = str(uuid.uuid4())
+            bind.execute(
+                sa.text(
+                    "INSERT INTO companies (id, name, normalized_name, created_at) "
+                    "VALUES (:id, :name, :normalized, CURRENT_TIMESTAMP)"
+                ),
+                {"id": company_ids[normalized], "name": raw.strip(), "normalized": normalized},
+            )
+        for alias in (normalized, raw.strip()):
+            if alias not in aliases:
+                aliases.add(alias)
+                bind.execute(
+                    sa.text("INSERT INTO company_aliases (alias, company_id) VALUES (:alias, :id)"),
+                    {"alias": alias, "id": company_ids[normalized]},
+                )
+        bind.execute(
+            sa.text("UPDATE interview_questions SET company_id = :id WHERE company = :raw"),
+            {"id": company_ids[normalized], "raw": raw},
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_interview_questions_user_company', table_name='interview_questions')
+    op.drop_index('ix_interview_questions_user_asked_date', table_name='interview_questions')
+    with op.batch_alter_table('interview_questions') as batch_op:
+        batch_op.drop_constraint('fk_interview_questions_company_id', type_='foreignkey')
+        batch_op.drop_column('company_id')
+    op.drop_index(op.f('ix_company_aliases_company_id'), table_name='company_aliases')
+    op.drop_table('company_aliases')
+    op.drop_index('ix_companies_normalized_name_trgm', table_name='companies')
+    op.drop_table('companies')
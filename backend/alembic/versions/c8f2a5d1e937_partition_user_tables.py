@@ -0,0 +1,34 @@
+"""hash partition per-user tables
+
+Revision ID: c8f2a5d1e937
+Revises: a7d4e9c2b618
+Create Date: 2026-10-19 17:55:03.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.partitioning import convert_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f2a5d1e937'
+down_revision: Union[str, None] = 'a7d4e9c2b618'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS = 16
+PARTITIONED_TABLES = ('problems', 'learnings', 'interview_questions')
+
+
+def upgrade() -> None:
+    # Runs outside the migration transaction in short batches; see
+    # app/db/partitioning.py. A no-op on SQLite.
+    for table in PARTITIONED_TABLES:
+        convert_table(op, table, partitions=PARTITIONS)
+
+
+def downgrade() -> None:
+    for table in PARTITIONED_TABLES:
+        convert_table(op, table, partitions=None)
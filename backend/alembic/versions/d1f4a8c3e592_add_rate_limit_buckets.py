@@ -0,0 +1,74 @@
+"""add rate_limit_buckets table
+
+Revision ID: d1f4a8c3e592
+Revises: b3e9d7f4a216
+Create Date: 2026-10-19 21:12:08.347120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1f4a8c3e592'
+down_revision: Union[str, None] = 'b3e9d7f4a216'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Only RATE_LIMIT_BACKEND=postgres uses these. The table is unlogged:
+# buckets are cheap to lose in a crash and shouldn't cost WAL per request.
+TAKE_FUNCTION = """
+CREATE OR REPLACE FUNCTION rate_limit_take(bucket text, per_second float8, burst float8)
+RETURNS float8 LANGUAGE plpgsql AS $$
+DECLARE
+    available float8;
+    last_update timestamptz;
+    now_ts timestamptz;
+BEGIN
+    INSERT INTO rate_limit_buckets (key, tokens, updated_at)
+    VALUES (bucket, burst, clock_timestamp())
+    ON CONFLICT (key) DO NOTHING;
+
+    SELECT tokens, updated_at INTO available, last_update
+    FROM rate_limit_buckets WHERE key = bucket FOR UPDATE;
+    -- Read the clock only once the row is ours
+    now_ts := clock_timestamp();
+    available := LEAST(
+        burst,
+        available + per_second * GREATEST(0, EXTRACT(EPOCH FROM now_ts - last_update))
+    );
+
+    IF available >= 1 THEN
+        UPDATE rate_limit_buckets SET tokens = available - 1, updated_at = now_ts
+        WHERE key = bucket;
+        RETURN 0;
+    END IF;
+    UPDATE rate_limit_buckets SET tokens = available, updated_at = now_ts
+    WHERE key = bucket;
+    RETURN (1 - available) / per_second;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.create_table('rate_limit_buckets',
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('tokens', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('key'),
+    prefixes=['UNLOGGED'],
+    )
+    op.execute(TAKE_FUNCTION)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP FUNCTION rate_limit_take(text, float8, float8)")
+    op.drop_table('rate_limit_buckets')
@@ -0,0 +1,34 @@
+"""add public portfolio fields
+
+Revision ID: d9a3b6c1e804
+Revises: c4e81f2a6d57
+Create Date: 2026-10-19 11:20:45.337610
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a3b6c1e804'
+down_revision: Union[str, None] = 'c4e81f2a6d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('portfolio_slug', sa.String(length=64), nullable=True))
+    op.add_column('users', sa.Column('portfolio_public', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.create_index(op.f('ix_users_portfolio_slug'), 'users', ['portfolio_slug'], unique=True)
+    op.add_column('problems', sa.Column('is_featured', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('problems') as batch_op:
+        batch_op.drop_column('is_featured')
+    op.drop_index(op.f('ix_users_portfolio_slug'), table_name='users')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('portfolio_public')
+        batch_op.drop_column('portfolio_slug')
@@ -0,0 +1,51 @@
+"""add daily_activity rollup table
+
+Revision ID: e2f7c8a9b315
+Revises: d9a3b6c1e804
+Create Date: 2026-10-19 12:41:02.874113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f7c8a9b315'
+down_revision: Union[str, None] = 'd9a3b6c1e804'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('daily_activity',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('problems', sa.Integer(), nullable=False),
+    sa.Column('learnings', sa.Integer(), nullable=False),
+    sa.Column('interview_questions', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+
+    # Backfill from the raw tables
+    op.execute(
+        """
+        INSERT INTO daily_activity (user_id, day, problems, learnings, interview_questions)
+        SELECT user_id, day, SUM(p), SUM(l), SUM(q)
+        FROM (
+            SELECT user_id, solved_at AS day, 1 AS p, 0 AS l, 0 AS q FROM problems
+            UNION ALL
+            SELECT user_id, learned_date, 0, 1, 0 FROM learnings
+            UNION ALL
+            SELECT user_id, asked_date, 0, 0, 1 FROM interview_questions
+        ) AS activity
+        WHERE day IS NOT NULL
+        GROUP BY user_id, day
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('daily_activity')
@@ -0,0 +1,83 @@
+"""add minhash signatures and lsh buckets
+
+Revision ID: f5b1d3e7a920
+Revises: e2f7c8a9b315
+Create Date: 2026-10-19 14:05:27.661930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.minhash import band_hashes, signature
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5b1d3e7a920'
+down_revision: Union[str, None] = 'e2f7c8a9b315'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+SIGNED_TABLES = {
+    'problems': ('title', 'situation', 'task', 'action', 'result'),
+    'interview_questions': ('question', 'answer'),
+}
+
+
+def upgrade() -> None:
+    op.add_column('problems', sa.Column('minhash', sa.LargeBinary(), nullable=True))
+    op.add_column('interview_questions', sa.Column('minhash', sa.LargeBinary(), nullable=True))
+    op.create_table('lsh_buckets',
+    sa.Column('entity_id', sa.String(length=36), nullable=False),
+    sa.Column('band', sa.Integer(), nullable=False),
+    sa.Column('entity_type', sa.String(length=50), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('bucket', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('entity_id', 'band')
+    )
+    op.create_index('ix_lsh_buckets_lookup', 'lsh_buckets', ['user_id', 'entity_type', 'band', 'bucket'], unique=False)
+
+    bind = op.get_bind()
+    for table, fields in SIGNED_TABLES.items():
+        last_id = ''
+        while True:
+            rows = bind.execute(
+                sa.text(
+                    f"SELECT id, user_id, {', '.join(fields)} FROM {table} "
+                    "WHERE id > :last_id ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": BATCH_SIZE},
+            ).all()
+            if not rows:
+                break
+            buckets = []
+            for row in rows:
+                sig = signature(" ".join(value or "" for value in row[2:]))
+                bind.execute(
+                    sa.text(f"UPDATE {table} SET minhash = :sig WHERE id = :id"),
+                    {"sig": sig, "id": row[0]},
+                )
+                buckets.extend(
+                    {"entity_id": row[0], "band": band, "entity_type": table, "user_id": row[1], "bucket": bucket}
+                    for band, bucket in enumerate(band_hashes(sig))
+                )
+            bind.execute(
+                sa.text(
+                    "INSERT INTO lsh_buckets (entity_id, band, entity_type, user_id, bucket) "
+                    "VALUES (:entity_id, :band, :entity_type, :user_id, :bucket)"
+                ),
+                buckets,
+            )
+            last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_index('ix_lsh_buckets_lookup', table_name='lsh_buckets')
+    op.drop_table('lsh_buckets')
+    with op.batch_alter_table('interview_questions') as batch_op:
+        batch_op.drop_column('minhash')
+    with op.batch_alter_table('problems') as batch_op:
+        batch_op.drop_column('minhash')
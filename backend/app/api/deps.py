@@ -1,26 +1,28 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 import jwt
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.db import statements
+from app.db.session import AsyncSessionLocal, get_db
 from app.models.user import User
 from app.schemas.user import TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl="/api/v1/auth/login", auto_error=False
+)
 
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+
+def decode_token_subject(token: str) -> str:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -30,9 +32,45 @@ async def get_current_user(
             raise credentials_exception
     except jwt.PyJWTError:
         raise credentials_exception
+    return token_data.sub
 
-    result = await db.execute(select(User).where(User.id == token_data.sub))
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    user_id = decode_token_subject(token)
+    result = await db.execute(statements.user_by_id, {"user_id": user_id})
     user = result.scalar_one_or_none()
     if user is None:
         raise credentials_exception
     return user
+
+
+async def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
+    if str(current_user.id) not in settings.ADMIN_USER_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required"
+        )
+    return current_user
+
+
+async def get_stream_user_id(
+    header_token: str | None = Depends(optional_oauth2_scheme),
+    access_token: str | None = Query(None),
+) -> str:
+    """Authenticate a long-lived streaming request.
+
+    EventSource cannot send headers, so the token may also come from the
+    ``access_token`` query parameter. The user lookup uses its own
+    short-lived session so the stream never pins a pooled connection.
+    """
+    token = header_token or access_token
+    if not token:
+        raise credentials_exception
+    user_id = decode_token_subject(token)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User.id).where(User.id == user_id))
+        if result.scalar_one_or_none() is None:
+            raise credentials_exception
+    return user_id
@@ -1,8 +1,11 @@
+import logging
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import RedirectResponse
+from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from authlib.integrations.starlette_client import OAuth
 from pydantic import BaseModel
@@ -10,10 +13,13 @@ import httpx
 
 from app.api.deps import get_current_user
 from app.core.config import settings
-from app.core.security import create_access_token
-from app.db.session import get_db
+from app.core.security import PasswordHasherBusy, create_access_token, password_hasher
+from app.db.session import get_db, shard_router
 from app.models.user import User
-from app.schemas.user import Token, UserResponse
+from app.schemas.user import Token, UserCreate, UserResponse
+
+
+logger = logging.getLogger(__name__)
 
 
 class GoogleCallbackRequest(BaseModel):
@@ -69,15 +75,17 @@ async def google_callback(
                 },
             )
 
-            # Log the response for debugging
-            print(f"Google token response status: {token_response.status_code}")
-            print(f"Google token response: {token_response.text}")
+            logger.debug(
+                "Google token exchange returned %s: %s",
+                token_response.status_code,
+                token_response.text,
+            )
 
             token_data = token_response.json()
 
             if "error" in token_data:
                 error_msg = token_data.get('error_description', token_data.get('error', 'Unknown error'))
-                print(f"Google OAuth error: {error_msg}")
+                logger.warning("Google OAuth error: %s", error_msg)
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"OAuth error: {error_msg}",
@@ -109,7 +117,6 @@ async def google_callback(
             )
         )
         user = result.scalar_one_or_none()
-        print(user)
         if not user:
             # Create new user
             user = User(
@@ -118,11 +125,10 @@ async def google_callback(
                 google_id=google_id,
                 hashed_password=None,  # No password for OAuth users
             )
-            print(f"user created  {user}")
-            print(user)
             db.add(user)
             await db.flush()
-            await db.refresh(user)
+            await shard_router.place_new_user(db, user)
+            logger.info("Created user %s from Google sign-in", user.id)
         else:
             # Update google_id if not set
             if not user.google_id:
@@ -131,22 +137,95 @@ async def google_callback(
 
         # Create access token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        print(f"access token  {access_token_expires}")
         jwt_token = create_access_token(
             subject=str(user.id), expires_delta=access_token_expires
         )
-        print(f"jwt token is {jwt_token}")
         return Token(access_token=jwt_token, token_type="bearer", user=user)
 
     except HTTPException:
         raise
     except Exception as e:
+        logger.exception("Google sign-in failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Authentication failed: {str(e)}",
         )
 
 
+hasher_busy_exception = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Too many sign-ins right now, please retry",
+    headers={"Retry-After": "1"},
+)
+
+
+@router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
+async def register(
+    user_in: UserCreate,
+    db: AsyncSession = Depends(get_db),
+):
+    """Create a password account"""
+    email = user_in.email.strip().lower()
+    result = await db.execute(select(User.id).where(User.email == email))
+    if result.scalar_one_or_none() is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
+    try:
+        hashed_password = await password_hasher.hash(user_in.password)
+    except PasswordHasherBusy:
+        raise hasher_busy_exception
+
+    user = User(email=email, full_name=user_in.full_name, hashed_password=hashed_password)
+    db.add(user)
+    try:
+        await db.flush()
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
+    await shard_router.place_new_user(db, user)
+    return Token(
+        access_token=create_access_token(subject=str(user.id)),
+        token_type="bearer",
+        user=user,
+    )
+
+
+@router.post("/login", response_model=Token)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_db),
+):
+    """Exchange email and password for an access token"""
+    result = await db.execute(
+        select(User).where(User.email == form_data.username.strip().lower())
+    )
+    user = result.scalar_one_or_none()
+    try:
+        valid, new_hash = await password_hasher.verify(
+            form_data.password, user.hashed_password if user else None
+        )
+    except PasswordHasherBusy:
+        raise hasher_busy_exception
+    if not valid or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if new_hash is not None:
+        # Stored with old cost parameters; upgrade while we have the password
+        user.hashed_password = new_hash
+    return Token(
+        access_token=create_access_token(subject=str(user.id)),
+        token_type="bearer",
+        user=user,
+    )
+
+
 @router.get("/me", response_model=UserResponse)
 async def read_current_user(current_user: User = Depends(get_current_user)):
     """Get current authenticated user"""
@@ -0,0 +1,136 @@
+import asyncio
+import weakref
+from contextlib import nullcontext
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.pool import QueuePool
+
+from app.api.deps import get_current_user
+from app.db import statements
+from app.db.pagination import paginate
+from app.db.session import get_db, sibling_session
+from app.models.user import User
+from app.schemas.bootstrap import BootstrapResponse
+from app.schemas.learning import LearningListResponse
+from app.schemas.problem import ProblemListResponse
+from app.services.dashboard import load_dashboard_stats
+
+router = APIRouter()
+
+# Matches the first page the problems and learnings screens ask for
+PAGE_SIZE = 10
+
+# The request's own connection plus one per sibling session
+CONNECTIONS_PER_BOOTSTRAP = 5
+
+# Per pool; pools are dropped with their engines
+_permits: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+async def _problems(db: AsyncSession, user_id: str) -> ProblemListResponse:
+    result = await paginate(
+        db,
+        statements.problem_page,
+        1,
+        PAGE_SIZE,
+        total=statements.problem_total,
+        params={"user_id": user_id},
+    )
+    return ProblemListResponse(
+        items=result.items,
+        total=result.total,
+        has_more=result.has_more,
+        page=1,
+        size=PAGE_SIZE,
+    )
+
+
+async def _learnings(db: AsyncSession, user_id: str) -> LearningListResponse:
+    result = await paginate(
+        db,
+        statements.learning_page,
+        1,
+        PAGE_SIZE,
+        total=statements.learning_total,
+        params={"user_id": user_id},
+    )
+    return LearningListResponse(
+        items=result.items,
+        total=result.total,
+        has_more=result.has_more,
+        page=1,
+        size=PAGE_SIZE,
+    )
+
+
+async def _all(db: AsyncSession, statement, user_id: str) -> list:
+    return (await db.execute(statement, {"user_id": user_id})).scalars().all()
+
+
+async def _on_sibling(db: AsyncSession, load, *args):
+    async with sibling_session(db) as sibling:
+        return await load(sibling, *args)
+
+
+def _concurrency_permits(db: AsyncSession) -> asyncio.Semaphore | None:
+    """This worker's cap on concurrent bootstraps reading from ``db``'s pool.
+
+    A concurrent bootstrap waits for four more connections while holding
+    its own, so enough of them at once would each hold one and wait on
+    the others forever. Permits are sized so that all holders together
+    stay below the pool's capacity. None for pools without a limit.
+    """
+    pool = db.sync_session.get_bind().pool
+    if pool not in _permits:
+        capacity = None
+        if isinstance(pool, QueuePool) and pool._max_overflow >= 0:
+            capacity = pool.size() + pool._max_overflow
+        _permits[pool] = (
+            None
+            if capacity is None
+            else asyncio.Semaphore((capacity - 1) // CONNECTIONS_PER_BOOTSTRAP)
+        )
+    return _permits[pool]
+
+
+@router.get("", response_model=BootstrapResponse)
+async def get_bootstrap(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """What the app shows right after sign-in, in one round trip.
+
+    The user plus what /dashboard/stats and the first pages of
+    /problems, /learnings, /experiences and /certifications return.
+    The parts are loaded concurrently: the stats on the request's own
+    session, the rest each on a sibling session and connection, so the
+    response takes about as long as the slowest part. When every permit
+    is taken (see ``_concurrency_permits``) the parts are read one after
+    another on the request's connection instead of queueing for more.
+    """
+    user_id = current_user.id
+    permits = _concurrency_permits(db)
+    if permits is not None and permits.locked():
+        stats = await load_dashboard_stats(db, user_id)
+        problems = await _problems(db, user_id)
+        learnings = await _learnings(db, user_id)
+        experiences = await _all(db, statements.experience_list, user_id)
+        certifications = await _all(db, statements.certification_list, user_id)
+    else:
+        async with permits or nullcontext():
+            stats, problems, learnings, experiences, certifications = await asyncio.gather(
+                load_dashboard_stats(db, user_id),
+                _on_sibling(db, _problems, user_id),
+                _on_sibling(db, _learnings, user_id),
+                _on_sibling(db, _all, statements.experience_list, user_id),
+                _on_sibling(db, _all, statements.certification_list, user_id),
+            )
+    return BootstrapResponse(
+        user=current_user,
+        stats=stats,
+        problems=problems,
+        learnings=learnings,
+        experiences=experiences,
+        certifications=certifications,
+    )
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
+from app.db import statements
 from app.db.session import get_db
 from app.models.certification import Certification
 from app.models.user import User
@@ -17,9 +17,7 @@ async def list_certifications(
     current_user: User = Depends(get_current_user),
 ):
     result = await db.execute(
-        select(Certification)
-        .where(Certification.user_id == current_user.id)
-        .order_by(Certification.issue_date.desc())
+        statements.certification_list, {"user_id": current_user.id}
     )
     certifications = result.scalars().all()
     return certifications
@@ -41,5 +39,4 @@ async def create_certification(
     )
     db.add(certification)
     await db.flush()
-    await db.refresh(certification)
     return certification
@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import func, select
+from collections import defaultdict
+from datetime import date, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.db.session import get_db
-from app.models.certification import Certification
-from app.models.experience import Experience
-from app.models.problem import Problem
+from app.models.daily_activity import ACTIVITY_DATES, DailyActivity
 from app.models.user import User
-from app.schemas.dashboard import DashboardStats
+from app.schemas.dashboard import ActivityPoint, ActivityResponse, DashboardStats, SkillGraph
+from app.services.dashboard import load_dashboard_stats
+from app.services.skills import get_skill_graph
 
 router = APIRouter()
 
@@ -18,51 +21,69 @@ async def get_dashboard_stats(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Total problems
-    problems_result = await db.execute(
-        select(func.count()).select_from(Problem).where(
-            Problem.user_id == current_user.id
-        )
-    )
-    total_problems = problems_result.scalar()
+    return await load_dashboard_stats(db, current_user.id)
+
+
+def _bucket(rows: list[ActivityPoint], key) -> list[ActivityPoint]:
+    buckets: dict[date, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for row in rows:
+        bucket = buckets[key(row.date)]
+        for name in ACTIVITY_DATES:
+            bucket[name] += getattr(row, name)
+    return [
+        ActivityPoint(date=start, total=sum(counts.values()), **counts)
+        for start, counts in sorted(buckets.items())
+    ]
+
+
+@router.get("/activity", response_model=ActivityResponse)
+async def get_dashboard_activity(
+    start: date | None = Query(None),
+    end: date | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Heatmap and weekly/monthly series read from the daily rollup.
 
-    # Total experiences
-    experiences_result = await db.execute(
-        select(func.count()).select_from(Experience).where(
-            Experience.user_id == current_user.id
+    Only days with activity are returned; weekly buckets start on Monday.
+    """
+    end = end or date.today()
+    start = start or end - timedelta(days=364)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end",
         )
-    )
-    total_experiences = experiences_result.scalar()
 
-    # Total certifications
-    certifications_result = await db.execute(
-        select(func.count()).select_from(Certification).where(
-            Certification.user_id == current_user.id
+    result = await db.execute(
+        select(DailyActivity)
+        .where(
+            DailyActivity.user_id == current_user.id,
+            DailyActivity.day >= start,
+            DailyActivity.day <= end,
         )
+        .order_by(DailyActivity.day)
     )
-    total_certifications = certifications_result.scalar()
+    daily = []
+    for row in result.scalars():
+        counts = {name: getattr(row, name) for name in ACTIVITY_DATES}
+        if any(counts.values()):
+            daily.append(
+                ActivityPoint(date=row.day, total=sum(counts.values()), **counts)
+            )
 
-    # Problems by difficulty
-    difficulty_result = await db.execute(
-        select(Problem.difficulty, func.count())
-        .where(Problem.user_id == current_user.id)
-        .group_by(Problem.difficulty)
+    return ActivityResponse(
+        start=start,
+        end=end,
+        daily=daily,
+        weekly=_bucket(daily, lambda d: d - timedelta(days=d.weekday())),
+        monthly=_bucket(daily, lambda d: d.replace(day=1)),
     )
-    problems_by_difficulty = {row[0]: row[1] for row in difficulty_result.all()}
 
-    # Recent 5 problems
-    recent_result = await db.execute(
-        select(Problem)
-        .where(Problem.user_id == current_user.id)
-        .order_by(Problem.created_at.desc())
-        .limit(5)
-    )
-    recent_problems = recent_result.scalars().all()
 
-    return DashboardStats(
-        total_problems=total_problems,
-        total_experiences=total_experiences,
-        total_certifications=total_certifications,
-        problems_by_difficulty=problems_by_difficulty,
-        recent_problems=recent_problems,
-    )
+@router.get("/skills", response_model=SkillGraph)
+async def get_dashboard_skills(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await get_skill_graph(db, current_user.id)
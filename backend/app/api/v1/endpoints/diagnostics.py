@@ -0,0 +1,104 @@
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_admin_user
+from app.core.config import settings
+from app.core.ratelimit import admission_stats, buckets
+from app.db.session import get_db, slow_query_log
+from app.schemas.diagnostics import (
+    AdmissionReport,
+    RejectionCount,
+    SlowQuery,
+    SlowQueryReport,
+    TableStats,
+)
+
+router = APIRouter()
+
+
+@router.get("/slow-queries", response_model=SlowQueryReport)
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: str = Query("total_ms", pattern="^(total_ms|max_ms|mean_ms|count)$"),
+    _=Depends(get_admin_user),
+):
+    """Top slow statement fingerprints seen by this worker."""
+    return SlowQueryReport(
+        threshold_ms=slow_query_log.threshold_ms,
+        explain_sample_rate=slow_query_log.explain_rate,
+        queries=[
+            SlowQuery.model_validate(stats)
+            for stats in slow_query_log.top(limit, order_by)
+        ],
+    )
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_slow_queries(_=Depends(get_admin_user)):
+    slow_query_log.reset()
+
+
+@router.get("/admission", response_model=AdmissionReport)
+async def get_admission(_=Depends(get_admin_user)):
+    """Rate limit and load shedding counters of this worker since it started."""
+    return AdmissionReport(
+        backend=buckets.name,
+        max_in_flight=settings.MAX_IN_FLIGHT_REQUESTS,
+        in_flight=admission_stats.in_flight,
+        peak_in_flight=admission_stats.peak_in_flight,
+        admitted=admission_stats.admitted,
+        rejections=[
+            RejectionCount(reason=reason, route_class=klass, count=count)
+            for (reason, klass), count in admission_stats.rejected.most_common()
+        ],
+    )
+
+
+def _hit_ratio(hit: int | None, read: int | None) -> float | None:
+    if not hit and not read:
+        return None
+    return round(hit / (hit + read), 4)
+
+
+@router.get("/tables", response_model=list[TableStats])
+async def get_table_stats(
+    db: AsyncSession = Depends(get_db),
+    _=Depends(get_admin_user),
+):
+    """Size, buffer cache hit ratio and vacuum state per table (Postgres only).
+
+    Partitioned tables are listed partition by partition.
+
+    Counters are cumulative since the last ``pg_stat_reset()``, so reset
+    before a benchmark run to compare storage changes such as compression.
+    """
+    if db.bind.dialect.name != "postgresql":
+        return []
+    result = await db.execute(
+        text(
+            "SELECT s.relname, pg_total_relation_size(s.relid), "
+            "pg_relation_size(s.relid), "
+            "CASE WHEN c.reltoastrelid = 0 THEN 0 "
+            "ELSE pg_total_relation_size(c.reltoastrelid) END, "
+            "s.heap_blks_hit, s.heap_blks_read, s.toast_blks_hit, s.toast_blks_read, "
+            "v.n_dead_tup, v.autovacuum_count, v.last_autovacuum "
+            "FROM pg_statio_user_tables s JOIN pg_class c ON c.oid = s.relid "
+            "JOIN pg_stat_user_tables v ON v.relid = s.relid "
+            "ORDER BY 2 DESC"
+        )
+    )
+    return [
+        TableStats(
+            table=row[0],
+            total_bytes=row[1],
+            heap_bytes=row[2],
+            toast_bytes=row[3],
+            heap_hit_ratio=_hit_ratio(row[4], row[5]),
+            toast_hit_ratio=_hit_ratio(row[6], row[7]),
+            dead_tuples=row[8],
+            autovacuum_count=row[9],
+            last_autovacuum=row[10],
+        )
+        for row in result.all()
+    ]
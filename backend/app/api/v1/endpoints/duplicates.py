@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.duplicate import DuplicateGroup
+from app.services.dedup import DEDUP_MODELS, find_duplicate_groups
+
+router = APIRouter()
+
+
+@router.get("", response_model=list[DuplicateGroup])
+async def list_duplicates(
+    entity_type: str | None = Query(None, pattern="^(problems|interview_questions)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    groups = []
+    for name in [entity_type] if entity_type else DEDUP_MODELS:
+        groups.extend(await find_duplicate_groups(db, current_user.id, name))
+    return groups
@@ -0,0 +1,48 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_stream_user_id
+from app.core.config import settings
+from app.core.events import broker
+
+router = APIRouter()
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    user_id: str = Depends(get_stream_user_id),
+):
+    """Server-sent stream of change notifications for the current user.
+
+    Each event carries the entity type, id and version (the same unit as
+    sync tokens). Events missed while disconnected are not replayed;
+    clients catch up with ``GET /sync`` after reconnecting.
+    """
+    queue = broker.subscribe(user_id)
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    change = await asyncio.wait_for(
+                        queue.get(), timeout=settings.EVENTS_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    # Comment line keeps proxies from closing the idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                yield change.to_sse()
+        finally:
+            broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
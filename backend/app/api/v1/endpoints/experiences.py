@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
+from app.db import statements
 from app.db.session import get_db
 from app.models.experience import Experience
 from app.models.user import User
@@ -17,9 +17,7 @@ async def list_experiences(
     current_user: User = Depends(get_current_user),
 ):
     result = await db.execute(
-        select(Experience)
-        .where(Experience.user_id == current_user.id)
-        .order_by(Experience.start_date.desc())
+        statements.experience_list, {"user_id": current_user.id}
     )
     experiences = result.scalars().all()
     return experiences
@@ -41,5 +39,4 @@ async def create_experience(
     )
     db.add(experience)
     await db.flush()
-    await db.refresh(experience)
     return experience
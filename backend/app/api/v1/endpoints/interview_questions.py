@@ -1,15 +1,26 @@
+from datetime import date
+
 from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy import select
+from sqlalchemy import false, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
+from app.db import statements
 from app.db.session import get_db
+from app.models.company import Company
 from app.models.interview_question import InterviewQuestion
 from app.models.user import User
 from app.schemas.interview_question import (
     InterviewQuestionCreate,
     InterviewQuestionResponse,
 )
+from app.services.companies import (
+    normalize_company_name,
+    resolve_company,
+    suggest_companies,
+)
+from app.services.dedup import find_similar
+from app.services.similarity import similarity_index
 
 router = APIRouter()
 
@@ -17,8 +28,8 @@ router = APIRouter()
 @router.get("", response_model=list[InterviewQuestionResponse])
 async def list_interview_questions(
     company: str | None = Query(None),
-    date_from: str | None = Query(None),
-    date_to: str | None = Query(None),
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -27,7 +38,20 @@ async def list_interview_questions(
     )
 
     if company:
-        query = query.where(InterviewQuestion.company.ilike(f"%{company}%"))
+        # Match against the (trigram-indexed) company dimension instead of
+        # scanning every question's free-text company column. Spellings
+        # without letters or digits normalize the way resolve_company
+        # stores them; a blank one matches nothing rather than everything
+        normalized = normalize_company_name(company) or company.strip().lower()
+        query = query.where(
+            InterviewQuestion.company_id.in_(
+                select(Company.id).where(
+                    Company.normalized_name.contains(normalized, autoescape=True)
+                )
+            )
+            if normalized
+            else false()
+        )
 
     if date_from:
         query = query.where(InterviewQuestion.asked_date >= date_from)
@@ -41,22 +65,39 @@ async def list_interview_questions(
     return result.scalars().all()
 
 
+@router.get("/companies", response_model=list[str])
+async def autocomplete_companies(
+    prefix: str = Query("", max_length=255),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return await suggest_companies(db, current_user.id, prefix, limit)
+
+
 @router.post("", response_model=InterviewQuestionResponse, status_code=status.HTTP_201_CREATED)
 async def create_interview_question(
     data: InterviewQuestionCreate,
+    check_duplicates: bool = Query(False),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    company = await resolve_company(db, data.company)
     question = InterviewQuestion(
         user_id=current_user.id,
         question=data.question,
         answer=data.answer,
         company=data.company,
+        company_id=company.id,
         asked_date=data.asked_date,
     )
     db.add(question)
     await db.flush()
-    await db.refresh(question)
+    similarity_index.upsert_question(question)
+    if check_duplicates:
+        question.possible_duplicates = await find_similar(
+            db, current_user.id, "interview_questions", question.id, question.minhash
+        )
     return question
 
 
@@ -69,10 +110,8 @@ async def delete_interview_question(
     from fastapi import HTTPException
 
     result = await db.execute(
-        select(InterviewQuestion).where(
-            InterviewQuestion.id == question_id,
-            InterviewQuestion.user_id == current_user.id,
-        )
+        statements.owned_row(InterviewQuestion),
+        {"id": question_id, "user_id": current_user.id},
     )
     question = result.scalar_one_or_none()
     if not question:
@@ -81,3 +120,4 @@ async def delete_interview_question(
         )
     await db.delete(question)
     await db.flush()
+    similarity_index.remove(current_user.id, "interview_questions", question_id)
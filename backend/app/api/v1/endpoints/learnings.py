@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from sqlalchemy import String, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
+from app.db import statements
+from app.db.pagination import paginate
 from app.db.session import get_db
 from app.models.learning import Learning
 from app.models.user import User
@@ -21,34 +23,39 @@ async def list_learnings(
     size: int = Query(10, ge=1, le=100),
     search: str | None = Query(None),
     tag: str | None = Query(None),
+    include_total: bool = Query(True),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    query = select(Learning).where(Learning.user_id == current_user.id)
-    count_query = select(func.count()).select_from(Learning).where(
-        Learning.user_id == current_user.id
-    )
-
+    filters = []
     if search:
-        query = query.where(Learning.topic.ilike(f"%{search}%"))
-        count_query = count_query.where(Learning.topic.ilike(f"%{search}%"))
+        filters.append(Learning.topic.ilike(f"%{search}%"))
 
     if tag:
-        query = query.where(Learning.tags.cast(str).ilike(f'%"{tag}"%'))
-        count_query = count_query.where(Learning.tags.cast(str).ilike(f'%"{tag}"%'))
-
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-
-    offset = (page - 1) * size
-    query = query.order_by(Learning.learned_date.desc(), Learning.created_at.desc()).offset(offset).limit(size)
+        filters.append(Learning.tags.cast(String).ilike(f'%"{tag}"%'))
 
-    result = await db.execute(query)
-    learnings = result.scalars().all()
+    if filters:
+        query = (
+            select(Learning)
+            .where(Learning.user_id == current_user.id, *filters)
+            .order_by(Learning.learned_date.desc(), Learning.created_at.desc())
+        )
+        result = await paginate(db, query, page, size, include_total=include_total)
+    else:
+        result = await paginate(
+            db,
+            statements.learning_page,
+            page,
+            size,
+            include_total=include_total,
+            total=statements.learning_total,
+            params={"user_id": current_user.id},
+        )
 
     return LearningListResponse(
-        items=learnings,
-        total=total,
+        items=result.items,
+        total=result.total,
+        has_more=result.has_more,
         page=page,
         size=size,
     )
@@ -68,7 +75,6 @@ async def create_learning(
     )
     db.add(learning)
     await db.flush()
-    await db.refresh(learning)
     return learning
 
 
@@ -79,9 +85,7 @@ async def delete_learning(
     current_user: User = Depends(get_current_user),
 ):
     result = await db.execute(
-        select(Learning).where(
-            Learning.id == learning_id, Learning.user_id == current_user.id
-        )
+        statements.owned_row(Learning), {"id": learning_id, "user_id": current_user.id}
     )
     learning = result.scalar_one_or_none()
     if not learning:
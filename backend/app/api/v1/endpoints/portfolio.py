@@ -0,0 +1,91 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.portfolio import SLUG_PATTERN, PortfolioSettings
+from app.schemas.user import UserResponse
+from app.services.portfolio import load_snapshot, remove_snapshot, scheduler
+
+router = APIRouter()
+
+
+@router.put("/settings", response_model=UserResponse)
+async def update_portfolio_settings(
+    data: PortfolioSettings,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if data.public and not (data.slug or current_user.portfolio_slug):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A slug is required to publish a portfolio",
+        )
+    if data.slug and data.slug != current_user.portfolio_slug:
+        result = await db.execute(
+            select(User.id).where(User.portfolio_slug == data.slug)
+        )
+        if result.scalar_one_or_none() is not None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail="Slug already taken"
+            )
+
+    old_slug = current_user.portfolio_slug
+    if data.slug:
+        current_user.portfolio_slug = data.slug
+    current_user.portfolio_public = data.public
+    # Commit before scheduling so the background render sees the new settings
+    await db.commit()
+
+    if old_slug and (not data.public or old_slug != current_user.portfolio_slug):
+        await remove_snapshot(old_slug)
+    if data.public:
+        scheduler.schedule(current_user.id)
+    return current_user
+
+
+def _snapshot_response(
+    request: Request, etag: str, body: bytes, media_type: str
+) -> Response:
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={settings.PORTFOLIO_CACHE_MAX_AGE}, "
+            "stale-while-revalidate=86400"
+        ),
+    }
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+@router.get("/{slug}.html")
+async def get_public_portfolio_html(
+    request: Request, slug: str = Path(pattern=SLUG_PATTERN)
+):
+    snapshot = await load_snapshot(slug)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Portfolio not found"
+        )
+    return _snapshot_response(
+        request, snapshot.etag, snapshot.html_body, "text/html; charset=utf-8"
+    )
+
+
+@router.get("/{slug}")
+async def get_public_portfolio(
+    request: Request, slug: str = Path(pattern=SLUG_PATTERN)
+):
+    """Public, unauthenticated view served straight from the snapshot."""
+    snapshot = await load_snapshot(slug)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Portfolio not found"
+        )
+    return _snapshot_response(
+        request, snapshot.etag, snapshot.json_body, "application/json"
+    )
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from sqlalchemy import String, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
+from app.db import statements
+from app.db.pagination import paginate
 from app.db.session import get_db
 from app.models.problem import Problem
 from app.models.user import User
@@ -11,7 +13,10 @@ from app.schemas.problem import (
     ProblemListResponse,
     ProblemResponse,
     ProblemUpdate,
+    SimilarItem,
 )
+from app.services.dedup import find_similar
+from app.services.similarity import similarity_index
 
 router = APIRouter()
 
@@ -23,41 +28,44 @@ async def list_problems(
     difficulty: str | None = Query(None),
     search: str | None = Query(None),
     tag: str | None = Query(None),
+    include_total: bool = Query(True),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    query = select(Problem).where(Problem.user_id == current_user.id)
-    count_query = select(func.count()).select_from(Problem).where(
-        Problem.user_id == current_user.id
-    )
-
+    filters = []
     if difficulty:
-        query = query.where(Problem.difficulty == difficulty)
-        count_query = count_query.where(Problem.difficulty == difficulty)
+        filters.append(Problem.difficulty == difficulty)
 
     if search:
-        query = query.where(Problem.title.ilike(f"%{search}%"))
-        count_query = count_query.where(Problem.title.ilike(f"%{search}%"))
+        filters.append(Problem.title.ilike(f"%{search}%"))
 
     if tag:
         # For JSON array stored as text in SQLite, use LIKE to search for tag
-        query = query.where(Problem.tags.cast(str).ilike(f'%"{tag}"%'))
-        count_query = count_query.where(Problem.tags.cast(str).ilike(f'%"{tag}"%'))
-
-    # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+        filters.append(Problem.tags.cast(String).ilike(f'%"{tag}"%'))
 
-    # Apply pagination
-    offset = (page - 1) * size
-    query = query.order_by(Problem.created_at.desc()).offset(offset).limit(size)
-
-    result = await db.execute(query)
-    problems = result.scalars().all()
+    if filters:
+        query = (
+            select(Problem)
+            .where(Problem.user_id == current_user.id, *filters)
+            .order_by(Problem.created_at.desc())
+        )
+        result = await paginate(db, query, page, size, include_total=include_total)
+    else:
+        # Unfiltered totals come from the daily activity rollup rather than a count
+        result = await paginate(
+            db,
+            statements.problem_page,
+            page,
+            size,
+            include_total=include_total,
+            total=statements.problem_total,
+            params={"user_id": current_user.id},
+        )
 
     return ProblemListResponse(
-        items=problems,
-        total=total,
+        items=result.items,
+        total=result.total,
+        has_more=result.has_more,
         page=page,
         size=size,
     )
@@ -66,6 +74,7 @@ async def list_problems(
 @router.post("", response_model=ProblemResponse, status_code=status.HTTP_201_CREATED)
 async def create_problem(
     problem_in: ProblemCreate,
+    check_duplicates: bool = Query(False),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -80,10 +89,15 @@ async def create_problem(
         result=problem_in.result,
         tags=problem_in.tags,
         solved_at=problem_in.solved_at,
+        is_featured=problem_in.is_featured,
     )
     db.add(problem)
     await db.flush()
-    await db.refresh(problem)
+    similarity_index.upsert_problem(problem)
+    if check_duplicates:
+        problem.possible_duplicates = await find_similar(
+            db, current_user.id, "problems", problem.id, problem.minhash
+        )
     return problem
 
 
@@ -94,9 +108,7 @@ async def get_problem(
     current_user: User = Depends(get_current_user),
 ):
     result = await db.execute(
-        select(Problem).where(
-            Problem.id == problem_id, Problem.user_id == current_user.id
-        )
+        statements.owned_row(Problem), {"id": problem_id, "user_id": current_user.id}
     )
     problem = result.scalar_one_or_none()
     if not problem:
@@ -106,6 +118,29 @@ async def get_problem(
     return problem
 
 
+@router.get("/{problem_id}/similar", response_model=list[SimilarItem])
+async def get_similar_problems(
+    problem_id: str,
+    limit: int = Query(5, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    result = await db.execute(
+        statements.owned_row(Problem), {"id": problem_id, "user_id": current_user.id}
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Problem not found"
+        )
+    matches = await similarity_index.similar(
+        db, current_user.id, "problems", problem_id, limit
+    )
+    return [
+        SimilarItem(entity_type=entity_type, id=entity_id, title=title, score=score)
+        for entity_type, entity_id, title, score in matches
+    ]
+
+
 @router.put("/{problem_id}", response_model=ProblemResponse)
 async def update_problem(
     problem_id: str,
@@ -114,9 +149,7 @@ async def update_problem(
     current_user: User = Depends(get_current_user),
 ):
     result = await db.execute(
-        select(Problem).where(
-            Problem.id == problem_id, Problem.user_id == current_user.id
-        )
+        statements.owned_row(Problem), {"id": problem_id, "user_id": current_user.id}
     )
     problem = result.scalar_one_or_none()
     if not problem:
@@ -129,7 +162,7 @@ async def update_problem(
         setattr(problem, field, value)
 
     await db.flush()
-    await db.refresh(problem)
+    similarity_index.upsert_problem(problem)
     return problem
 
 
@@ -140,9 +173,7 @@ async def delete_problem(
     current_user: User = Depends(get_current_user),
 ):
     result = await db.execute(
-        select(Problem).where(
-            Problem.id == problem_id, Problem.user_id == current_user.id
-        )
+        statements.owned_row(Problem), {"id": problem_id, "user_id": current_user.id}
     )
     problem = result.scalar_one_or_none()
     if not problem:
@@ -152,3 +183,4 @@ async def delete_problem(
 
     await db.delete(problem)
     await db.flush()
+    similarity_index.remove(current_user.id, "problems", problem_id)
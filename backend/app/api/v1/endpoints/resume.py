@@ -0,0 +1,89 @@
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.db.session import get_db
+from app.models.certification import Certification
+from app.models.experience import Experience
+from app.models.problem import Problem
+from app.models.user import User
+from app.services.resume import renderer
+
+router = APIRouter()
+
+
+@router.get("")
+async def download_resume(
+    request: Request,
+    problem_ids: list[str] | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Resume PDF built from experiences, certifications and problems.
+
+    Problems default to the featured ones; pass ``problem_ids`` to pick
+    a different selection.
+    """
+    problem_query = select(Problem).where(Problem.user_id == current_user.id)
+    if problem_ids:
+        problem_query = problem_query.where(Problem.id.in_(problem_ids))
+    else:
+        problem_query = problem_query.where(Problem.is_featured.is_(True))
+    problems = await db.execute(problem_query.order_by(Problem.solved_at.desc()))
+    experiences = await db.execute(
+        select(Experience)
+        .where(Experience.user_id == current_user.id)
+        .order_by(Experience.start_date.desc())
+    )
+    certifications = await db.execute(
+        select(Certification)
+        .where(Certification.user_id == current_user.id)
+        .order_by(Certification.issue_date.desc())
+    )
+
+    payload = {
+        "full_name": current_user.full_name,
+        "email": current_user.email,
+        "experiences": [
+            {
+                "company": e.company,
+                "role": e.role,
+                "start_date": e.start_date.isoformat(),
+                "end_date": e.end_date.isoformat() if e.end_date else None,
+                "description": e.description,
+            }
+            for e in experiences.scalars()
+        ],
+        "certifications": [
+            {
+                "name": c.name,
+                "issuer": c.issuer,
+                "issue_date": c.issue_date.isoformat(),
+            }
+            for c in certifications.scalars()
+        ],
+        "problems": [
+            {
+                "title": p.title,
+                "difficulty": p.difficulty,
+                "tags": p.tags,
+                "situation": p.situation,
+                "task": p.task,
+                "action": p.action,
+                "result": p.result,
+            }
+            for p in problems.scalars()
+        ],
+    }
+
+    digest, pdf = await renderer.render(payload)
+    etag = f'"{digest[:32]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": 'attachment; filename="resume.pdf"',
+    }
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=pdf, media_type="application/pdf", headers=headers)
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.events import to_version
+from app.db.session import get_db
+from app.models.certification import Certification
+from app.models.experience import Experience
+from app.models.interview_question import InterviewQuestion
+from app.models.learning import Learning
+from app.models.problem import Problem
+from app.models.tombstone import Tombstone
+from app.models.user import User
+from app.schemas.sync import DeletedEntity, SyncResponse
+
+router = APIRouter()
+
+SYNCED_MODELS = {
+    "problems": Problem,
+    "experiences": Experience,
+    "certifications": Certification,
+    "interview_questions": InterviewQuestion,
+    "learnings": Learning,
+}
+
+
+# Tokens are microseconds since the epoch, the same unit as event versions
+def encode_token(moment: datetime) -> str:
+    return str(to_version(moment))
+
+
+def decode_token(token: str) -> datetime:
+    try:
+        moment = datetime.fromtimestamp(int(token) / 1_000_000, timezone.utc)
+    except (ValueError, OverflowError, OSError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync token"
+        )
+    return moment.replace(tzinfo=None)
+
+
+@router.get("", response_model=SyncResponse)
+async def sync(
+    since: str | None = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Return everything created, changed or deleted since ``since``.
+
+    Without a token the full data set is returned. The next token trails
+    the server clock by a small safety window so rows from transactions
+    that commit while this request runs are picked up next time; clients
+    upsert by id, so the resulting overlap is harmless.
+    """
+    changed_since = decode_token(since) if since else None
+    next_token = encode_token(
+        datetime.utcnow() - timedelta(seconds=settings.SYNC_SAFETY_WINDOW_SECONDS)
+    )
+
+    changes = {}
+    for name, model in SYNCED_MODELS.items():
+        query = select(model).where(model.user_id == current_user.id)
+        if changed_since:
+            query = query.where(model.updated_at >= changed_since)
+        result = await db.execute(query.order_by(model.updated_at))
+        changes[name] = result.scalars().all()
+
+    deleted = []
+    if changed_since:
+        result = await db.execute(
+            select(Tombstone.entity_type, Tombstone.entity_id)
+            .where(
+                Tombstone.user_id == current_user.id,
+                Tombstone.deleted_at >= changed_since,
+            )
+            .order_by(Tombstone.deleted_at)
+        )
+        deleted = [
+            DeletedEntity(entity_type=entity_type, entity_id=entity_id)
+            for entity_type, entity_id in result.all()
+        ]
+
+    return SyncResponse(
+        token=next_token,
+        full=changed_since is None,
+        deleted=deleted,
+        **changes,
+    )
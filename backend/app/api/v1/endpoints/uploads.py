@@ -1,42 +1,130 @@
-import uuid
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
 
-import aiofiles
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, status
 
 from app.api.deps import get_current_user
-from app.core.config import UPLOAD_DIR, settings
+from app.core.config import settings
+from app.core.security import read_upload_token
+from app.models.user import User
+from app.schemas.upload import (
+    FinalizeRequest,
+    PresignedUpload,
+    UploadRequest,
+    UploadResult,
+    UploadTicket,
+)
+from app.services.storage import LocalStorage, is_user_key, new_key, storage
 
 router = APIRouter()
 
 
+def _check_content_type(content_type: str | None) -> None:
+    if content_type not in settings.ALLOWED_IMAGE_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type '{content_type}' not allowed. Allowed: {', '.join(settings.ALLOWED_IMAGE_TYPES)}",
+        )
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"File too large. Maximum size is {settings.MAX_UPLOAD_SIZE_MB}MB.",
+    )
+
+
 @router.post("")
 async def upload_file(
     file: UploadFile,
-    _=Depends(get_current_user),
+    current_user: User = Depends(get_current_user),
 ):
-    if file.content_type not in settings.ALLOWED_IMAGE_TYPES:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File type '{file.content_type}' not allowed. Allowed: {', '.join(settings.ALLOWED_IMAGE_TYPES)}",
-        )
+    """Upload through the API; prefer /presign and /finalize"""
+    _check_content_type(file.content_type)
 
     contents = await file.read()
 
     max_bytes = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
     if len(contents) > max_bytes:
+        raise _too_large()
+
+    key = new_key(current_user.id, file.content_type)
+    await storage.put(key, contents, file.content_type)
+    return {"url": storage.public_url(key)}
+
+
+@router.post("/presign", response_model=UploadTicket)
+async def presign_upload(
+    upload_in: UploadRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """Get a URL the client uploads the file to directly"""
+    _check_content_type(upload_in.content_type)
+    max_bytes = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+    if upload_in.size > max_bytes:
+        raise _too_large()
+
+    key = new_key(current_user.id, upload_in.content_type)
+    upload = await storage.presign_upload(
+        key, upload_in.content_type, max_bytes, settings.UPLOAD_URL_EXPIRE_SECONDS
+    )
+    return UploadTicket(
+        key=key,
+        upload=PresignedUpload(**asdict(upload)),
+        expires_at=datetime.now(timezone.utc)
+        + timedelta(seconds=settings.UPLOAD_URL_EXPIRE_SECONDS),
+    )
+
+
+@router.post("/finalize", response_model=UploadResult)
+async def finalize_upload(
+    finalize_in: FinalizeRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """Check a direct upload and return the URL to save"""
+    if not is_user_key(current_user.id, finalize_in.key):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+    stored = await storage.stat(finalize_in.key)
+    if stored is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+
+    # The presigned policy already enforces both; this catches anything
+    # uploaded some other way before its URL is handed out
+    max_bytes = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+    if stored.size > max_bytes or (
+        stored.content_type is not None
+        and stored.content_type not in settings.ALLOWED_IMAGE_TYPES
+    ):
+        await storage.delete(finalize_in.key)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Maximum size is {settings.MAX_UPLOAD_SIZE_MB}MB.",
+            detail="Uploaded file was rejected",
         )
+    return UploadResult(url=storage.public_url(finalize_in.key))
 
-    ext = ""
-    if file.filename and "." in file.filename:
-        ext = "." + file.filename.rsplit(".", 1)[1].lower()
 
-    filename = f"{uuid.uuid4().hex}{ext}"
-    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+@router.put("/direct/{key:path}", status_code=status.HTTP_204_NO_CONTENT)
+async def direct_upload(
+    key: str,
+    request: Request,
+    token: str = Query(...),
+):
+    """Receive a presigned upload when files are stored locally"""
+    grant = read_upload_token(token)
+    if not isinstance(storage, LocalStorage) or grant is None or grant["key"] != key:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid upload URL")
+    if request.headers.get("content-type") != grant["content_type"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Content-Type must be {grant['content_type']}",
+        )
 
-    async with aiofiles.open(UPLOAD_DIR / filename, "wb") as f:
-        await f.write(contents)
+    async def body():
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > grant["max_bytes"]:
+                raise _too_large()
+            yield chunk
 
-    return {"url": f"/api/v1/uploads/{filename}"}
+    await storage.write(key, body())
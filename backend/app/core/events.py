@@ -0,0 +1,187 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "carrerlog_events"
+
+
+def to_version(moment: datetime) -> int:
+    """Microseconds since the epoch for a naive UTC timestamp."""
+    return int(moment.replace(tzinfo=timezone.utc).timestamp() * 1_000_000)
+
+
+@dataclass
+class ChangeEvent:
+    user_id: str
+    entity_type: str
+    id: str
+    version: int
+    op: str
+
+    def to_sse(self) -> str:
+        data = json.dumps(
+            {
+                "entity_type": self.entity_type,
+                "id": self.id,
+                "version": self.version,
+                "op": self.op,
+            }
+        )
+        return f"event: change\nid: {self.version}\ndata: {data}\n\n"
+
+
+class EventBroker:
+    """Fans change events out to each user's open SSE streams.
+
+    A subscriber is just a bounded asyncio.Queue, so an idle connection
+    costs one parked coroutine and no database connection. A subscriber
+    that falls behind has events dropped rather than growing without
+    bound; clients recover with a delta sync.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self._queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self._hooks: list[Callable[[ChangeEvent], None]] = []
+        self.bridge: "PostgresNotifyBridge | None" = None
+
+    def add_publish_hook(self, hook: Callable[[ChangeEvent], None]) -> None:
+        """Run ``hook`` for every change committed by this worker."""
+        self._hooks.append(hook)
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def publish(self, change: ChangeEvent) -> None:
+        for hook in self._hooks:
+            try:
+                hook(change)
+            except Exception:
+                logger.exception("Change event hook failed")
+        if self.bridge is not None:
+            self.bridge.notify(change)
+        else:
+            self.deliver(change)
+
+    def deliver(self, change: ChangeEvent) -> None:
+        for queue in self._subscribers.get(change.user_id, ()):
+            try:
+                queue.put_nowait(change)
+            except asyncio.QueueFull:
+                logger.debug("Dropping event for slow subscriber of %s", change.user_id)
+
+
+class PostgresNotifyBridge:
+    """Relays events between workers through Postgres LISTEN/NOTIFY.
+
+    Every worker publishes with NOTIFY and delivers to its local
+    subscribers whatever arrives on the LISTEN connection, its own
+    events included.
+    """
+
+    def __init__(self, broker: EventBroker, dsn: str):
+        self._broker = broker
+        self._dsn = dsn
+        self._listen_conn = None
+        self._notify_conn = None
+        self._pending: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        import asyncpg
+
+        self._listen_conn = await asyncpg.connect(self._dsn)
+        self._notify_conn = await asyncpg.connect(self._dsn)
+        await self._listen_conn.add_listener(NOTIFY_CHANNEL, self._on_notify)
+        self._broker.bridge = self
+
+    async def stop(self) -> None:
+        self._broker.bridge = None
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        for conn in (self._listen_conn, self._notify_conn):
+            if conn is not None:
+                await conn.close()
+
+    def notify(self, change: ChangeEvent) -> None:
+        task = asyncio.get_running_loop().create_task(self._send(change))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _send(self, change: ChangeEvent) -> None:
+        try:
+            await self._notify_conn.execute(
+                "SELECT pg_notify($1, $2)", NOTIFY_CHANNEL, json.dumps(asdict(change))
+            )
+        except Exception:
+            logger.exception("Failed to publish change event; delivering locally")
+            self._broker.deliver(change)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self._broker.deliver(ChangeEvent(**json.loads(payload)))
+
+
+broker = EventBroker(queue_size=settings.EVENTS_QUEUE_SIZE)
+
+
+# Change capture: collect what each flush touched and publish only once
+# the transaction commits, so subscribers never see rolled-back writes.
+def _is_tracked(obj) -> bool:
+    return hasattr(obj, "user_id") and hasattr(obj, "updated_at")
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    pending = session.info.setdefault("change_events", [])
+    now = datetime.utcnow()
+    for obj in session.new:
+        if _is_tracked(obj):
+            pending.append((obj, "upsert", None))
+    for obj in session.dirty:
+        if _is_tracked(obj) and session.is_modified(obj, include_collections=False):
+            pending.append((obj, "upsert", None))
+    for obj in session.deleted:
+        if _is_tracked(obj):
+            pending.append((obj, "delete", now))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session):
+    for obj, op, deleted_at in session.info.pop("change_events", []):
+        broker.publish(
+            ChangeEvent(
+                user_id=str(obj.user_id),
+                entity_type=obj.__tablename__,
+                id=str(obj.id),
+                version=to_version(deleted_at or obj.updated_at),
+                op=op,
+            )
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("change_events", None)
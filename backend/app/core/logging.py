@@ -0,0 +1,202 @@
+"""Application logging.
+
+Log calls never write to the terminal themselves: records go through a
+``QueueHandler`` onto a bounded queue and a ``QueueListener`` thread
+writes them out, so a slow stderr or a full pipe can't stall the event
+loop. If the writer falls behind by ``LOG_QUEUE_SIZE`` records, new ones
+are dropped and counted instead of waiting. On the way in, each record
+
+- is tagged with the id of the request it belongs to (``X-Request-ID``,
+  see ``RequestIdMiddleware``);
+- has bearer tokens, JWTs and OAuth secrets scrubbed from its message;
+- at DEBUG level, is kept only with probability ``LOG_DEBUG_SAMPLE_RATE``.
+  Any record can set its own rate with ``extra={"sample_rate": ...}``.
+
+``LOG_FORMAT=json`` writes one JSON object per line, with ``extra``
+fields as keys; ``text`` is for reading in a terminal.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from app.core.config import settings
+
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Request ids we accept from clients; the profiler also uses them as file names
+SAFE_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+_SECRET_KEYS = r"access_token|refresh_token|id_token|client_secret|password|code|token"
+_SECRETS = [
+    (re.compile(r"eyJ[\w-]+\.[\w-]+\.[\w-]*"), "[jwt]"),
+    (re.compile(r"(?i)\b(bearer\s+)\S+"), r"\1[redacted]"),
+    # JSON bodies and Python reprs of dicts, either quote style
+    (
+        re.compile(rf"""(["'])({_SECRET_KEYS})\1\s*:\s*(["'])(?:\\.|(?!\3).)*\3"""),
+        r"\1\2\1: \3[redacted]\3",
+    ),
+    # Form and query strings
+    (re.compile(rf"\b({_SECRET_KEYS})=[^&\s]+"), r"\1=[redacted]"),
+]
+
+# Attributes every LogRecord has; anything else came from ``extra``
+_RECORD_ATTRS = {
+    *vars(logging.makeLogRecord({})),
+    "message",
+    "asctime",
+    "request_id",
+    "sample_rate",
+}
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+
+
+def redact(text: str) -> str:
+    for pattern, replacement in _SECRETS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+class ContextFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = request_id.get() or "-"
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, debug_rate: float):
+        super().__init__()
+        self.debug_rate = debug_rate
+
+    def filter(self, record):
+        default = self.debug_rate if record.levelno <= logging.DEBUG else 1.0
+        rate = getattr(record, "sample_rate", default)
+        return rate >= 1.0 or random.random() < rate
+
+
+class AppQueueHandler(logging.handlers.QueueHandler):
+    """Formats and redacts on the caller's thread, then enqueues without blocking."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Merges args into the message and renders any traceback, so
+        # both are redacted and nothing unpicklable reaches the queue
+        record = super().prepare(record)
+        record.msg = redact(record.msg)
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and isinstance(value, str):
+                setattr(record, key, redact(value))
+        return record
+
+    def enqueue(self, record):
+        try:
+            if self.dropped:
+                self.queue.put_nowait(self._dropped_record())
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _dropped_record(self) -> logging.LogRecord:
+        return logging.makeLogRecord(
+            {
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Dropped {self.dropped} log records while the writer was behind",
+                "request_id": "-",
+            }
+        )
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        entry.update(
+            (key, value)
+            for key, value in vars(record).items()
+            if key not in _RECORD_ATTRS
+        )
+        return json.dumps(entry, default=str)
+
+
+def configure_logging() -> logging.handlers.QueueListener:
+    """Route the root logger through the queue and start the writer thread."""
+    output = logging.StreamHandler(sys.stderr)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    handler = AppQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE))
+    handler.addFilter(SamplingFilter(settings.LOG_DEBUG_SAMPLE_RATE))
+    handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        if isinstance(existing, AppQueueHandler):
+            root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(settings.LOG_LEVEL)
+    # Logs every outgoing request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    listener = logging.handlers.QueueListener(handler.queue, output)
+    listener.start()
+    # Flushes whatever is still queued
+    atexit.register(listener.stop)
+    return listener
+
+
+class RequestIdMiddleware:
+    """Gives each request an id for its log records and returns it in ``X-Request-ID``.
+
+    A caller's (or proxy's) ``X-Request-ID`` is kept when it is a safe
+    token, so one id can be followed from the frontend to the logs.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = next(
+            (v.decode("latin-1") for k, v in scope["headers"] if k == b"x-request-id"),
+            "",
+        )
+        rid = incoming if SAFE_ID.match(incoming) else uuid.uuid4().hex
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-request-id", rid.encode()),
+                ]
+            await send(message)
+
+        token = request_id.set(rid)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id.reset(token)
@@ -0,0 +1,62 @@
+import html
+import re
+import zlib
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+# Estimated Jaccard similarity at which two items count as duplicates.
+# With 32 bands of 4 rows, pairs at this similarity share at least one
+# bucket with probability > 0.99; candidates are then verified.
+DUPLICATE_THRESHOLD = 0.7
+
+_PRIME = np.uint64((1 << 32) + 15)
+_rng = np.random.default_rng(20240817)
+_A = _rng.integers(1, (1 << 32) - 1, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, (1 << 32) - 1, size=NUM_PERM, dtype=np.uint64)
+_MAX = np.uint32(0xFFFFFFFF)
+
+_TAG = re.compile(r"<[^>]+>")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str) -> np.ndarray:
+    words = _WORD.findall(html.unescape(_TAG.sub(" ", text)).lower())
+    if len(words) < SHINGLE_SIZE:
+        grams = {" ".join(words)} if words else set()
+    else:
+        grams = {
+            " ".join(words[i : i + SHINGLE_SIZE])
+            for i in range(len(words) - SHINGLE_SIZE + 1)
+        }
+    return np.fromiter(
+        (zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams)
+    )
+
+
+def signature(text: str) -> bytes:
+    """MinHash signature of the text's word 3-grams, as NUM_PERM uint32s."""
+    hashed = shingles(text)
+    if not len(hashed):
+        return np.full(NUM_PERM, _MAX, dtype=np.uint32).tobytes()
+    # (a*x + b) mod p stays below 2**64 because a, x, b < 2**32
+    perms = (_A[:, None] * hashed[None, :] + _B[:, None]) % _PRIME
+    return perms.min(axis=1).astype(np.uint32).tobytes()
+
+
+def band_hashes(sig: bytes) -> list[int]:
+    """One bucket key per LSH band; similar signatures share a bucket."""
+    return [
+        zlib.crc32(sig[band * ROWS * 4 : (band + 1) * ROWS * 4])
+        for band in range(BANDS)
+    ]
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of the two signatures' shingle sets."""
+    return float(
+        np.mean(np.frombuffer(a, dtype=np.uint32) == np.frombuffer(b, dtype=np.uint32))
+    )
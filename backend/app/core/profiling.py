@@ -0,0 +1,152 @@
+import asyncio
+import json
+import logging
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+
+from app.core.config import PROFILE_DIR, settings
+from app.core.logging import SAFE_ID, request_id
+from app.core.security import is_profile_token, read_token_subject
+from app.db.instrumentation import record_queries
+
+logger = logging.getLogger(__name__)
+
+
+class StackSampler:
+    """Samples one thread's Python stack from a background thread.
+
+    Stacks are kept collapsed (``root;child;leaf count``), the format
+    flamegraph.pl, inferno and speedscope read directly.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+def _header(scope, name: bytes) -> str:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return ""
+
+
+def _should_profile(scope) -> bool:
+    token = _header(scope, b"x-profile-token")
+    if token and is_profile_token(token):
+        return True
+    if settings.PROFILE_USER_IDS:
+        scheme, _, bearer = _header(scope, b"authorization").partition(" ")
+        if scheme.lower() == "bearer" and bearer:
+            return read_token_subject(bearer) in settings.PROFILE_USER_IDS
+    return False
+
+
+def _write_profile(profile_id: str, summary: dict, collapsed: str) -> None:
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    (PROFILE_DIR / f"{profile_id}.folded").write_text(collapsed)
+    (PROFILE_DIR / f"{profile_id}.json").write_text(json.dumps(summary, indent=2))
+
+
+class ProfilingMiddleware:
+    """Profiles selected requests; only installed when PROFILING_ENABLED.
+
+    A request is profiled when it carries a valid ``X-Profile-Token``
+    (see ``create_profile_token``) or its bearer token belongs to one of
+    ``PROFILE_USER_IDS``. Each profile is written to PROFILE_DIR as
+    ``<id>.folded`` (sampled stacks of the event loop thread) and
+    ``<id>.json`` (request details plus every DB statement and its
+    duration). The id is the caller's ``X-Request-ID`` when usable and is
+    returned in ``X-Profile-Id``. Other requests sharing the event loop
+    while the profile runs show up in its stacks as well.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # Set by RequestIdMiddleware, which runs outside this one
+        profile_id = request_id.get() or _header(scope, b"x-request-id")
+        if not SAFE_ID.match(profile_id):
+            profile_id = uuid.uuid4().hex
+        status_code = None
+
+        async def send_with_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-profile-id", profile_id.encode()),
+                ]
+            await send(message)
+
+        sampler = StackSampler(
+            threading.get_ident(), settings.PROFILE_SAMPLE_INTERVAL_SECONDS
+        )
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        sampler.start()
+        with record_queries() as recorder:
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                sampler.stop()
+                summary = {
+                    "id": profile_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "query_string": scope["query_string"].decode("latin-1"),
+                    "status": status_code,
+                    "started_at": started_at.isoformat(),
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                    "samples": sum(sampler.stacks.values()),
+                    "db_statements": recorder.count,
+                    "db_ms": round(recorder.total_ms, 3),
+                    "statements": [
+                        {"sql": s.sql, "duration_ms": round(s.duration_ms, 3)}
+                        for s in recorder.statements
+                    ],
+                }
+                try:
+                    await asyncio.to_thread(
+                        _write_profile, profile_id, summary, sampler.collapsed()
+                    )
+                except OSError:
+                    logger.exception("Could not write profile %s", profile_id)
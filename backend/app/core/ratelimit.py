@@ -0,0 +1,325 @@
+"""Per-user rate limiting and admission control.
+
+``AdmissionMiddleware`` checks every API request twice before it can
+take a database connection:
+
+1. the caller's token bucket for the request's route class (``read``,
+   ``write`` or ``upload``) must have a token, or the request gets 429
+   with ``Retry-After`` set to when the next token arrives. Buckets are
+   keyed by user id from the bearer token, else by client address: the
+   last ``X-Forwarded-For`` hop not in ``FORWARDED_ALLOW_IPS`` when the
+   request came through a trusted proxy, else the peer. Uploaded files
+   and public portfolios are served without a bucket;
+2. fewer than ``MAX_IN_FLIGHT_REQUESTS`` requests may be running in the
+   worker, or it gets 503 with ``Retry-After: 1``. Shedding here keeps
+   the connection pool's queue short for the requests already admitted.
+   The event stream holds no connection and isn't counted.
+
+Buckets live in worker memory (``RATE_LIMIT_BACKEND=memory``), so with
+N workers a user effectively gets N times the limits, or in the
+primary database (``postgres``) where all workers share them, at the
+cost of one small statement per request on a separate pool. Startup
+fails if the migration creating ``rate_limit_take()`` hasn't run; once
+running, if the database can't be reached the request is let through. The in-flight
+cap is always per worker, like the pool it protects.
+
+Rejections are counted per reason and route class; admins can read the
+counters at ``GET /diagnostics/admission``.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.security import read_token_subject
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v1"
+# Long-lived; counting it would let idle streams use up the cap
+UNCAPPED_PATHS = {f"{API_PREFIX}/events"}
+# Reads served from disk or a snapshot: the StaticFiles mount for
+# uploaded files and the public portfolio pages
+UNLIMITED_READ_PREFIXES = (f"{API_PREFIX}/uploads/", f"{API_PREFIX}/portfolio/")
+
+
+@dataclass(frozen=True)
+class Limit:
+    per_second: float
+    burst: int
+
+
+LIMITS = {
+    "read": Limit(settings.RATE_LIMIT_READ_PER_SECOND, settings.RATE_LIMIT_READ_BURST),
+    "write": Limit(settings.RATE_LIMIT_WRITE_PER_SECOND, settings.RATE_LIMIT_WRITE_BURST),
+    "upload": Limit(settings.RATE_LIMIT_UPLOAD_PER_SECOND, settings.RATE_LIMIT_UPLOAD_BURST),
+}
+
+
+def route_class(method: str, path: str) -> str:
+    if method in ("GET", "HEAD", "OPTIONS"):
+        return "read"
+    if path.startswith(f"{API_PREFIX}/uploads"):
+        return "upload"
+    return "write"
+
+
+class MemoryBuckets:
+    """Token buckets in this worker's memory."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def take(self, key: str, limit: Limit) -> float:
+        """Take a token; 0 if there was one, else seconds until there is."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (limit.burst, now))
+        tokens = min(limit.burst, tokens + (now - updated) * limit.per_second)
+        if len(self._buckets) > 10_000:
+            self._prune(now)
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            return 0.0
+        self._buckets[key] = (tokens, now)
+        return (1 - tokens) / limit.per_second
+
+    def _prune(self, now: float) -> None:
+        # A bucket untouched for a minute is as good as full again
+        self._buckets = {
+            k: v for k, v in self._buckets.items() if now - v[1] < 60
+        }
+
+
+class PostgresBuckets:
+    """Token buckets shared by all workers, in the primary database.
+
+    Each take is one call to ``rate_limit_take()`` (see the migration),
+    which refills and takes under a row lock, on the database clock.
+    Uses its own small asyncpg pool, so limiting never waits on the
+    pool it protects.
+    """
+
+    name = "postgres"
+    PRUNE_INTERVAL_SECONDS = 600
+    ACQUIRE_TIMEOUT_SECONDS = 0.5
+
+    def __init__(self, dsn: str, pool_size: int):
+        self._dsn = dsn
+        self._pool_size = pool_size
+        self._pool = None
+        self._pruner: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        import asyncpg
+
+        self._pool = await asyncpg.create_pool(
+            self._dsn, min_size=1, max_size=self._pool_size
+        )
+        # Tables made by create_all lack the function, and every take
+        # would then fail open without limiting anything
+        found = await self._pool.fetchval(
+            "SELECT to_regprocedure('rate_limit_take(text, float8, float8)')"
+        )
+        if found is None:
+            await self._pool.close()
+            raise RuntimeError(
+                "RATE_LIMIT_BACKEND=postgres needs the rate_limit_take() function; "
+                "run `alembic upgrade head`"
+            )
+        self._pruner = asyncio.create_task(self._prune_forever())
+
+    async def stop(self) -> None:
+        if self._pruner is not None:
+            self._pruner.cancel()
+        if self._pool is not None:
+            await self._pool.close()
+
+    async def take(self, key: str, limit: Limit) -> float:
+        try:
+            async with self._pool.acquire(timeout=self.ACQUIRE_TIMEOUT_SECONDS) as conn:
+                return await conn.fetchval(
+                    "SELECT rate_limit_take($1, $2, $3)",
+                    key,
+                    float(limit.per_second),
+                    float(limit.burst),
+                )
+        except Exception:
+            logger.warning(
+                "Rate limit check failed; letting the request through",
+                exc_info=True,
+                extra={"sample_rate": 0.01},
+            )
+            return 0.0
+
+    async def _prune_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.PRUNE_INTERVAL_SECONDS)
+            try:
+                async with self._pool.acquire() as conn:
+                    await conn.execute(
+                        "DELETE FROM rate_limit_buckets "
+                        "WHERE updated_at < now() - interval '1 hour'"
+                    )
+            except Exception:
+                logger.exception("Could not prune rate limit buckets")
+
+
+def create_buckets():
+    if settings.RATE_LIMIT_BACKEND == "postgres":
+        return PostgresBuckets(
+            settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://"),
+            settings.RATE_LIMIT_PG_POOL_SIZE,
+        )
+    if settings.RATE_LIMIT_BACKEND != "memory":
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND {settings.RATE_LIMIT_BACKEND!r}")
+    return MemoryBuckets()
+
+
+class AdmissionStats:
+    def __init__(self):
+        self.admitted = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.rejected: Counter[tuple[str, str]] = Counter()
+
+    def reject(self, reason: str, klass: str) -> None:
+        self.rejected[(reason, klass)] += 1
+
+
+buckets = create_buckets()
+admission_stats = AdmissionStats()
+
+
+@lru_cache(maxsize=1)
+def _trusted_proxies(setting: str) -> tuple[list, bool]:
+    networks = []
+    for entry in filter(None, (e.strip() for e in setting.split(","))):
+        if entry == "*":
+            return [], True
+        try:
+            networks.append(ipaddress.ip_network(entry, strict=False))
+        except ValueError:
+            logger.warning("Ignoring %r in FORWARDED_ALLOW_IPS", entry)
+    return networks, False
+
+
+def _is_trusted(address: str) -> bool:
+    networks, everyone = _trusted_proxies(settings.FORWARDED_ALLOW_IPS)
+    if everyone:
+        return True
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_address(scope) -> str:
+    """The caller's address, seen through proxies we trust.
+
+    Walks ``X-Forwarded-For`` from the right, the end our own proxies
+    append to, and stops at the first hop that isn't one of them;
+    anything left of it was written by the client and proves nothing.
+    """
+    client = scope.get("client")
+    address = client[0] if client else "unknown"
+    if not _is_trusted(address):
+        return address
+    hops = [
+        hop.strip()
+        for name, value in scope["headers"]
+        if name == b"x-forwarded-for"
+        for hop in value.decode("latin-1").split(",")
+    ]
+    for hop in reversed(hops):
+        if hop and not _is_trusted(hop):
+            return hop
+    return hops[0] if hops and hops[0] else address
+
+
+def _client_key(scope) -> str:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                subject = read_token_subject(token)
+                if subject:
+                    return f"user:{subject}"
+            break
+    return f"ip:{client_address(scope)}"
+
+
+def is_rate_limited(method: str, path: str) -> bool:
+    return not (
+        method in ("GET", "HEAD") and path.startswith(UNLIMITED_READ_PREFIXES)
+    )
+
+
+class AdmissionMiddleware:
+    """Rate limits and caps concurrent API requests; see the module docstring."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not path.startswith(API_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        klass = route_class(scope["method"], path)
+        if settings.RATE_LIMIT_ENABLED and is_rate_limited(scope["method"], path):
+            key = _client_key(scope)
+            wait = await buckets.take(f"{klass}:{key}", LIMITS[klass])
+            if wait > 0:
+                admission_stats.reject("rate_limited", klass)
+                logger.info(
+                    "Rate limited %s (%s requests)", key, klass, extra={"sample_rate": 0.1}
+                )
+                response = JSONResponse(
+                    {"detail": "Too many requests, slow down"},
+                    status_code=429,
+                    headers={"Retry-After": str(math.ceil(wait))},
+                )
+                await response(scope, receive, send)
+                return
+
+        if path in UNCAPPED_PATHS or not settings.MAX_IN_FLIGHT_REQUESTS:
+            admission_stats.admitted += 1
+            await self.app(scope, receive, send)
+            return
+
+        stats = admission_stats
+        if stats.in_flight >= settings.MAX_IN_FLIGHT_REQUESTS:
+            stats.reject("overloaded", klass)
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry"},
+                status_code=503,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        stats.admitted += 1
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            stats.in_flight -= 1
@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 import jwt
@@ -5,7 +7,15 @@ from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min_rounds == max_rounds: a hash made with any other cost "needs update"
+# and is replaced the next time its owner logs in
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -16,6 +26,76 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasherBusy(Exception):
+    """Too many password hashes are already queued."""
+
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop in a bounded thread pool.
+
+    bcrypt releases the GIL while hashing, so threads run in parallel.
+    At most ``max_workers`` hashes run at once and ``max_waiting`` more
+    may queue; beyond that callers get ``PasswordHasherBusy`` right away
+    instead of piling up behind a login flood.
+    """
+
+    def __init__(self, max_workers: int, max_waiting: int):
+        self._max_workers = max_workers
+        self._max_waiting = max_waiting
+        self._pool: ThreadPoolExecutor | None = None
+        self._slots = asyncio.Semaphore(max_workers)
+        self._waiting = 0
+        self._dummy_hash: str | None = None
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="bcrypt"
+            )
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _run(self, fn, *args):
+        if self._slots.locked() and self._waiting >= self._max_waiting:
+            raise PasswordHasherBusy
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor(), fn, *args
+            )
+        finally:
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed: str | None) -> tuple[bool, str | None]:
+        """(matches, replacement hash if the stored one uses old parameters).
+
+        Without a stored hash a dummy one is checked anyway, so unknown
+        emails take as long to reject as wrong passwords.
+        """
+        if hashed is None:
+            if self._dummy_hash is None:
+                self._dummy_hash = await self.hash("dummy password")
+            await self._run(pwd_context.verify, password, self._dummy_hash)
+            return False, None
+        return await self._run(pwd_context.verify_and_update, password, hashed)
+
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_WAITING
+)
+
+
 def create_access_token(subject: str, expires_delta: timedelta | None = None) -> str:
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -26,3 +106,48 @@ def create_access_token(subject: str, expires_delta: timedelta | None = None) ->
     to_encode = {"exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
+
+
+def read_token_subject(token: str) -> str | None:
+    """Subject of a valid access token, or None; never raises."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except jwt.PyJWTError:
+        return None
+    return payload.get("sub")
+
+
+def create_profile_token(expires_delta: timedelta = timedelta(minutes=15)) -> str:
+    """Token for the ``X-Profile-Token`` header; see app.core.profiling."""
+    to_encode = {"exp": datetime.now(timezone.utc) + expires_delta, "scope": "profile"}
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def is_profile_token(token: str) -> bool:
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except jwt.PyJWTError:
+        return False
+    return payload.get("scope") == "profile"
+
+
+def create_upload_token(
+    key: str, content_type: str, max_bytes: int, expires_delta: timedelta
+) -> str:
+    """Grants one direct upload to local storage; see app.services.storage."""
+    to_encode = {
+        "exp": datetime.now(timezone.utc) + expires_delta,
+        "scope": "upload",
+        "key": key,
+        "content_type": content_type,
+        "max_bytes": max_bytes,
+    }
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def read_upload_token(token: str) -> dict | None:
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except jwt.PyJWTError:
+        return None
+    return payload if payload.get("scope") == "upload" else None
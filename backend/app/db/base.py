@@ -1,7 +1,12 @@
 from app.db.base_class import Base  # noqa: F401
 from app.models.user import User  # noqa: F401
+from app.models.company import Company, CompanyAlias  # noqa: F401
 from app.models.problem import Problem  # noqa: F401
 from app.models.experience import Experience  # noqa: F401
 from app.models.certification import Certification  # noqa: F401
 from app.models.interview_question import InterviewQuestion  # noqa: F401
 from app.models.learning import Learning  # noqa: F401
+from app.models.tombstone import Tombstone  # noqa: F401
+from app.models.daily_activity import DailyActivity  # noqa: F401
+from app.models.lsh_bucket import LshBucket  # noqa: F401
+from app.models.shard_directory import ShardDirectory  # noqa: F401
@@ -1,10 +1,16 @@
 import uuid
 
-from sqlalchemy import String
+import zstandard
+from sqlalchemy import LargeBinary, String
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.types import TypeDecorator
 
 
+def new_uuid() -> str:
+    """Primary key default; a string so fresh rows match loaded ones."""
+    return str(uuid.uuid4())
+
+
 class GUID(TypeDecorator):
     """Platform-independent GUID type.
 
@@ -30,5 +36,54 @@ class GUID(TypeDecorator):
         return value
 
 
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def compress_text(value: str, threshold: int = 256, level: int = 3) -> bytes:
+    data = value.encode()
+    if len(data) < threshold:
+        return data
+    compressed = zstandard.compress(data, level)
+    return compressed if len(compressed) < len(data) else data
+
+
+def decompress_text(value) -> str:
+    # SQLite hands back rows written before the column became binary as str
+    if isinstance(value, str):
+        return value
+    value = bytes(value)
+    if value.startswith(ZSTD_MAGIC):
+        value = zstandard.decompress(value)
+    return value.decode()
+
+
+class CompressedText(TypeDecorator):
+    """Text stored as bytes, zstd-compressed once it reaches ``threshold``.
+
+    Compressed values are zstd frames and everything else is plain UTF-8;
+    valid UTF-8 can never start with the zstd magic number, so small and
+    legacy values need no marker. Postgres columns should use
+    ``STORAGE EXTERNAL`` so TOAST doesn't try to compress them again.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(self, threshold: int = 256, level: int = 3):
+        super().__init__()
+        self.threshold = threshold
+        self.level = level
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        return compress_text(value, self.threshold, self.level)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        return decompress_text(value)
+
+
 class Base(DeclarativeBase):
     pass
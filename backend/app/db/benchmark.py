@@ -0,0 +1,192 @@
+"""Throughput and latency of a typical endpoint mix on a given database.
+
+Run from the backend directory, once per database to compare::
+
+    python -m app.db.benchmark sqlite+aiosqlite:////tmp/bench.db
+    python -m app.db.benchmark postgresql+asyncpg://postgres@localhost/bench
+
+The app is driven in-process (no network), so the numbers reflect the
+request handling and the database, not uvicorn. Point it at a scratch
+database: it creates the tables if needed and adds ``--users`` users
+with ``SEED_ROWS`` rows of everything. Then ``--concurrency`` clients
+send requests drawn from ``MIX`` for ``--seconds`` and the report lists
+requests per second and latency percentiles per operation.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+SEED_ROWS = 20
+
+
+@dataclass
+class Operation:
+    name: str
+    method: str
+    path: str
+    weight: int
+    json: dict | None = None
+    params: dict = field(default_factory=dict)
+
+
+PROBLEM = {
+    "title": "Connection pool exhaustion under load",
+    "difficulty": "Medium",
+    "situation": "Requests queued behind a pool of ten connections " * 8,
+    "task": "Keep p99 under 200 ms at peak",
+    "action": "Moved slow work off request connections and sized the pool",
+    "result": "p99 back to 90 ms",
+    "tags": ["postgres", "pooling"],
+}
+
+# Roughly what the frontend sends: mostly list and detail reads
+MIX = [
+    Operation("bootstrap", "GET", "/bootstrap", 5),
+    Operation("list problems", "GET", "/problems", 30, params={"size": 20}),
+    Operation("get problem", "GET", "/problems/{problem_id}", 15),
+    Operation("dashboard stats", "GET", "/dashboard/stats", 15),
+    Operation("list learnings", "GET", "/learnings", 10),
+    Operation("list questions", "GET", "/interview-questions", 10),
+    Operation("create problem", "POST", "/problems", 8, json=PROBLEM),
+    Operation("update problem", "PUT", "/problems/{problem_id}", 7, json={"title": "Pool sizing"}),
+    Operation("create learning", "POST", "/learnings", 5, json={"topic": "WAL", "tags": ["sqlite"]}),
+]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def _seed(client, users: int) -> list[dict]:
+    from app.core.security import create_access_token
+    from app.db.session import AsyncSessionLocal
+    from app.models.user import User
+
+    run = uuid.uuid4().hex[:8]
+    seeded = []
+    for i in range(users):
+        async with AsyncSessionLocal() as db:
+            user = User(email=f"bench-{run}-{i}@example.com", full_name=f"Bench {i}")
+            db.add(user)
+            await db.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+        ids = {}
+        for j in range(SEED_ROWS):
+            response = await client.post(
+                "/problems", headers=headers, json={**PROBLEM, "title": f"Problem {j}"}
+            )
+            response.raise_for_status()
+            ids.setdefault("problem_id", response.json()["id"])
+            for path, payload in (
+                ("/learnings", {"topic": f"Learning {j}", "tags": ["postgres"]}),
+                (
+                    "/interview-questions",
+                    {
+                        "question": f"Question {j}?",
+                        "answer": "Yes",
+                        "company": "Acme",
+                        "asked_date": "2024-05-01",
+                    },
+                ),
+            ):
+                (await client.post(path, headers=headers, json=payload)).raise_for_status()
+        seeded.append({"headers": headers, "ids": ids})
+    return seeded
+
+
+async def run_benchmark(users: int, concurrency: int, seconds: float) -> None:
+    import httpx
+
+    from app.db.base import Base
+    from app.db.session import engine
+    from app.main import app
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench/api/v1") as client:
+        seeded = await _seed(client, users)
+        weights = [op.weight for op in MIX]
+        latencies: dict[str, list[float]] = defaultdict(list)
+        errors: dict[str, int] = defaultdict(int)
+        deadline = time.perf_counter() + seconds
+
+        async def worker(rng: random.Random) -> None:
+            while time.perf_counter() < deadline:
+                op = rng.choices(MIX, weights)[0]
+                user = rng.choice(seeded)
+                started = time.perf_counter()
+                response = await client.request(
+                    op.method,
+                    op.path.format(**user["ids"]),
+                    headers=user["headers"],
+                    params=op.params,
+                    json=op.json,
+                )
+                elapsed = (time.perf_counter() - started) * 1000
+                if response.status_code >= 400:
+                    errors[op.name] += 1
+                else:
+                    latencies[op.name].append(elapsed)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(random.Random(i)) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"{engine.url.render_as_string(hide_password=True)}")
+    print(f"{concurrency} clients, {elapsed:.1f} s, {total / elapsed:.0f} req/s\n")
+    print(f"{'operation':<18}{'count':>7}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for op in MIX:
+        values = latencies[op.name]
+        if not values:
+            print(f"{op.name:<18}{0:>7}{errors[op.name]:>8}")
+            continue
+        print(
+            f"{op.name:<18}{len(values):>7}{errors[op.name]:>8}"
+            f"{_percentile(values, 50):>9.1f}{_percentile(values, 95):>9.1f}"
+            f"{_percentile(values, 99):>9.1f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.db.benchmark")
+    parser.add_argument("database_url")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before anything imports the settings or the engine
+        os.environ["DATABASE_URL"] = args.database_url
+        os.environ["DATABASE_REPLICA_URLS"] = "[]"
+        os.environ["DATABASE_SHARD_URLS"] = "[]"
+        os.environ["EVENTS_PG_BRIDGE"] = "false"
+        # Measure the database, not the per-user limits
+        os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+        from app.services import portfolio, resume
+
+        portfolio.PORTFOLIO_DIR = Path(tmp) / "portfolios"
+        resume.RESUME_CACHE_DIR = Path(tmp) / "resume_cache"
+        try:
+            asyncio.run(run_benchmark(args.users, args.concurrency, args.seconds))
+        finally:
+            resume.renderer.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
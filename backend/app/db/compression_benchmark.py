@@ -0,0 +1,236 @@
+"""Table size, buffer hit ratio and read latency of compressed STAR columns.
+
+Run from the backend directory against a scratch PostgreSQL database::
+
+    python -m app.db.compression_benchmark postgresql://postgres@localhost/bench
+
+Fills two copies of a problems-like table with the same generated HTML
+write-ups: one with plain ``text`` columns (TOAST compresses them with
+pglz, the old layout) and one with ``CompressedText`` and ``STORAGE
+EXTERNAL`` (the current one). Then it reports each table's heap and
+TOAST size, and runs the same random detail reads (one row by id) and
+list reads (a user's ``--page`` newest rows) against both, reporting
+latency percentiles including decoding, and the buffer hit ratio of
+those reads from ``pg_statio_user_tables``. Hit ratios only differ once
+the tables outgrow ``shared_buffers``; size ``--rows`` accordingly.
+"""
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+COLUMNS = ("situation", "task", "action", "result")
+
+_WORDS = (
+    "request latency pool replica index query cache deploy rollback migration "
+    "customer incident outage partition vacuum lock timeout retry queue worker "
+    "throughput regression dashboard alert budget schema shard tenant billing "
+    "we the a to of and in for with on was were that it this our after before "
+    "because reduced increased measured profiled rewrote moved split merged "
+    "postgres redis kafka nginx kubernetes terraform python react celery grafana"
+).split()
+
+
+def _paragraphs(rng: random.Random, size: int) -> str:
+    """Rich-text HTML of roughly ``size`` characters, like the editor emits."""
+    parts = []
+    length = 0
+    while length < size:
+        words = [rng.choice(_WORDS) for _ in range(rng.randint(25, 70))]
+        if rng.random() < 0.3:
+            items = "".join(
+                f"<li>{' '.join(words[i : i + 8])}</li>" for i in range(0, len(words), 8)
+            )
+            block = f"<ul>{items}</ul>"
+        else:
+            words[rng.randrange(len(words))] = f"<strong>{rng.choice(_WORDS)}</strong>"
+            block = f"<p>{' '.join(words).capitalize()}.</p>"
+        parts.append(block)
+        length += len(block)
+    return "".join(parts)
+
+
+def _tables():
+    from sqlalchemy import Column, DateTime, Index, MetaData, String, Table, Text
+
+    from app.db.base_class import CompressedText
+
+    metadata = MetaData()
+    tables = {}
+    for layout, column_type in (("text", Text), ("zstd", CompressedText)):
+        name = f"compression_bench_{layout}"
+        tables[layout] = Table(
+            name,
+            metadata,
+            Column("id", String(36), primary_key=True),
+            Column("user_id", String(36), nullable=False),
+            Column("title", String(255), nullable=False),
+            *(Column(column, column_type(), nullable=False) for column in COLUMNS),
+            Column("created_at", DateTime, nullable=False),
+            Index(f"ix_{name}_user_created", "user_id", "created_at"),
+        )
+    return metadata, tables
+
+
+def _fill(conn, tables, rows: int, users: list[str]) -> list[str]:
+    from sqlalchemy import insert
+
+    rng = random.Random(0)
+    started = datetime(2024, 1, 1)
+    ids = []
+    batch = []
+    for i in range(rows):
+        row = {
+            "id": str(uuid.uuid4()),
+            "user_id": rng.choice(users),
+            "title": f"Problem {i}",
+            # Situation and action carry the long write-ups
+            "situation": _paragraphs(rng, rng.randint(1500, 6000)),
+            "task": _paragraphs(rng, rng.randint(200, 800)),
+            "action": _paragraphs(rng, rng.randint(2000, 8000)),
+            "result": _paragraphs(rng, rng.randint(300, 1500)),
+            "created_at": started + timedelta(minutes=i),
+        }
+        ids.append(row["id"])
+        batch.append(row)
+        if len(batch) == 500 or i == rows - 1:
+            for table in tables.values():
+                conn.execute(insert(table), batch)
+            conn.commit()
+            batch = []
+    return ids
+
+
+def _sizes(conn, table) -> tuple[int, int]:
+    from sqlalchemy import text
+
+    return conn.execute(
+        text(
+            "SELECT pg_relation_size(c.oid), "
+            "COALESCE(pg_total_relation_size(NULLIF(c.reltoastrelid, 0)), 0) "
+            "FROM pg_class c WHERE c.relname = :name"
+        ),
+        {"name": table.name},
+    ).one()
+
+
+def _block_counters(conn, table) -> tuple[int, int]:
+    from sqlalchemy import text
+
+    return conn.execute(
+        text(
+            "SELECT heap_blks_hit + COALESCE(toast_blks_hit, 0), "
+            "heap_blks_read + COALESCE(toast_blks_read, 0) "
+            "FROM pg_statio_user_tables WHERE relname = :name"
+        ),
+        {"name": table.name},
+    ).one()
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def _read(conn, table, ids, users, reads: int, page: int) -> dict[str, list[float]]:
+    from sqlalchemy import bindparam, select
+
+    detail = select(table).where(table.c.id == bindparam("id"))
+    listing = (
+        select(table)
+        .where(table.c.user_id == bindparam("user_id"))
+        .order_by(table.c.created_at.desc())
+        .limit(page)
+    )
+    rng = random.Random(1)
+    latencies = {"detail": [], "list": []}
+    for _ in range(reads):
+        started = time.perf_counter()
+        conn.execute(detail, {"id": rng.choice(ids)}).one()
+        latencies["detail"].append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        conn.execute(listing, {"user_id": rng.choice(users)}).all()
+        latencies["list"].append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def run_benchmark(url, rows: int, users: int, reads: int, page: int) -> None:
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(url)
+    metadata, tables = _tables()
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    with engine.connect() as conn:
+        metadata.drop_all(conn)
+        metadata.create_all(conn)
+        for column in COLUMNS:
+            conn.execute(
+                text(
+                    f"ALTER TABLE {tables['zstd'].name} "
+                    f"ALTER COLUMN {column} SET STORAGE EXTERNAL"
+                )
+            )
+        conn.commit()
+        ids = _fill(conn, tables, rows, user_ids)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in tables.values():
+            conn.execute(text(f"VACUUM ANALYZE {table.name}"))
+        shared_buffers = conn.execute(text("SHOW shared_buffers")).scalar()
+
+    print(f"{rows} rows, {users} users, shared_buffers {shared_buffers}\n")
+    print(f"{'layout':<8}{'heap MB':>9}{'toast MB':>10}{'total MB':>10}")
+    for layout, table in tables.items():
+        with engine.connect() as conn:
+            heap, toast = _sizes(conn, table)
+        print(f"{layout:<8}{heap / 2**20:>9.1f}{toast / 2**20:>10.1f}{(heap + toast) / 2**20:>10.1f}")
+
+    print(
+        f"\n{'layout':<8}{'hit %':>7}"
+        f"{'detail p50':>12}{'p95 ms':>8}{'list p50':>10}{'p95 ms':>8}"
+    )
+    for layout, table in tables.items():
+        with engine.connect() as conn:
+            hit_before, read_before = _block_counters(conn, table)
+            latencies = _read(conn, table, ids, user_ids, reads, page)
+            conn.rollback()
+        # The statistics collector reports with a short delay
+        time.sleep(1)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_stat_clear_snapshot()"))
+            hit_after, read_after = _block_counters(conn, table)
+        hits, misses = hit_after - hit_before, read_after - read_before
+        ratio = 100 * hits / (hits + misses) if hits + misses else 100.0
+        print(
+            f"{layout:<8}{ratio:>7.1f}"
+            f"{_percentile(latencies['detail'], 50):>12.2f}"
+            f"{_percentile(latencies['detail'], 95):>8.2f}"
+            f"{_percentile(latencies['list'], 50):>10.2f}"
+            f"{_percentile(latencies['list'], 95):>8.2f}"
+        )
+
+    with engine.connect() as conn:
+        metadata.drop_all(conn)
+        conn.commit()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.db.compression_benchmark")
+    parser.add_argument("database_url")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--page", type=int, default=20)
+    args = parser.parse_args()
+    from sqlalchemy.engine import make_url
+
+    # Synchronous, with the driver the migrations use
+    url = make_url(args.database_url).set(drivername="postgresql+psycopg2")
+    run_benchmark(url, args.rows, args.users, args.reads, args.page)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class CapturedStatement:
+    sql: str
+    parameters: object
+    duration_ms: float
+
+
+@dataclass
+class QueryRecorder:
+    """Statements executed while a recorder is active, with timings."""
+
+    statements: list[CapturedStatement] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(s.duration_ms for s in self.statements)
+
+    def report(self) -> str:
+        lines = [f"{self.count} statements, {self.total_ms:.1f} ms"]
+        for i, s in enumerate(self.statements, 1):
+            sql = " ".join(s.sql.split())
+            lines.append(f"  {i:>3}. [{s.duration_ms:7.2f} ms] {sql}")
+        return "\n".join(lines)
+
+
+_active: ContextVar[QueryRecorder | None] = ContextVar("query_recorder", default=None)
+
+
+@contextmanager
+def record_queries():
+    """Capture every statement run from the current context.
+
+    The recorder lives in a context variable, so concurrent requests on
+    the same engine only see their own statements. SQLAlchemy's async
+    layer carries the context into the greenlet that runs the driver.
+    """
+    recorder = QueryRecorder()
+    token = _active.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _active.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    if _active.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record(conn, cursor, statement, parameters, context, executemany):
+    recorder = _active.get()
+    started = conn.info.get("query_started")
+    if recorder is None or not started:
+        return
+    started = started.pop()
+    recorder.statements.append(
+        CapturedStatement(
+            statement, parameters, (time.perf_counter() - started) * 1000
+        )
+    )
@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from functools import cache
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+
+@dataclass
+class Page:
+    items: list
+    total: int | None
+    has_more: bool
+
+
+@dataclass(frozen=True)
+class _PageStatements:
+    rows: Select
+    counted: Select
+    count: Select
+
+
+def _page_statements(query: Select, total) -> _PageStatements:
+    offset, limit = bindparam("offset"), bindparam("limit")
+    counted = query.add_columns(total if total is not None else func.count().over())
+    if total is None:
+        count = select(func.count()).select_from(query.order_by(None).subquery())
+    else:
+        count = select(total)
+    return _PageStatements(
+        rows=query.offset(offset).limit(limit),
+        counted=counted.offset(offset).limit(limit),
+        count=count,
+    )
+
+
+# Prebuilt queries (app.db.statements) live as long as the process, so
+# their page variants are built once
+_prebuilt_page_statements = cache(_page_statements)
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    page: int,
+    size: int,
+    include_total: bool = True,
+    total=None,
+    params: dict | None = None,
+) -> Page:
+    """Fetch one page of ``query`` (an ordered single-entity select) in one query.
+
+    The total rides along with the rows: from ``total`` when given (a
+    scalar subquery, e.g. a maintained counter for the unfiltered list),
+    otherwise from ``count(*) OVER ()``. Without ``include_total`` one
+    extra row is fetched to tell whether there is a next page.
+
+    Pass ``params`` when ``query`` and ``total`` come from
+    ``app.db.statements``; they fill its bound parameters.
+    """
+    if params is None:
+        statements = _page_statements(query, total)
+    else:
+        statements = _prebuilt_page_statements(query, total)
+    offset = (page - 1) * size
+    window = {**(params or {}), "offset": offset, "limit": size}
+
+    if not include_total:
+        result = await db.execute(statements.rows, {**window, "limit": size + 1})
+        items = result.scalars().all()
+        return Page(items=items[:size], total=None, has_more=len(items) > size)
+
+    rows = (await db.execute(statements.counted, window)).all()
+    if rows:
+        count = rows[0][1]
+    elif page == 1:
+        count = 0
+    else:
+        # Past the last page there is no row to carry the total
+        count = (await db.execute(statements.count, params)).scalar()
+    items = [row[0] for row in rows]
+    return Page(items=items, total=count, has_more=offset + len(items) < count)
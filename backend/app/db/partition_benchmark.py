@@ -0,0 +1,149 @@
+"""Per-user query latency and vacuum time, plain vs hash-partitioned.
+
+Run from the backend directory against a scratch PostgreSQL database::
+
+    python -m app.db.partition_benchmark postgresql://postgres@localhost/bench
+
+Builds two copies of a problems-like table with the same ``--rows`` rows
+spread over ``--users`` users: one plain heap, and one hash partitioned
+on ``user_id`` into ``--partitions`` the way ``app.db.partitioning``
+lays it out. Both get the ``(user_id, created_at)`` index. Then:
+
+- the same random users' first page and row count are read from both,
+  reporting latency percentiles;
+- ``--churn`` of the rows are updated, the way edits leave dead tuples,
+  and each table is vacuumed, reporting the whole-table time and, for
+  the partitioned one, the slowest single partition. Autovacuum works
+  one partition at a time, so that bounds how long any one run takes.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+COLUMNS = (
+    "id varchar(36) NOT NULL, user_id varchar(36) NOT NULL, "
+    "title varchar(255) NOT NULL, body text NOT NULL, "
+    "created_at timestamp NOT NULL, updated_at timestamp NOT NULL"
+)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def _timed(conn, sql: str, params=None) -> float:
+    started = time.perf_counter()
+    conn.exec_driver_sql(sql, params or ())
+    return (time.perf_counter() - started) * 1000
+
+
+def _build(conn, rows: int, users: int, partitions: int) -> None:
+    conn.exec_driver_sql("DROP TABLE IF EXISTS partition_bench_plain, partition_bench_hash")
+    conn.exec_driver_sql(f"CREATE TABLE partition_bench_plain ({COLUMNS}, PRIMARY KEY (id))")
+    conn.exec_driver_sql(
+        f"CREATE TABLE partition_bench_hash ({COLUMNS}, PRIMARY KEY (id, user_id)) "
+        "PARTITION BY HASH (user_id)"
+    )
+    for remainder in range(partitions):
+        conn.exec_driver_sql(
+            f"CREATE TABLE partition_bench_hash_p{remainder} PARTITION OF partition_bench_hash "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        )
+    # Server-side generation: the same rows in both tables
+    conn.exec_driver_sql(
+        "INSERT INTO partition_bench_plain "
+        "SELECT md5(g::text), 'user-' || (g %% %s), 'Problem ' || g, "
+        "repeat(md5(g::text), 12), "
+        "timestamp '2024-01-01' + g * interval '1 minute', now() "
+        "FROM generate_series(1, %s) g",
+        (users, rows),
+    )
+    conn.exec_driver_sql("INSERT INTO partition_bench_hash SELECT * FROM partition_bench_plain")
+    for table in ("partition_bench_plain", "partition_bench_hash"):
+        conn.exec_driver_sql(f"CREATE INDEX ON {table} (user_id, created_at)")
+        conn.exec_driver_sql(f"VACUUM ANALYZE {table}")
+
+
+def _reads(conn, table: str, users: list[str]) -> dict[str, list[float]]:
+    latencies = {"page": [], "count": []}
+    for user in users:
+        latencies["page"].append(
+            _timed(
+                conn,
+                f"SELECT * FROM {table} WHERE user_id = %s "
+                "ORDER BY created_at DESC LIMIT 20",
+                (user,),
+            )
+        )
+        latencies["count"].append(
+            _timed(conn, f"SELECT count(*) FROM {table} WHERE user_id = %s", (user,))
+        )
+    return latencies
+
+
+def run_benchmark(url, rows: int, users: int, partitions: int, reads: int, churn: float) -> None:
+    from sqlalchemy import create_engine
+
+    engine = create_engine(url, isolation_level="AUTOCOMMIT")
+    rng = random.Random(0)
+    with engine.connect() as conn:
+        started = time.perf_counter()
+        _build(conn, rows, users, partitions)
+        print(
+            f"{rows} rows, {users} users, {partitions} partitions "
+            f"(built in {time.perf_counter() - started:.0f} s)\n"
+        )
+
+        sample = [f"user-{rng.randrange(users)}" for _ in range(reads)]
+        # Warm both tables equally before timing
+        for table in ("partition_bench_plain", "partition_bench_hash"):
+            _reads(conn, table, sample[:50])
+        print(f"{'layout':<13}{'page p50':>9}{'p95 ms':>8}{'count p50':>11}{'p95 ms':>8}")
+        for layout, table in (("plain", "partition_bench_plain"), ("partitioned", "partition_bench_hash")):
+            latencies = _reads(conn, table, sample)
+            print(
+                f"{layout:<13}{_percentile(latencies['page'], 50):>9.2f}"
+                f"{_percentile(latencies['page'], 95):>8.2f}"
+                f"{_percentile(latencies['count'], 50):>11.2f}"
+                f"{_percentile(latencies['count'], 95):>8.2f}"
+            )
+
+        for table in ("partition_bench_plain", "partition_bench_hash"):
+            conn.exec_driver_sql(
+                f"UPDATE {table} SET updated_at = now() WHERE random() < %s", (churn,)
+            )
+        plain = _timed(conn, "VACUUM partition_bench_plain")
+        # Vacuuming the parent vacuums each partition in turn
+        per_partition = [
+            _timed(conn, f"VACUUM partition_bench_hash_p{remainder}")
+            for remainder in range(partitions)
+        ]
+        print(f"\n{'layout':<13}{'vacuum ms':>10}{'slowest partition ms':>22}")
+        print(f"{'plain':<13}{plain:>10.0f}")
+        print(f"{'partitioned':<13}{sum(per_partition):>10.0f}{max(per_partition):>22.0f}")
+
+        conn.exec_driver_sql("DROP TABLE partition_bench_plain, partition_bench_hash")
+
+
+def main() -> int:
+    from sqlalchemy.engine import make_url
+
+    parser = argparse.ArgumentParser(prog="python -m app.db.partition_benchmark")
+    parser.add_argument("database_url")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--churn", type=float, default=0.1)
+    args = parser.parse_args()
+    # Synchronous, with the driver the migrations use
+    url = make_url(args.database_url).set(drivername="postgresql+psycopg2")
+    run_benchmark(url, args.rows, args.users, args.partitions, args.reads, args.churn)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""Online conversion of per-user tables to and from hash partitioning.
+
+Used from Alembic migrations::
+
+    convert_table(op, "problems", partitions=16)    # upgrade
+    convert_table(op, "problems", partitions=None)  # downgrade
+
+The table is rebuilt next to the original and swapped in at the end:
+
+1. create ``<table>_new`` (hash partitioned on ``user_id``, or plain),
+   with the same columns, defaults, checks, foreign keys and indexes;
+2. install a trigger that mirrors every write on the old table into the
+   new one (as an upsert, so it never trips over a row a batch is
+   copying) and records deleted keys in ``<table>_mirror_deletes``;
+3. copy existing rows in id-ordered batches, each in its own short
+   transaction, skipping rows the trigger already copied;
+4. in one brief transaction, lock the old table, delete the recorded
+   keys from the new one again (a batch whose snapshot predates a delete
+   copies the row back), rename both tables and their indexes, and drop
+   the old one.
+
+Only step 4 takes a lock that blocks readers, and it gives up after
+``lock_timeout`` and retries rather than queueing behind long queries.
+Postgres requires the partition key in every unique index, so the
+primary key of a partitioned table becomes ``(id, user_id)``. The new
+table is created in the old one's schema. Other dialects (SQLite in
+development) are left untouched.
+"""
+
+import logging
+import time
+
+import sqlalchemy as sa
+
+logger = logging.getLogger(__name__)
+
+PARTITION_KEY = "user_id"
+
+
+def _schema(bind, table: str) -> str:
+    """The table's schema, quoted the way ``pg_get_indexdef`` writes it."""
+    return bind.execute(
+        sa.text(
+            "SELECT quote_ident(n.nspname) FROM pg_class c "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.oid = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    ).scalar_one()
+
+
+def _indexes(bind, table: str) -> list[tuple[str, str, bool]]:
+    rows = bind.execute(
+        sa.text(
+            "SELECT i.relname, pg_get_indexdef(i.oid), x.indisunique "
+            "FROM pg_index x "
+            "JOIN pg_class i ON i.oid = x.indexrelid "
+            "WHERE x.indrelid = CAST(:table AS regclass) AND NOT x.indisprimary "
+            "AND NOT EXISTS (SELECT 1 FROM pg_inherits h WHERE h.inhrelid = x.indexrelid)"
+        ),
+        {"table": table},
+    ).all()
+    return [tuple(row) for row in rows]
+
+
+def _foreign_keys(bind, table: str) -> list[tuple[str, str]]:
+    rows = bind.execute(
+        sa.text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f' "
+            "AND conparentid = 0"
+        ),
+        {"table": table},
+    ).all()
+    return [tuple(row) for row in rows]
+
+
+def _columns(bind, table: str) -> list[str]:
+    return bind.execute(
+        sa.text(
+            "SELECT attname FROM pg_attribute "
+            "WHERE attrelid = CAST(:table AS regclass) AND attnum > 0 "
+            "AND NOT attisdropped ORDER BY attnum"
+        ),
+        {"table": table},
+    ).scalars().all()
+
+
+def _primary_key(partitions: int | None) -> str:
+    return f"id, {PARTITION_KEY}" if partitions else "id"
+
+
+def _create_copy(bind, schema: str, table: str, new: str, partitions: int | None) -> None:
+    partition_clause = f" PARTITION BY HASH ({PARTITION_KEY})" if partitions else ""
+    bind.exec_driver_sql(
+        f"CREATE TABLE {schema}.{new} (LIKE {schema}.{table} INCLUDING DEFAULTS "
+        f"INCLUDING CONSTRAINTS INCLUDING STORAGE){partition_clause}"
+    )
+    for remainder in range(partitions or 0):
+        bind.exec_driver_sql(
+            f"CREATE TABLE {schema}.{new}_p{remainder} PARTITION OF {schema}.{new} "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        )
+    bind.exec_driver_sql(
+        f"ALTER TABLE {schema}.{new} ADD PRIMARY KEY ({_primary_key(partitions)})"
+    )
+    for name, definition in _foreign_keys(bind, f"{schema}.{table}"):
+        bind.exec_driver_sql(
+            f"ALTER TABLE {schema}.{new} ADD CONSTRAINT {name}_new {definition}"
+        )
+    for name, definition, unique in _indexes(bind, f"{schema}.{table}"):
+        if partitions and unique and PARTITION_KEY not in definition:
+            raise RuntimeError(
+                f"{name} is unique without {PARTITION_KEY}; it can't exist on a "
+                "hash-partitioned table"
+            )
+        definition = definition.replace(f" INDEX {name} ON ", f" INDEX {name}_new ON ", 1)
+        definition = definition.replace(
+            f" ONLY {schema}.{table} ", f" {schema}.{new} ", 1
+        )
+        definition = definition.replace(f" {schema}.{table} ", f" {schema}.{new} ", 1)
+        bind.exec_driver_sql(definition)
+
+
+def _install_mirror_trigger(
+    bind, schema: str, table: str, new: str, partitions: int | None
+) -> None:
+    log = f"{schema}.{table}_mirror_deletes"
+    key = _primary_key(partitions)
+    updates = ", ".join(
+        f"{column} = EXCLUDED.{column}"
+        for column in _columns(bind, f"{schema}.{table}")
+        if column not in ("id", PARTITION_KEY)
+    )
+    bind.exec_driver_sql(
+        f"CREATE TABLE {log} (id text NOT NULL, {PARTITION_KEY} text NOT NULL)"
+    )
+    # Upserts: a batch may hold the same row uncommitted, and a plain
+    # INSERT would then fail once that batch commits
+    bind.exec_driver_sql(
+        f"""
+        CREATE FUNCTION {schema}.{table}_mirror() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' OR (
+                TG_OP = 'UPDATE'
+                AND (OLD.id, OLD.{PARTITION_KEY}) IS DISTINCT FROM (NEW.id, NEW.{PARTITION_KEY})
+            ) THEN
+                DELETE FROM {schema}.{new}
+                    WHERE id = OLD.id AND {PARTITION_KEY} = OLD.{PARTITION_KEY};
+                INSERT INTO {log} VALUES (OLD.id, OLD.{PARTITION_KEY});
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                DELETE FROM {log}
+                    WHERE id = NEW.id AND {PARTITION_KEY} = NEW.{PARTITION_KEY};
+                INSERT INTO {schema}.{new} SELECT (NEW).*
+                    ON CONFLICT ({key}) DO UPDATE SET {updates};
+            END IF;
+            RETURN NULL;
+        END $$
+        """
+    )
+    bind.exec_driver_sql(
+        f"CREATE TRIGGER {table}_mirror AFTER INSERT OR UPDATE OR DELETE "
+        f"ON {schema}.{table} FOR EACH ROW EXECUTE FUNCTION {schema}.{table}_mirror()"
+    )
+
+
+def _copy_rows(bind, schema: str, table: str, new: str, batch_size: int) -> None:
+    last_id = ""
+    copied = 0
+    while True:
+        upto = bind.execute(
+            sa.text(
+                f"SELECT max(id) FROM (SELECT id FROM {schema}.{table} "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit) AS batch"
+            ),
+            {"last_id": last_id, "limit": batch_size},
+        ).scalar()
+        if upto is None:
+            break
+        result = bind.execute(
+            sa.text(
+                f"INSERT INTO {schema}.{new} SELECT * FROM {schema}.{table} "
+                "WHERE id > :last_id AND id <= :upto ON CONFLICT DO NOTHING"
+            ),
+            {"last_id": last_id, "upto": upto},
+        )
+        copied += result.rowcount
+        last_id = upto
+    logger.info("Copied %d rows from %s into %s", copied, table, new)
+
+
+def _swap(bind, schema: str, table: str, new: str, lock_timeout: str, attempts: int) -> None:
+    index_names = [name for name, _, _ in _indexes(bind, f"{schema}.{new}")]
+    constraint_names = [name for name, _ in _foreign_keys(bind, f"{schema}.{new}")]
+    # Primary keys and indexes Postgres named after the new table and its
+    # partitions, e.g. problems_new_pkey or problems_new_p3_user_id_idx
+    derived_names = bind.execute(
+        sa.text(
+            "SELECT c.relname FROM pg_class c "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE c.relkind IN ('i', 'I') AND quote_ident(n.nspname) = :schema "
+            "AND starts_with(c.relname, :prefix)"
+        ),
+        {"schema": schema, "prefix": f"{new}_"},
+    ).scalars().all()
+    log = f"{schema}.{table}_mirror_deletes"
+    statements = [
+        f"SET LOCAL lock_timeout = '{lock_timeout}'",
+        f"LOCK TABLE {schema}.{table} IN ACCESS EXCLUSIVE MODE",
+        # Rows a batch copied back after the trigger had deleted them
+        f"DELETE FROM {schema}.{new} AS n USING {log} AS d "
+        f"WHERE n.id = d.id AND n.{PARTITION_KEY} = d.{PARTITION_KEY}",
+        f"DROP TRIGGER {table}_mirror ON {schema}.{table}",
+        f"DROP FUNCTION {schema}.{table}_mirror()",
+        f"DROP TABLE {log}",
+        f"DROP TABLE {schema}.{table}",
+        f"ALTER TABLE {schema}.{new} RENAME TO {table}",
+        *(
+            f"ALTER INDEX {schema}.{name} RENAME TO {name.removesuffix('_new')}"
+            for name in index_names
+        ),
+        *(
+            f"ALTER TABLE {schema}.{table} RENAME CONSTRAINT {name} "
+            f"TO {name.removesuffix('_new')}"
+            for name in constraint_names
+        ),
+    ]
+    partitions = bind.execute(
+        sa.text(
+            "SELECT c.relname FROM pg_inherits h JOIN pg_class c ON c.oid = h.inhrelid "
+            "WHERE h.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": f"{schema}.{new}"},
+    ).scalars().all()
+    statements += [
+        f"ALTER TABLE {schema}.{name} RENAME TO {table}{name.removeprefix(new)}"
+        for name in partitions
+    ]
+    statements += [
+        f"ALTER INDEX {schema}.{name} RENAME TO {table}{name.removeprefix(new)}"
+        for name in derived_names
+    ]
+    # One simple-protocol query runs as a single implicit transaction, so
+    # the swap is atomic even though the caller is in autocommit mode.
+    script = "BEGIN; " + "; ".join(statements) + "; COMMIT;"
+    for attempt in range(1, attempts + 1):
+        try:
+            bind.exec_driver_sql(script)
+            return
+        except sa.exc.OperationalError:
+            bind.exec_driver_sql("ROLLBACK")
+            if attempt == attempts:
+                raise
+            logger.warning("Could not lock %s for the swap, retrying", table)
+            time.sleep(attempt)
+
+
+def convert_table(
+    op,
+    table: str,
+    partitions: int | None,
+    batch_size: int = 5000,
+    lock_timeout: str = "5s",
+    attempts: int = 10,
+) -> None:
+    """Rebuild ``table`` hash-partitioned into ``partitions`` (None = plain)."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    schema = _schema(bind, table)
+    new = f"{table}_new"
+    with op.get_context().autocommit_block():
+        _create_copy(bind, schema, table, new, partitions)
+        _install_mirror_trigger(bind, schema, table, new, partitions)
+        _copy_rows(bind, schema, table, new, batch_size)
+        bind.exec_driver_sql(f"ANALYZE {schema}.{new}")
+        _swap(bind, schema, table, new, lock_timeout, attempts)
@@ -0,0 +1,284 @@
+"""Move users between shards.
+
+Run from the backend directory with::
+
+    python -m app.db.rebalance pin
+    python -m app.db.rebalance move USER_ID SHARD
+    python -m app.db.rebalance rebalance [--limit N]
+
+``pin`` writes a directory entry for every user that doesn't have one,
+using the ring of the *current* ``DATABASE_SHARD_URLS``; run it before
+adding a shard so nobody's data is silently remapped. ``rebalance`` then
+moves pinned users whose ring shard has changed, ``--limit`` at a time.
+
+A move is online: the user stays readable throughout and writes are
+refused with 503 only while the rows are copied.
+
+1. mark the user ``moving`` and wait out the directory cache, so every
+   worker stops sending the user's writes anywhere;
+2. copy the user's rows to the target in one transaction;
+3. point the directory at the target and clear ``moving``;
+4. wait out the cache again, then delete the rows from the source.
+
+If the copy fails the user stays on the source and ``moving`` is cleared.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select, update
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.session import GLOBAL_TABLES, engine, shard_engines, shard_router
+from app.models.company import Company, CompanyAlias
+from app.models.shard_directory import ShardDirectory
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Extra time for requests that read the old placement just before it
+# changed to finish their transaction
+DRAIN_SECONDS = 5
+
+USER_TABLES = [
+    table
+    for table in Base.metadata.sorted_tables
+    if "user_id" in table.c and table.name not in GLOBAL_TABLES
+]
+
+
+async def _wait_for_workers() -> None:
+    await asyncio.sleep(settings.SHARD_DIRECTORY_CACHE_SECONDS + DRAIN_SECONDS)
+
+
+async def _current_shard(user_id: str) -> int:
+    async with engine.connect() as conn:
+        shard = (
+            await conn.execute(
+                select(ShardDirectory.shard).where(ShardDirectory.user_id == user_id)
+            )
+        ).scalar_one_or_none()
+    return shard_router.ring_shard(user_id) if shard is None else shard
+
+
+async def _set_placement(user_id: str, shard: int, moving: bool) -> None:
+    async with engine.begin() as conn:
+        values = {"shard": shard, "moving": moving}
+        if not moving:
+            values["moved_at"] = datetime.utcnow()
+        result = await conn.execute(
+            update(ShardDirectory).where(ShardDirectory.user_id == user_id).values(values)
+        )
+        if result.rowcount == 0:
+            await conn.execute(insert(ShardDirectory).values(user_id=user_id, **values))
+
+
+async def _company_ids(src, dst, user_id: str) -> dict[str, str]:
+    """Source company id -> target company id for the user's questions.
+
+    Companies are a per-shard catalog keyed by normalized name, so a
+    company may already exist on the target under another id. Their
+    aliases come along, since ``resolve_company`` looks companies up by
+    alias; ones the target already has are left as they are.
+    """
+    from app.models.interview_question import InterviewQuestion
+
+    companies = (
+        await src.execute(
+            select(Company).where(
+                Company.id.in_(
+                    select(InterviewQuestion.company_id).where(
+                        InterviewQuestion.user_id == user_id
+                    )
+                )
+            )
+        )
+    ).all()
+    mapping = {}
+    for company in companies:
+        existing = (
+            await dst.execute(
+                select(Company.id).where(
+                    Company.normalized_name == company.normalized_name
+                )
+            )
+        ).scalar_one_or_none()
+        if existing is None:
+            await dst.execute(
+                insert(Company).values(
+                    id=company.id,
+                    name=company.name,
+                    normalized_name=company.normalized_name,
+                    created_at=company.created_at,
+                )
+            )
+            existing = company.id
+        mapping[company.id] = existing
+
+    aliases = (
+        await src.execute(
+            select(CompanyAlias.alias, CompanyAlias.company_id).where(
+                CompanyAlias.company_id.in_(list(mapping))
+            )
+        )
+    ).all()
+    known = set(
+        (
+            await dst.execute(
+                select(CompanyAlias.alias).where(
+                    CompanyAlias.alias.in_([alias for alias, _ in aliases])
+                )
+            )
+        ).scalars()
+    )
+    missing = [
+        {"alias": alias, "company_id": mapping[company_id]}
+        for alias, company_id in aliases
+        if alias not in known
+    ]
+    if missing:
+        await dst.execute(insert(CompanyAlias), missing)
+    return mapping
+
+
+async def _copy_user(user_id: str, source: int, target: int) -> int:
+    copied = 0
+    # Read up front: the primary may also be the source or the target, and
+    # in SQLite mode it has a single connection
+    async with engine.connect() as primary:
+        user = (
+            await primary.execute(
+                select(User.email, User.full_name).where(User.id == user_id)
+            )
+        ).one()
+    async with (
+        shard_engines[source].connect() as src,
+        shard_engines[target].begin() as dst,
+    ):
+        # Leftovers of an earlier move that died after its copy committed
+        for table in reversed(USER_TABLES):
+            await dst.execute(delete(table).where(table.c.user_id == user_id))
+
+        if target:
+            has_user = (
+                await dst.execute(select(User.id).where(User.id == user_id))
+            ).scalar_one_or_none()
+            if has_user is None:
+                await dst.execute(
+                    insert(User).values(
+                        id=user_id, email=user.email, full_name=user.full_name
+                    )
+                )
+
+        company_ids = await _company_ids(src, dst, user_id)
+        for table in USER_TABLES:
+            rows = [
+                dict(row)
+                for row in (
+                    await src.execute(select(table).where(table.c.user_id == user_id))
+                ).mappings()
+            ]
+            if not rows:
+                continue
+            if "company_id" in table.c:
+                for row in rows:
+                    if row["company_id"] is not None:
+                        row["company_id"] = company_ids[row["company_id"]]
+            await dst.execute(insert(table), rows)
+            copied += len(rows)
+    return copied
+
+
+async def _delete_user(user_id: str, shard: int) -> None:
+    async with shard_engines[shard].begin() as conn:
+        for table in reversed(USER_TABLES):
+            await conn.execute(delete(table).where(table.c.user_id == user_id))
+        if shard:
+            await conn.execute(delete(User).where(User.id == user_id))
+
+
+async def move_user(user_id: str, target: int) -> None:
+    if not 0 <= target < len(shard_engines):
+        raise ValueError(f"No shard {target}; {len(shard_engines)} configured")
+    source = await _current_shard(user_id)
+    if source == target:
+        logger.info("User %s is already on shard %d", user_id, target)
+        return
+
+    await _set_placement(user_id, source, moving=True)
+    await _wait_for_workers()
+    try:
+        copied = await _copy_user(user_id, source, target)
+    except BaseException:
+        await _set_placement(user_id, source, moving=False)
+        raise
+    await _set_placement(user_id, target, moving=False)
+    logger.info(
+        "Copied %d rows of user %s from shard %d to %d", copied, user_id, source, target
+    )
+
+    # Readers with the old placement cached still use the source
+    await _wait_for_workers()
+    await _delete_user(user_id, source)
+
+
+async def pin_users() -> int:
+    async with engine.begin() as conn:
+        user_ids = (
+            await conn.execute(
+                select(User.id).where(
+                    User.id.not_in(select(ShardDirectory.user_id))
+                )
+            )
+        ).scalars().all()
+        for user_id in user_ids:
+            await conn.execute(
+                insert(ShardDirectory).values(
+                    user_id=user_id, shard=shard_router.ring_shard(user_id)
+                )
+            )
+    return len(user_ids)
+
+
+async def rebalance(limit: int | None) -> int:
+    async with engine.connect() as conn:
+        entries = (
+            await conn.execute(select(ShardDirectory.user_id, ShardDirectory.shard))
+        ).all()
+    misplaced = [
+        (user_id, shard_router.ring_shard(user_id))
+        for user_id, shard in entries
+        if shard != shard_router.ring_shard(user_id)
+    ][:limit]
+    for user_id, target in misplaced:
+        await move_user(user_id, target)
+    return len(misplaced)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.db.rebalance")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("pin", help="pin unpinned users to their current shard")
+    move = commands.add_parser("move", help="move one user to a shard")
+    move.add_argument("user_id")
+    move.add_argument("shard", type=int)
+    balance = commands.add_parser("rebalance", help="move users to their ring shard")
+    balance.add_argument("--limit", type=int)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "pin":
+        print(f"Pinned {asyncio.run(pin_users())} users")
+    elif args.command == "move":
+        asyncio.run(move_user(args.user_id, args.shard))
+    else:
+        print(f"Moved {asyncio.run(rebalance(args.limit))} users")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,333 @@
+import asyncio
+import bisect
+import hashlib
+import itertools
+import logging
+import time
 from collections.abc import AsyncGenerator
+from dataclasses import dataclass
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import HTTPException, Request, status
+from sqlalchemy import event, insert, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.security import read_token_subject
+from app.db.slow_queries import SlowQueryLog, current_endpoint
+from app.db.sqlite import create_sqlite_engines, is_sqlite_file
+from app.models.shard_directory import ShardDirectory
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    kwargs = {}
+    if make_url(url).get_driver_name() == "asyncpg":
+        # Statements are prepared on the server once per connection and
+        # reused by every later request on it
+        kwargs["connect_args"] = {
+            "prepared_statement_cache_size": settings.ASYNCPG_PREPARED_STATEMENT_CACHE_SIZE
+        }
+    return create_async_engine(url, echo=False, **kwargs)
+
+
+if is_sqlite_file(settings.DATABASE_URL):
+    # Single-node mode: one writer connection, a pool of readers
+    engine, read_engine = create_sqlite_engines(settings.DATABASE_URL)
+else:
+    engine = _create_engine(settings.DATABASE_URL)
+    read_engine = engine
+
+replica_engines = [_create_engine(url) for url in settings.DATABASE_REPLICA_URLS]
+
+# Shard 0 is the primary itself
+shard_engines = [engine, *(_create_engine(url) for url in settings.DATABASE_SHARD_URLS)]
+
+# Tables that only live on the primary, whichever shard a session is on.
+# Shards keep a bare copy of each of their users' rows so foreign keys hold.
+GLOBAL_TABLES = {"users", "shard_directory"}
+
+
+class ReplicaRouter:
+    """Round-robin over healthy replicas with read-your-writes protection.
+
+    Users who wrote within ``READ_YOUR_WRITES_SECONDS`` are sent to the
+    primary so they never read data older than their own write. Write
+    times are tracked per worker, so deployments with several workers
+    should keep the window comfortably above typical replication lag.
+    """
+
+    def __init__(self, engines: list[AsyncEngine]):
+        self.engines = engines
+        self._healthy = set(range(len(engines)))
+        self._counter = itertools.count()
+        self._recent_writes: dict[str, float] = {}
+
+    def note_write(self, user_id: str) -> None:
+        now = time.monotonic()
+        self._recent_writes[user_id] = now
+        # Drop expired entries occasionally so the map stays small
+        if len(self._recent_writes) > 10_000:
+            cutoff = now - settings.READ_YOUR_WRITES_SECONDS
+            self._recent_writes = {
+                k: v for k, v in self._recent_writes.items() if v > cutoff
+            }
+
+    def recently_wrote(self, user_id: str) -> bool:
+        wrote_at = self._recent_writes.get(user_id)
+        return (
+            wrote_at is not None
+            and time.monotonic() - wrote_at < settings.READ_YOUR_WRITES_SECONDS
+        )
+
+    def pick(self, user_id: str | None) -> AsyncEngine | None:
+        if not self._healthy or (user_id and self.recently_wrote(user_id)):
+            return None
+        healthy = sorted(self._healthy)
+        return self.engines[healthy[next(self._counter) % len(healthy)]]
+
+    async def check_health(self) -> None:
+        for i, replica in enumerate(self.engines):
+            try:
+                async with replica.connect() as conn:
+                    await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout=2)
+            except Exception:
+                if i in self._healthy:
+                    logger.warning("Replica %d failed health check; routing reads to primary", i)
+                self._healthy.discard(i)
+            else:
+                self._healthy.add(i)
+
+    async def run_health_checks(self) -> None:
+        while True:
+            await self.check_health()
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_SECONDS)
+
+
+replica_router = ReplicaRouter(replica_engines)
+
+
+@dataclass(frozen=True)
+class Placement:
+    shard: int
+    moving: bool = False
+
+
+class ShardRouter:
+    """Maps users to shards.
+
+    The ``shard_directory`` table on the primary is authoritative; users
+    without an entry fall back to a consistent-hash ring, so adding a
+    shard only remaps about 1/N of them. New users are pinned in the
+    directory when they sign up (``place_new_user``), which is what
+    lets ``app.db.rebalance`` move them later. Directory entries are
+    cached per worker for ``SHARD_DIRECTORY_CACHE_SECONDS``.
+    """
+
+    VIRTUAL_NODES = 64
+
+    def __init__(self, engines: list[AsyncEngine]):
+        self.engines = engines
+        self._ring = sorted(
+            (self._hash(f"{shard}:{vnode}"), shard)
+            for shard in range(len(engines))
+            for vnode in range(self.VIRTUAL_NODES)
+        )
+        self._points = [point for point, _ in self._ring]
+        self._cache: dict[str, tuple[float, Placement]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return len(self.engines) > 1
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False,
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+    def ring_shard(self, user_id: str) -> int:
+        i = bisect.bisect(self._points, self._hash(str(user_id))) % len(self._ring)
+        return self._ring[i][1]
+
+    async def lookup(self, user_id: str) -> Placement:
+        now = time.monotonic()
+        cached = self._cache.get(user_id)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        async with engine.connect() as conn:
+            row = (
+                await conn.execute(
+                    select(ShardDirectory.shard, ShardDirectory.moving).where(
+                        ShardDirectory.user_id == user_id
+                    )
+                )
+            ).first()
+        if row is None:
+            placement = Placement(self.ring_shard(user_id))
+        else:
+            placement = Placement(row.shard, row.moving)
+        if len(self._cache) > 10_000:
+            self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+        self._cache[user_id] = (now + settings.SHARD_DIRECTORY_CACHE_SECONDS, placement)
+        return placement
+
+    async def place_new_user(self, db: AsyncSession, user) -> None:
+        """Pin a just-flushed user to its ring shard in ``db``'s transaction."""
+        if not self.enabled:
+            return
+        shard = self.ring_shard(user.id)
+        db.add(ShardDirectory(user_id=user.id, shard=shard))
+        if shard:
+            await db.execute(
+                insert(User).values(
+                    id=user.id, email=user.email, full_name=user.full_name
+                ),
+                bind_arguments={"bind": self.engines[shard].sync_engine},
+            )
+        self._cache.pop(str(user.id), None)
+
+
+shard_router = ShardRouter(shard_engines)
+
+
+async def shard_info(user_id: str) -> dict:
+    """``info`` for a session that works on one user's data outside a request."""
+    if not shard_router.enabled:
+        return {}
+    placement = await shard_router.lookup(str(user_id))
+    return {"shard": placement.shard} if placement.shard else {}
+
+
+slow_query_log = SlowQueryLog(
+    settings.SLOW_QUERY_THRESHOLD_MS, settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
 )
+if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+    for _engine in dict.fromkeys([*shard_engines, read_engine, *replica_engines]):
+        event.listen(
+            _engine.sync_engine, "before_cursor_execute", slow_query_log.before_cursor_execute
+        )
+        event.listen(
+            _engine.sync_engine, "after_cursor_execute", slow_query_log.after_cursor_execute
+        )
+
+
+# Read-only variants of each engine. On Postgres the option makes the
+# driver open the transaction with BEGIN READ ONLY, so it costs no extra
+# round trip; other dialects ignore it.
+_read_only_engines = {
+    id(e): e.sync_engine.execution_options(postgresql_readonly=True)
+    for e in [*shard_engines, read_engine, *replica_engines]
+}
+
+
+class RoutingSession(Session):
+    """Sends a session's statements to its user's shard or to a replica.
+
+    Per-user tables go to ``info["shard"]`` when set; global tables and
+    unsharded sessions use the replica chosen for the session, if any.
+    Read-only sessions run in read-only transactions; anything flushed
+    from a read-write session goes to the primary of its shard.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kw):
+        if bind is not None:
+            return bind
+        read_only = self.info.get("read_only")
+        shard = self.info.get("shard")
+        if shard and (mapper is None or mapper.local_table.name not in GLOBAL_TABLES):
+            target = shard_engines[shard]
+        elif read_only:
+            target = self.info.get("replica") or read_engine
+        else:
+            return engine.sync_engine
+        return _read_only_engines[id(target)] if read_only else target.sync_engine
+
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
 )
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+def sibling_session(db: AsyncSession) -> AsyncSession:
+    """A new session routed like ``db``: same shard, replica and read-only mode.
+
+    Sessions can't run statements concurrently; siblings let a handler
+    run independent reads in parallel, each on its own pooled connection.
+    """
+    return AsyncSessionLocal(info=dict(db.info))
+
+
+def _bearer_subject(request: Request) -> str | None:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return read_token_subject(token)
+
+
+def _endpoint_label(request: Request) -> str:
+    """"GET /api/v1/problems/{problem_id}" rather than the concrete URL."""
+    path = request.url.path
+    route = request.scope.get("route")
+    if route is not None:
+        # Route paths are relative to their router; recover the prefix by
+        # stripping the part of the URL the route itself matched.
+        matched = route.path_format.format(**request.path_params)
+        prefix = path[: len(path) - len(matched)] if matched else path
+        path = prefix + route.path
+    return f"{request.method} {path}"
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Request-scoped session.
+
+    GET/HEAD requests get a read-only session: it may be routed to a
+    replica, runs in a read-only transaction and is never committed.
+    Everything else gets a read-write session on the primary that is
+    committed once the handler returns. With shards configured, the
+    session is pointed at the authenticated user's shard; writes for a
+    user whose rows are being moved are refused with 503.
+    """
+    is_read = request.method in ("GET", "HEAD")
+    current_endpoint.set(_endpoint_label(request))
+    user_id = (
+        _bearer_subject(request) if replica_engines or shard_router.enabled else None
+    )
+    placement = (
+        await shard_router.lookup(user_id) if user_id and shard_router.enabled else None
+    )
+    if placement is not None and placement.moving and not is_read:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Your data is being moved; try again shortly",
+            headers={"Retry-After": str(settings.SHARD_DIRECTORY_CACHE_SECONDS + 1)},
+        )
+
     async with AsyncSessionLocal() as session:
+        if placement is not None and placement.shard:
+            session.info["shard"] = placement.shard
+        if is_read:
+            session.info["read_only"] = True
+            if replica_engines:
+                session.info["replica"] = replica_router.pick(user_id)
+            yield session
+            return
+
         try:
             yield session
             await session.commit()
+            if user_id:
+                replica_router.note_write(user_id)
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
@@ -0,0 +1,189 @@
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# "METHOD /route/{template}" of the request a statement runs for; set by get_db
+current_endpoint: ContextVar[str | None] = ContextVar("current_endpoint", default=None)
+
+MAX_FINGERPRINTS = 500
+EXPLAIN_INTERVAL_SECONDS = 60
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s|(?<!:):\w+|\?")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+# Only these are safe to run a second time under ANALYZE; a WITH may
+# wrap an INSERT, UPDATE or DELETE, so it gets the estimated plan
+_ANALYZABLE = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+
+
+def normalize_sql(statement: str) -> str:
+    """Statement with literals and bind markers folded to ``?``.
+
+    ``IN (?, ?, ?)`` and multi-row ``VALUES`` lists collapse to ``(...)``
+    so the same query with a different number of ids is one fingerprint.
+    """
+    sql = " ".join(statement.split())
+    sql = _STRING.sub("?", sql)
+    sql = _PARAM.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _LIST.sub("(...)", sql)
+    return _ROWS.sub("(...)", sql)
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def parameters_shape(parameters, executemany: bool) -> str:
+    """Types of the bound values, never the values themselves."""
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} x {parameters_shape(rows[0], False)}" if rows else "[]"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(
+            f"{key}: {type(value).__name__}" for key, value in parameters.items()
+        ) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+@dataclass
+class SlowQueryStats:
+    fingerprint: str
+    sql: str
+    params_shape: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_seen: datetime | None = None
+    endpoints: Counter = field(default_factory=Counter)
+    explain: str | None = None
+    explained_at: datetime | None = None
+    _explained_monotonic: float = field(default=0.0, repr=False)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class SlowQueryLog:
+    """Logs statements over a threshold and aggregates them by fingerprint.
+
+    For a sampled fraction of slow reads the plan is captured as well:
+    on Postgres ``EXPLAIN (ANALYZE, BUFFERS)`` for plain SELECTs and
+    ``EXPLAIN`` for ``WITH`` statements, which may modify data; on SQLite
+    ``EXPLAIN QUERY PLAN``. Postgres plans run on the same connection in
+    a savepoint that is always rolled back, so neither a failing EXPLAIN
+    nor anything ANALYZE executed is left in the transaction. Plans are refreshed at most once
+    a minute per fingerprint. Stats are per worker process.
+    """
+
+    def __init__(self, threshold_ms: float, explain_rate: float):
+        self.threshold_ms = threshold_ms
+        self.explain_rate = explain_rate
+        self._lock = threading.Lock()
+        self._stats: dict[str, SlowQueryStats] = {}
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("slow_query_started")
+        if not started:
+            return
+        elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+        if elapsed_ms < self.threshold_ms:
+            return
+
+        endpoint = current_endpoint.get() or "background"
+        normalized = normalize_sql(statement)
+        key = fingerprint(normalized)
+        shape = parameters_shape(parameters, executemany)
+        logger.warning(
+            "Slow query %.1f ms in %s [%s] params=%s: %s",
+            elapsed_ms, endpoint, key, shape, normalized,
+        )
+        stats = self._record(key, normalized, shape, endpoint, elapsed_ms)
+
+        now = time.monotonic()
+        if (
+            not executemany
+            and _EXPLAINABLE.match(statement)
+            and now - stats._explained_monotonic >= EXPLAIN_INTERVAL_SECONDS
+            and random.random() < self.explain_rate
+        ):
+            stats._explained_monotonic = now
+            plan = self._explain(conn, statement, parameters)
+            if plan is not None:
+                with self._lock:
+                    stats.explain = plan
+                    stats.explained_at = datetime.utcnow()
+
+    def _record(self, key, normalized, shape, endpoint, elapsed_ms) -> SlowQueryStats:
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= MAX_FINGERPRINTS:
+                    # Make room by forgetting the least expensive fingerprint
+                    cheapest = min(self._stats.values(), key=lambda s: s.total_ms)
+                    del self._stats[cheapest.fingerprint]
+                stats = self._stats[key] = SlowQueryStats(key, normalized, shape)
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.last_seen = datetime.utcnow()
+            stats.endpoints[endpoint] += 1
+            return stats
+
+    def _explain(self, conn, statement, parameters) -> str | None:
+        dialect = conn.dialect.name
+        if dialect == "postgresql":
+            analyze = _ANALYZABLE.match(statement)
+            prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+        elif dialect == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        else:
+            return None
+
+        # A fresh DBAPI cursor: the original one still holds the result
+        # SQLAlchemy is about to fetch.
+        cursor = conn.connection.cursor()
+        try:
+            if dialect == "postgresql":
+                cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                rows = cursor.fetchall()
+            except Exception:
+                logger.debug("EXPLAIN failed for slow query", exc_info=True)
+                return None
+            finally:
+                if dialect == "postgresql":
+                    cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                    cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        finally:
+            cursor.close()
+        return "\n".join(str(row[-1]) for row in rows)
+
+    def top(self, limit: int, order_by: str = "total_ms") -> list[SlowQueryStats]:
+        with self._lock:
+            return sorted(
+                self._stats.values(), key=lambda s: getattr(s, order_by), reverse=True
+            )[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,82 @@
+"""Single-node SQLite mode.
+
+With ``DATABASE_URL=sqlite+aiosqlite:///path/to/carrerlog.db`` the app
+runs on one SQLite file:
+
+- every connection is put in WAL mode with the pragmas below, so readers
+  never block the writer and commits don't fsync the whole database;
+- all writes go through one connection (a pool of size one), so
+  concurrent requests queue for it in the pool instead of failing with
+  ``database is locked`` when two transactions try to upgrade to write
+  locks at once. Its transactions start with ``BEGIN IMMEDIATE``, so
+  writers in other worker processes wait on ``busy_timeout`` rather
+  than failing;
+- reads use a separate pool of ``SQLITE_READ_POOL_SIZE`` query-only
+  connections and keep running while a write is in progress.
+
+In-memory databases exist once per connection, so they keep a single
+engine and skip all of this.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.config import settings
+
+
+def is_sqlite_file(url: str) -> bool:
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def _pragmas(query_only: bool) -> list[str]:
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        # Negative sizes are in KiB rather than pages
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if query_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _apply_pragmas(engine: AsyncEngine, query_only: bool) -> None:
+    pragmas = _pragmas(query_only)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def _begin_immediate(engine: AsyncEngine) -> None:
+    # Take the write lock up front; the driver's own deferred BEGIN would
+    # fail outright if another process wrote after this one first read
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_sqlite_engines(url: str) -> tuple[AsyncEngine, AsyncEngine]:
+    """(writer, reader) engines for one SQLite database file."""
+    writer = create_async_engine(url, echo=False, pool_size=1, max_overflow=0)
+    reader = create_async_engine(
+        url, echo=False, pool_size=settings.SQLITE_READ_POOL_SIZE, max_overflow=0
+    )
+    _apply_pragmas(writer, query_only=False)
+    _begin_immediate(writer)
+    _apply_pragmas(reader, query_only=True)
+    return writer, reader
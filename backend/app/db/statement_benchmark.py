@@ -0,0 +1,153 @@
+"""CPU per execution of the hot queries, built per request vs prebuilt.
+
+Run from the backend directory with::
+
+    python -m app.db.statement_benchmark [--runs N]
+
+Each query in ``app.db.statements`` runs ``--runs`` times against an
+in-memory SQLite database holding one user's rows, once the way the
+endpoints used to build it and once prebuilt, and the report lists
+the CPU time per execution of each. The database work is the same in
+both, so the difference is what building the statement and its cache
+key costs on every request.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+
+def _cases(user_id: str, ids: dict):
+    from sqlalchemy import func, select
+
+    from app.db import statements
+    from app.models.certification import Certification
+    from app.models.experience import Experience
+    from app.models.problem import Problem
+    from app.models.user import User
+
+    params = {"user_id": user_id}
+    return [
+        (
+            "user by id",
+            lambda: (select(User).where(User.id == user_id), None),
+            (statements.user_by_id, params),
+        ),
+        (
+            "problem by id",
+            lambda: (
+                select(Problem).where(
+                    Problem.id == ids["problem"], Problem.user_id == user_id
+                ),
+                None,
+            ),
+            (statements.owned_row(Problem), {"id": ids["problem"], **params}),
+        ),
+        (
+            "experience list",
+            lambda: (
+                select(Experience)
+                .where(Experience.user_id == user_id)
+                .order_by(Experience.start_date.desc()),
+                None,
+            ),
+            (statements.experience_list, params),
+        ),
+        (
+            "problem count",
+            lambda: (
+                select(func.count()).select_from(Problem).where(Problem.user_id == user_id),
+                None,
+            ),
+            (statements.problem_count, params),
+        ),
+        (
+            "certification count",
+            lambda: (
+                select(func.count())
+                .select_from(Certification)
+                .where(Certification.user_id == user_id),
+                None,
+            ),
+            (statements.certification_count, params),
+        ),
+        (
+            "recent problems",
+            lambda: (
+                select(Problem)
+                .where(Problem.user_id == user_id)
+                .order_by(Problem.created_at.desc())
+                .limit(5),
+                None,
+            ),
+            (statements.recent_problems, params),
+        ),
+    ]
+
+
+def _cpu_us(session, run, runs: int) -> float:
+    # Warm the compiled cache first so both sides measure cache hits
+    for _ in range(100):
+        session.execute(*run()).all()
+    started = time.process_time()
+    for _ in range(runs):
+        session.execute(*run()).all()
+    return (time.process_time() - started) / runs * 1e6
+
+
+def run_benchmark(runs: int) -> None:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.db.base import Base
+    from app.models.experience import Experience
+    from app.models.problem import Problem
+    from app.models.user import User
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(email="bench@example.com", full_name="Bench")
+        session.add(user)
+        session.flush()
+        problem = Problem(
+            user_id=user.id,
+            title="Pool sizing",
+            difficulty="Medium",
+            situation="Requests queued behind the pool",
+            task="Keep p99 down",
+            action="Sized the pool",
+            result="p99 halved",
+            tags=["postgres"],
+        )
+        session.add(problem)
+        session.add(
+            Experience(user_id=user.id, company="Acme", role="SRE", start_date=date(2020, 1, 1))
+        )
+        session.commit()
+
+        print(f"{'query':<22}{'built µs':>10}{'prebuilt µs':>13}{'saved µs':>10}")
+        saved = 0.0
+        for name, built, prebuilt in _cases(user.id, {"problem": problem.id}):
+            before = _cpu_us(session, built, runs)
+            after = _cpu_us(session, lambda: prebuilt, runs)
+            saved += before - after
+            print(f"{name:<22}{before:>10.1f}{after:>13.1f}{before - after:>10.1f}")
+        print(f"\n{'total':<22}{'':>10}{'':>13}{saved:>10.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.db.statement_benchmark")
+    parser.add_argument("--runs", type=int, default=5000)
+    args = parser.parse_args()
+    # The app's own engines are never used, but importing the models
+    # loads the settings
+    os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+    run_benchmark(args.runs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
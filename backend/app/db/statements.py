@@ -0,0 +1,92 @@
+"""Prebuilt statements for the queries every request runs.
+
+Building a ``select()`` and computing its cache key costs more than
+executing it against the compiled-statement cache, so the hot queries
+are built once here, with ``bindparam`` placeholders, and executed with
+their parameters::
+
+    await db.execute(statements.user_by_id, {"user_id": user_id})
+
+Never derive per-request variants from these with ``.where()`` and
+friends; that builds a new statement and its cache key again. Filtered
+queries are built in their endpoints as usual.
+
+``lambda_stmt`` was measured too and is slower for ORM queries on this
+SQLAlchemy version, since each execution re-copies the cached statement
+to splice in the new values.
+"""
+
+from functools import cache
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.sql import Select
+
+from app.models.certification import Certification
+from app.models.daily_activity import activity_total
+from app.models.experience import Experience
+from app.models.learning import Learning
+from app.models.problem import Problem
+from app.models.user import User
+
+user_by_id = select(User).where(User.id == bindparam("user_id"))
+
+
+@cache
+def owned_row(model) -> Select:
+    """One of the user's rows by id: ``{"id": ..., "user_id": ...}``."""
+    return select(model).where(
+        model.id == bindparam("id"), model.user_id == bindparam("user_id")
+    )
+
+
+# Unfiltered lists, for paginate(..., params={"user_id": ...})
+problem_page = (
+    select(Problem)
+    .where(Problem.user_id == bindparam("user_id"))
+    .order_by(Problem.created_at.desc())
+)
+problem_total = activity_total(bindparam("user_id"), "problems")
+
+learning_page = (
+    select(Learning)
+    .where(Learning.user_id == bindparam("user_id"))
+    .order_by(Learning.learned_date.desc(), Learning.created_at.desc())
+)
+learning_total = activity_total(bindparam("user_id"), "learnings")
+
+experience_list = (
+    select(Experience)
+    .where(Experience.user_id == bindparam("user_id"))
+    .order_by(Experience.start_date.desc())
+)
+
+certification_list = (
+    select(Certification)
+    .where(Certification.user_id == bindparam("user_id"))
+    .order_by(Certification.issue_date.desc())
+)
+
+
+def _count(model) -> Select:
+    return (
+        select(func.count())
+        .select_from(model)
+        .where(model.user_id == bindparam("user_id"))
+    )
+
+
+# Dashboard stats
+problem_count = _count(Problem)
+experience_count = _count(Experience)
+certification_count = _count(Certification)
+problems_by_difficulty = (
+    select(Problem.difficulty, func.count())
+    .where(Problem.user_id == bindparam("user_id"))
+    .group_by(Problem.difficulty)
+)
+recent_problems = (
+    select(Problem)
+    .where(Problem.user_id == bindparam("user_id"))
+    .order_by(Problem.created_at.desc())
+    .limit(5)
+)
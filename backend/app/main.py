@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -5,19 +6,46 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from app.api.v1.api import api_router
-from app.core.config import UPLOAD_DIR
+from app.core.config import UPLOAD_DIR, settings
+from app.core.events import PostgresNotifyBridge, broker
+from app.core.logging import RequestIdMiddleware, configure_logging
+from app.core.profiling import ProfilingMiddleware
+from app.core.ratelimit import AdmissionMiddleware, buckets as rate_limit_buckets
+from app.core.security import password_hasher
 from app.db.base import Base  # noqa: F401 - ensures all models are imported
-from app.db.session import engine
+from app.db.session import replica_engines, replica_router, shard_engines
+from app.services.resume import renderer as resume_renderer
+
+configure_logging()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Create all tables on startup
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    for shard_engine in shard_engines:
+        async with shard_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
     # Ensure uploads directory exists
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    await rate_limit_buckets.start()
+    bridge = None
+    if settings.EVENTS_PG_BRIDGE:
+        bridge = PostgresNotifyBridge(
+            broker, settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+        )
+        await bridge.start()
+    health_checks = None
+    if replica_engines:
+        await replica_router.check_health()
+        health_checks = asyncio.create_task(replica_router.run_health_checks())
     yield
+    if health_checks is not None:
+        health_checks.cancel()
+    if bridge is not None:
+        await bridge.stop()
+    resume_renderer.shutdown()
+    password_hasher.shutdown()
+    await rate_limit_buckets.stop()
 
 
 app = FastAPI(
@@ -26,6 +54,9 @@ app = FastAPI(
     redirect_slashes=False,
 )
 
+# Inside CORS, so rejections still carry the CORS headers
+app.add_middleware(AdmissionMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -37,10 +68,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "X-Request-ID"],
 )
 
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Outermost, so the profiler and everything else see the request id
+app.add_middleware(RequestIdMiddleware)
+
 app.include_router(api_router, prefix="/api/v1")
 
-# Ensure uploads directory exists before mounting (StaticFiles checks at init time)
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-app.mount("/api/v1/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
+if settings.STORAGE_BACKEND == "local":
+    # Ensure uploads directory exists before mounting (StaticFiles checks at init time)
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    app.mount("/api/v1/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
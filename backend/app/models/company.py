@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DDL, DateTime, ForeignKey, Index, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base, GUID, new_uuid
+
+
+class Company(Base):
+    __tablename__ = "companies"
+    __table_args__ = (
+        Index(
+            "ix_companies_normalized_name_trgm",
+            "normalized_name",
+            postgresql_using="gin",
+            postgresql_ops={"normalized_name": "gin_trgm_ops"},
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        GUID(), primary_key=True, default=new_uuid
+    )
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    normalized_name: Mapped[str] = mapped_column(
+        String(255), unique=True, nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow
+    )
+
+
+class CompanyAlias(Base):
+    __tablename__ = "company_aliases"
+
+    alias: Mapped[str] = mapped_column(String(255), primary_key=True)
+    company_id: Mapped[uuid.UUID] = mapped_column(
+        GUID(), ForeignKey("companies.id"), nullable=False, index=True
+    )
+
+
+# The trigram index needs pg_trgm; make sure it exists whenever the table is
+# created through metadata (startup create_all) rather than a migration.
+event.listen(
+    Company.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,101 @@
+import uuid
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Integer, event, func, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.db.base_class import Base, GUID
+
+
+class DailyActivity(Base):
+    """Per-user, per-day counts backing the activity heatmap."""
+
+    __tablename__ = "daily_activity"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        GUID(), ForeignKey("users.id"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    problems: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    learnings: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    interview_questions: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False
+    )
+
+
+# table name -> date attribute that places a row on the heatmap
+ACTIVITY_DATES = {
+    "problems": "solved_at",
+    "learnings": "learned_date",
+    "interview_questions": "asked_date",
+}
+
+
+def _upsert(dialect_name: str):
+    return pg_insert if dialect_name == "postgresql" else sqlite_insert
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_daily_activity(session, flush_context):
+    deltas: dict[tuple[str, date], dict[str, int]] = defaultdict(
+        lambda: defaultdict(int)
+    )
+
+    for obj in session.new:
+        column = getattr(obj, "__tablename__", None)
+        if column in ACTIVITY_DATES:
+            day = getattr(obj, ACTIVITY_DATES[column])
+            deltas[(str(obj.user_id), day)][column] += 1
+
+    for obj in session.deleted:
+        column = getattr(obj, "__tablename__", None)
+        if column in ACTIVITY_DATES:
+            history = inspect(obj).attrs[ACTIVITY_DATES[column]].history
+            day = (history.deleted or history.unchanged or [None])[0]
+            if day is not None:
+                deltas[(str(obj.user_id), day)][column] -= 1
+
+    for obj in session.dirty:
+        column = getattr(obj, "__tablename__", None)
+        if column in ACTIVITY_DATES:
+            history = inspect(obj).attrs[ACTIVITY_DATES[column]].history
+            if history.added and history.deleted:
+                deltas[(str(obj.user_id), history.deleted[0])][column] -= 1
+                deltas[(str(obj.user_id), history.added[0])][column] += 1
+
+    if not deltas:
+        return
+
+    connection = session.connection()
+    insert = _upsert(connection.dialect.name)
+    table = DailyActivity.__table__
+    for (user_id, day), counts in deltas.items():
+        counts = {name: delta for name, delta in counts.items() if delta}
+        if not counts:
+            continue
+        stmt = insert(table).values(
+            user_id=user_id,
+            day=day,
+            **{name: max(counts.get(name, 0), 0) for name in ACTIVITY_DATES},
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.day],
+            set_={name: table.c[name] + delta for name, delta in counts.items()},
+        )
+        connection.execute(stmt)
+
+
+def activity_total(user_id: str, table_name: str):
+    """Scalar subquery counting a user's rows of ``table_name`` from the rollup.
+
+    Every row has its date set, so the per-day counts add up to the
+    table's total without touching the table itself.
+    """
+    return (
+        select(func.coalesce(func.sum(DailyActivity.__table__.c[table_name]), 0))
+        .where(DailyActivity.user_id == user_id)
+        .scalar_subquery()
+    )
@@ -1,25 +1,37 @@
 import uuid
 from datetime import date, datetime, timezone
 
-from sqlalchemy import Date, DateTime, ForeignKey, String, Text
+from sqlalchemy import Date, DateTime, ForeignKey, Index, LargeBinary, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.base_class import Base, GUID
+from app.db.base_class import Base, CompressedText, GUID, new_uuid
 
 
 class InterviewQuestion(Base):
     __tablename__ = "interview_questions"
+    __table_args__ = (
+        Index("ix_interview_questions_user_updated_at", "user_id", "updated_at"),
+        Index("ix_interview_questions_user_asked_date", "user_id", "asked_date"),
+        Index("ix_interview_questions_user_company", "user_id", "company_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        GUID(), primary_key=True, default=uuid.uuid4
+        GUID(), primary_key=True, default=new_uuid
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         GUID(), ForeignKey("users.id"), nullable=False
     )
     question: Mapped[str] = mapped_column(Text, nullable=False)
-    answer: Mapped[str] = mapped_column(Text, nullable=False)
+    answer: Mapped[str] = mapped_column(CompressedText(), nullable=False)
     company: Mapped[str] = mapped_column(String(255), nullable=False)
+    company_id: Mapped[uuid.UUID | None] = mapped_column(
+        GUID(), ForeignKey("companies.id"), nullable=True
+    )
     asked_date: Mapped[date] = mapped_column(Date, nullable=False)
+    minhash: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
@@ -1,17 +1,20 @@
 import uuid
 from datetime import date, datetime, timezone
 
-from sqlalchemy import Date, DateTime, ForeignKey, JSON, String, Text
+from sqlalchemy import Date, DateTime, ForeignKey, Index, JSON, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.base_class import Base, GUID
+from app.db.base_class import Base, GUID, new_uuid
 
 
 class Learning(Base):
     __tablename__ = "learnings"
+    __table_args__ = (
+        Index("ix_learnings_user_updated_at", "user_id", "updated_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        GUID(), primary_key=True, default=uuid.uuid4
+        GUID(), primary_key=True, default=new_uuid
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         GUID(), ForeignKey("users.id"), nullable=False
@@ -24,3 +27,6 @@ class Learning(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
@@ -0,0 +1,86 @@
+import uuid
+
+from sqlalchemy import BigInteger, ForeignKey, Index, Integer, String, delete, event, insert, inspect
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.core.minhash import band_hashes, signature
+from app.db.base_class import Base, GUID
+
+
+class LshBucket(Base):
+    """MinHash LSH band buckets for near-duplicate candidate lookup."""
+
+    __tablename__ = "lsh_buckets"
+    __table_args__ = (
+        Index("ix_lsh_buckets_lookup", "user_id", "entity_type", "band", "bucket"),
+    )
+
+    entity_id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True)
+    band: Mapped[int] = mapped_column(Integer, primary_key=True)
+    entity_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        GUID(), ForeignKey("users.id"), nullable=False
+    )
+    bucket: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+# table name -> attributes whose text makes up the signature
+DEDUP_FIELDS = {
+    "problems": ("title", "situation", "task", "action", "result"),
+    "interview_questions": ("question", "answer"),
+}
+
+
+def signature_text(obj) -> str:
+    return " ".join(
+        getattr(obj, field) or "" for field in DEDUP_FIELDS[obj.__tablename__]
+    )
+
+
+def _text_changed(obj) -> bool:
+    state = inspect(obj)
+    return any(
+        state.attrs[field].history.has_changes()
+        for field in DEDUP_FIELDS[obj.__tablename__]
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _compute_signatures(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty):
+        if getattr(obj, "__tablename__", None) in DEDUP_FIELDS:
+            is_new = obj in session.new
+            if is_new or _text_changed(obj):
+                obj.minhash = signature(signature_text(obj))
+                session.info.setdefault("lsh_dirty", {})[obj] = is_new
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_buckets(session, flush_context):
+    dirty = session.info.pop("lsh_dirty", {})
+    # Fresh rows have no buckets yet, so only edited or deleted ones need clearing
+    stale = [o.id for o, is_new in dirty.items() if not is_new] + [
+        o.id for o in session.deleted
+        if getattr(o, "__tablename__", None) in DEDUP_FIELDS
+    ]
+    if not dirty and not stale:
+        return
+
+    connection = session.connection()
+    table = LshBucket.__table__
+    if stale:
+        connection.execute(delete(table).where(table.c.entity_id.in_(stale)))
+    rows = [
+        {
+            "entity_id": obj.id,
+            "band": band,
+            "entity_type": obj.__tablename__,
+            "user_id": obj.user_id,
+            "bucket": bucket,
+        }
+        for obj in dirty
+        if obj not in session.deleted
+        for band, bucket in enumerate(band_hashes(obj.minhash))
+    ]
+    if rows:
+        connection.execute(insert(table), rows)
@@ -1,17 +1,20 @@
 import uuid
 from datetime import date, datetime, timezone
 
-from sqlalchemy import Date, DateTime, ForeignKey, JSON, String, Text
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Index, JSON, LargeBinary, String
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.base_class import Base, GUID
+from app.db.base_class import Base, CompressedText, GUID, new_uuid
 
 
 class Problem(Base):
     __tablename__ = "problems"
+    __table_args__ = (
+        Index("ix_problems_user_updated_at", "user_id", "updated_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        GUID(), primary_key=True, default=uuid.uuid4
+        GUID(), primary_key=True, default=new_uuid
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         GUID(), ForeignKey("users.id"), nullable=False
@@ -19,14 +22,19 @@ class Problem(Base):
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     company_context: Mapped[str | None] = mapped_column(String(255), nullable=True)
     difficulty: Mapped[str] = mapped_column(String(10), nullable=False)
-    situation: Mapped[str] = mapped_column(Text, nullable=False)
-    task: Mapped[str] = mapped_column(Text, nullable=False)
-    action: Mapped[str] = mapped_column(Text, nullable=False)
-    result: Mapped[str] = mapped_column(Text, nullable=False)
+    situation: Mapped[str] = mapped_column(CompressedText(), nullable=False)
+    task: Mapped[str] = mapped_column(CompressedText(), nullable=False)
+    action: Mapped[str] = mapped_column(CompressedText(), nullable=False)
+    result: Mapped[str] = mapped_column(CompressedText(), nullable=False)
     tags: Mapped[list | None] = mapped_column(JSON, nullable=True)
+    is_featured: Mapped[bool] = mapped_column(Boolean, default=False)
     solved_at: Mapped[date] = mapped_column(
         Date, default=lambda: date.today()
     )
+    minhash: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base, GUID
+
+
+class ShardDirectory(Base):
+    """Home shard of each user; takes precedence over the hash ring.
+
+    Lives on the primary database only. ``moving`` is set while the
+    user's rows are being copied to another shard, and writes for the
+    user are refused until the move finishes.
+    """
+
+    __tablename__ = "shard_directory"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        GUID(), ForeignKey("users.id"), primary_key=True
+    )
+    shard: Mapped[int] = mapped_column(Integer, nullable=False)
+    moving: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # No updated_at: that would make change capture treat rows as user data
+    moved_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -0,0 +1,41 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, String, event
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.db.base_class import Base, GUID, new_uuid
+
+
+class Tombstone(Base):
+    """Deletion log so sync clients can drop rows they have cached."""
+
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_user_deleted_at", "user_id", "deleted_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        GUID(), primary_key=True, default=new_uuid
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        GUID(), ForeignKey("users.id"), nullable=False
+    )
+    entity_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    entity_id: Mapped[uuid.UUID] = mapped_column(GUID(), nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _record_tombstones(session, flush_context, instances):
+    for obj in list(session.deleted):
+        if hasattr(obj, "user_id") and hasattr(obj, "updated_at"):
+            session.add(
+                Tombstone(
+                    user_id=obj.user_id,
+                    entity_type=obj.__tablename__,
+                    entity_id=obj.id,
+                )
+            )
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+from app.schemas.certification import CertificationResponse
+from app.schemas.dashboard import DashboardStats
+from app.schemas.experience import ExperienceResponse
+from app.schemas.learning import LearningListResponse
+from app.schemas.problem import ProblemListResponse
+from app.schemas.user import UserResponse
+
+
+class BootstrapResponse(BaseModel):
+    user: UserResponse
+    stats: DashboardStats
+    problems: ProblemListResponse
+    learnings: LearningListResponse
+    experiences: list[ExperienceResponse]
+    certifications: list[CertificationResponse]
@@ -20,5 +20,6 @@ class CertificationResponse(BaseModel):
     expiry_date: date | None = None
     credential_url: str | None = None
     created_at: datetime
+    updated_at: datetime | None = None
 
     model_config = ConfigDict(from_attributes=True)
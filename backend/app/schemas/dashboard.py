@@ -1,3 +1,5 @@
+from datetime import date
+
 from pydantic import BaseModel
 
 from app.schemas.problem import ProblemResponse
@@ -9,3 +11,47 @@ class DashboardStats(BaseModel):
     total_certifications: int
     problems_by_difficulty: dict
     recent_problems: list[ProblemResponse]
+
+
+class ActivityPoint(BaseModel):
+    date: date
+    problems: int
+    learnings: int
+    interview_questions: int
+    total: int
+
+
+class ActivityResponse(BaseModel):
+    start: date
+    end: date
+    daily: list[ActivityPoint]
+    weekly: list[ActivityPoint]
+    monthly: list[ActivityPoint]
+
+
+class TagCount(BaseModel):
+    tag: str
+    count: int
+
+
+class RelatedSkill(BaseModel):
+    tag: str
+    score: float
+    count: int
+
+
+class SkillTimeline(BaseModel):
+    months: list[str]
+    series: dict[str, list[int]]
+
+
+class CooccurrenceMatrix(BaseModel):
+    tags: list[str]
+    matrix: list[list[int]]
+
+
+class SkillGraph(BaseModel):
+    tags: list[TagCount]
+    timeline: SkillTimeline
+    cooccurrence: CooccurrenceMatrix
+    related: dict[str, list[RelatedSkill]]
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SlowQuery(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    fingerprint: str
+    sql: str
+    params_shape: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    last_seen: datetime | None = None
+    endpoints: dict[str, int]
+    explain: str | None = None
+    explained_at: datetime | None = None
+
+
+class SlowQueryReport(BaseModel):
+    threshold_ms: float
+    explain_sample_rate: float
+    queries: list[SlowQuery]
+
+
+class TableStats(BaseModel):
+    table: str
+    total_bytes: int
+    heap_bytes: int
+    toast_bytes: int
+    heap_hit_ratio: float | None = None
+    toast_hit_ratio: float | None = None
+    dead_tuples: int
+    autovacuum_count: int
+    last_autovacuum: datetime | None = None
+
+
+class RejectionCount(BaseModel):
+    reason: str
+    route_class: str
+    count: int
+
+
+class AdmissionReport(BaseModel):
+    backend: str
+    max_in_flight: int
+    in_flight: int
+    peak_in_flight: int
+    admitted: int
+    rejections: list[RejectionCount]
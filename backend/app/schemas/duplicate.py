@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class DuplicateMatch(BaseModel):
+    entity_type: str
+    id: str
+    title: str
+    similarity: float
+
+
+class DuplicateGroup(BaseModel):
+    entity_type: str
+    items: list[DuplicateMatch]
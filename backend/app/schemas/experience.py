@@ -20,5 +20,6 @@ class ExperienceResponse(BaseModel):
     end_date: date | None = None
     description: str | None = None
     created_at: datetime
+    updated_at: datetime | None = None
 
     model_config = ConfigDict(from_attributes=True)
@@ -2,6 +2,8 @@ from datetime import date, datetime
 
 from pydantic import BaseModel, ConfigDict
 
+from app.schemas.duplicate import DuplicateMatch
+
 
 class InterviewQuestionCreate(BaseModel):
     question: str
@@ -16,7 +18,10 @@ class InterviewQuestionResponse(BaseModel):
     question: str
     answer: str
     company: str
+    company_id: str | None = None
     asked_date: date
     created_at: datetime
+    updated_at: datetime | None = None
+    possible_duplicates: list[DuplicateMatch] | None = None
 
     model_config = ConfigDict(from_attributes=True)
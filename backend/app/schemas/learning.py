@@ -23,12 +23,15 @@ class LearningResponse(BaseModel):
     learned_date: date
     tags: list[str] | None = []
     created_at: datetime
+    updated_at: datetime | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
 class LearningListResponse(BaseModel):
     items: list[LearningResponse]
-    total: int
+    # None when the list was requested with include_total=false
+    total: int | None = None
+    has_more: bool
     page: int
     size: int
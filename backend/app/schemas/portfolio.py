@@ -0,0 +1,54 @@
+from datetime import date, datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+SLUG_PATTERN = r"^[a-z0-9][a-z0-9-]{1,62}[a-z0-9]$"
+
+
+class PortfolioSettings(BaseModel):
+    slug: str | None = Field(None, pattern=SLUG_PATTERN)
+    public: bool = False
+
+
+class PublicProblem(BaseModel):
+    title: str
+    company_context: str | None = None
+    difficulty: str
+    situation: str
+    task: str
+    action: str
+    result: str
+    tags: list[str] | None = []
+    solved_at: date
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PublicExperience(BaseModel):
+    company: str
+    role: str
+    start_date: date
+    end_date: date | None = None
+    description: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PublicCertification(BaseModel):
+    name: str
+    issuer: str
+    issue_date: date
+    expiry_date: date | None = None
+    credential_url: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PublicPortfolio(BaseModel):
+    slug: str
+    full_name: str
+    generated_at: datetime
+    problems: list[PublicProblem]
+    experiences: list[PublicExperience]
+    certifications: list[PublicCertification]
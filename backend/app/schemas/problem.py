@@ -2,6 +2,8 @@ from datetime import date, datetime
 
 from pydantic import BaseModel, ConfigDict, field_validator
 
+from app.schemas.duplicate import DuplicateMatch
+
 
 class ProblemCreate(BaseModel):
     title: str
@@ -13,6 +15,7 @@ class ProblemCreate(BaseModel):
     result: str
     tags: list[str] | None = []
     solved_at: date | None = None
+    is_featured: bool = False
 
     @field_validator("difficulty")
     @classmethod
@@ -39,6 +42,7 @@ class ProblemUpdate(BaseModel):
     result: str | None = None
     tags: list[str] | None = None
     solved_at: date | None = None
+    is_featured: bool | None = None
 
     @field_validator("difficulty")
     @classmethod
@@ -60,13 +64,25 @@ class ProblemResponse(BaseModel):
     result: str
     tags: list[str] | None = []
     solved_at: date
+    is_featured: bool = False
     created_at: datetime
+    updated_at: datetime | None = None
+    possible_duplicates: list[DuplicateMatch] | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
 class ProblemListResponse(BaseModel):
     items: list[ProblemResponse]
-    total: int
+    # None when the list was requested with include_total=false
+    total: int | None = None
+    has_more: bool
     page: int
     size: int
+
+
+class SimilarItem(BaseModel):
+    entity_type: str
+    id: str
+    title: str
+    score: float
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+
+from app.schemas.certification import CertificationResponse
+from app.schemas.experience import ExperienceResponse
+from app.schemas.interview_question import InterviewQuestionResponse
+from app.schemas.learning import LearningResponse
+from app.schemas.problem import ProblemResponse
+
+
+class DeletedEntity(BaseModel):
+    entity_type: str
+    entity_id: str
+
+
+class SyncResponse(BaseModel):
+    token: str
+    full: bool
+    problems: list[ProblemResponse]
+    experiences: list[ExperienceResponse]
+    certifications: list[CertificationResponse]
+    interview_questions: list[InterviewQuestionResponse]
+    learnings: list[LearningResponse]
+    deleted: list[DeletedEntity]
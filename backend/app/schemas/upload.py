@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class UploadRequest(BaseModel):
+    # Not used for the key; its extension comes from content_type
+    filename: str | None = None
+    content_type: str
+    size: int = Field(gt=0)
+
+
+class PresignedUpload(BaseModel):
+    method: str
+    url: str
+    fields: dict[str, str] = {}
+    headers: dict[str, str] = {}
+
+
+class UploadTicket(BaseModel):
+    key: str
+    upload: PresignedUpload
+    expires_at: datetime
+
+
+class FinalizeRequest(BaseModel):
+    key: str
+
+
+class UploadResult(BaseModel):
+    url: str
@@ -1,12 +1,12 @@
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class UserCreate(BaseModel):
     email: str
     full_name: str
-    password: str
+    password: str = Field(min_length=8)
 
 
 class UserResponse(BaseModel):
@@ -14,6 +14,8 @@ class UserResponse(BaseModel):
     email: str
     full_name: str
     is_active: bool
+    portfolio_slug: str | None = None
+    portfolio_public: bool = False
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
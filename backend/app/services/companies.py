@@ -0,0 +1,220 @@
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+from sqlalchemy import func, literal, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.company import Company, CompanyAlias
+from app.models.interview_question import InterviewQuestion
+
+_LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation",
+    "co", "company", "gmbh", "plc", "pvt", "private", "sa", "ag", "bv",
+}
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_company_name(name: str) -> str:
+    """Lower-case, strip punctuation and trailing legal suffixes.
+
+    "Google, LLC." and "google" both normalize to "google".
+    """
+    words = _NON_ALNUM.sub(" ", name.lower()).split()
+    while len(words) > 1 and words[-1] in _LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+async def resolve_company(db: AsyncSession, name: str) -> Company:
+    """Return the company a spelling points at, creating both if new.
+
+    Both the spelling as typed and its normalized form are kept as
+    aliases; an exact spelling wins over a normalized match.
+    """
+    raw = name.strip()
+    normalized = normalize_company_name(name) or raw.lower()
+
+    result = await db.execute(
+        select(Company, CompanyAlias.alias)
+        .join(CompanyAlias, CompanyAlias.company_id == Company.id)
+        .where(CompanyAlias.alias.in_({raw, normalized}))
+    )
+    matches = {alias: company for company, alias in result.all()}
+    if raw in matches:
+        return matches[raw]
+    if normalized in matches:
+        company = matches[normalized]
+        await _add_aliases(db, company, [raw])
+        return company
+
+    company = Company(name=raw, normalized_name=normalized)
+    try:
+        async with db.begin_nested():
+            db.add(company)
+            await db.flush()
+            db.add_all(
+                CompanyAlias(alias=alias, company_id=company.id)
+                for alias in {normalized, raw}
+            )
+            await db.flush()
+    except IntegrityError:
+        # Another request registered the same name concurrently
+        result = await db.execute(
+            select(Company).where(Company.normalized_name == normalized)
+        )
+        company = result.scalar_one()
+        await _add_aliases(db, company, [raw])
+    return company
+
+
+async def _add_aliases(db: AsyncSession, company: Company, aliases: list[str]) -> None:
+    for alias in aliases:
+        try:
+            async with db.begin_nested():
+                db.add(CompanyAlias(alias=alias, company_id=company.id))
+                await db.flush()
+        except IntegrityError:
+            # Already recorded, possibly for another company
+            pass
+
+
+class CompanyIndex:
+    """In-process prefix + trigram index of each user's companies.
+
+    Used where the database has no trigram support (SQLite). Entries are
+    kept sorted by normalized name so prefix lookups are a bisect, and a
+    trigram posting list backs fuzzy matches for typos and mid-word input.
+
+    Each user's entry remembers the count and newest ``updated_at`` of
+    the interview questions it was built from. Lookups compare that with
+    the database and rebuild on any difference, so deletes, rolled-back
+    creates and other workers' writes never leave stale suggestions.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: dict[str, tuple] = {}
+        self._names: dict[str, list[str]] = {}
+        self._display: dict[str, dict[str, str]] = {}
+        self._postings: dict[str, dict[str, set[str]]] = {}
+
+    def version(self, user_id: str) -> tuple | None:
+        return self._versions.get(user_id)
+
+    def load(self, user_id: str, version: tuple, companies: list[tuple[str, str]]) -> None:
+        with self._lock:
+            self._versions[user_id] = version
+            self._names[user_id] = []
+            self._display[user_id] = {}
+            self._postings[user_id] = defaultdict(set)
+            for normalized, name in companies:
+                self._add_locked(user_id, normalized, name)
+
+    def _add_locked(self, user_id: str, normalized: str, name: str) -> None:
+        display = self._display[user_id]
+        if normalized in display:
+            return
+        names = self._names[user_id]
+        names.insert(bisect_left(names, normalized), normalized)
+        display[normalized] = name
+        postings = self._postings[user_id]
+        for gram in trigrams(normalized):
+            postings[gram].add(normalized)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions.clear()
+            self._names.clear()
+            self._display.clear()
+            self._postings.clear()
+
+    def search(self, user_id: str, prefix: str, limit: int = 10) -> list[str]:
+        query = normalize_company_name(prefix)
+        names = self._names.get(user_id, [])
+        display = self._display.get(user_id, {})
+        if not query:
+            return [display[n] for n in names[:limit]]
+
+        matches: list[str] = []
+        i = bisect_left(names, query)
+        while i < len(names) and len(matches) < limit and names[i].startswith(query):
+            matches.append(names[i])
+            i += 1
+
+        if len(matches) < limit and len(query) >= 3:
+            query_grams = trigrams(query)
+            scores: dict[str, int] = defaultdict(int)
+            postings = self._postings.get(user_id, {})
+            for gram in query_grams:
+                for name in postings.get(gram, ()):
+                    scores[name] += 1
+            seen = set(matches)
+            ranked = sorted(
+                (
+                    (shared / len(query_grams | trigrams(name)), name)
+                    for name, shared in scores.items()
+                    if name not in seen
+                ),
+                reverse=True,
+            )
+            for score, name in ranked:
+                if score < 0.3 or len(matches) >= limit:
+                    break
+                matches.append(name)
+
+        return [display[n] for n in matches]
+
+
+company_index = CompanyIndex()
+
+
+async def suggest_companies(
+    db: AsyncSession, user_id: str, prefix: str, limit: int = 10
+) -> list[str]:
+    user_companies = (
+        select(InterviewQuestion.company_id)
+        .where(InterviewQuestion.user_id == user_id)
+        .distinct()
+    )
+
+    if db.bind.dialect.name == "postgresql":
+        query = normalize_company_name(prefix)
+        stmt = select(Company.name).where(Company.id.in_(user_companies))
+        if query:
+            stmt = stmt.where(
+                Company.normalized_name.like(f"{query}%")
+                | Company.normalized_name.op("%")(query)
+            ).order_by(
+                Company.normalized_name.like(f"{query}%").desc(),
+                func.similarity(Company.normalized_name, literal(query)).desc(),
+            )
+        else:
+            stmt = stmt.order_by(Company.normalized_name)
+        result = await db.execute(stmt.limit(limit))
+        return list(result.scalars().all())
+
+    version = tuple(
+        (
+            await db.execute(
+                select(func.count(), func.max(InterviewQuestion.updated_at)).where(
+                    InterviewQuestion.user_id == user_id
+                )
+            )
+        ).one()
+    )
+    if company_index.version(user_id) != version:
+        result = await db.execute(
+            select(Company.normalized_name, Company.name).where(
+                Company.id.in_(user_companies)
+            )
+        )
+        company_index.load(user_id, version, [tuple(row) for row in result.all()])
+    return company_index.search(user_id, prefix, limit)
@@ -0,0 +1,25 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import statements
+from app.schemas.dashboard import DashboardStats
+
+
+async def load_dashboard_stats(db: AsyncSession, user_id: str) -> DashboardStats:
+    params = {"user_id": user_id}
+    total_problems = (await db.execute(statements.problem_count, params)).scalar()
+    total_experiences = (await db.execute(statements.experience_count, params)).scalar()
+    total_certifications = (
+        await db.execute(statements.certification_count, params)
+    ).scalar()
+    difficulty_result = await db.execute(statements.problems_by_difficulty, params)
+    problems_by_difficulty = {row[0]: row[1] for row in difficulty_result.all()}
+    recent_result = await db.execute(statements.recent_problems, params)
+    recent_problems = recent_result.scalars().all()
+
+    return DashboardStats(
+        total_problems=total_problems,
+        total_experiences=total_experiences,
+        total_certifications=total_certifications,
+        problems_by_difficulty=problems_by_difficulty,
+        recent_problems=recent_problems,
+    )
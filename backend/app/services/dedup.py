@@ -0,0 +1,128 @@
+from collections import defaultdict
+
+from sqlalchemy import and_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.minhash import DUPLICATE_THRESHOLD, band_hashes, similarity
+from app.models.interview_question import InterviewQuestion
+from app.models.lsh_bucket import LshBucket
+from app.models.problem import Problem
+from app.schemas.duplicate import DuplicateGroup, DuplicateMatch
+
+# entity type -> (model, column shown as the item's title)
+DEDUP_MODELS = {
+    "problems": (Problem, Problem.title),
+    "interview_questions": (InterviewQuestion, InterviewQuestion.question),
+}
+
+
+async def _signatures(db: AsyncSession, entity_type: str, ids) -> dict:
+    model, title = DEDUP_MODELS[entity_type]
+    result = await db.execute(
+        select(model.id, title, model.minhash).where(model.id.in_(ids))
+    )
+    return {row[0]: (row[1], row[2]) for row in result.all()}
+
+
+async def find_similar(
+    db: AsyncSession, user_id: str, entity_type: str, entity_id: str, sig: bytes
+) -> list[DuplicateMatch]:
+    """Near-duplicates of one item, found through its LSH buckets."""
+    keys = list(enumerate(band_hashes(sig)))
+    result = await db.execute(
+        select(LshBucket.entity_id)
+        .where(
+            LshBucket.user_id == user_id,
+            LshBucket.entity_type == entity_type,
+            tuple_(LshBucket.band, LshBucket.bucket).in_(keys),
+            LshBucket.entity_id != entity_id,
+        )
+        .distinct()
+    )
+    candidates = result.scalars().all()
+    if not candidates:
+        return []
+
+    matches = []
+    for candidate_id, (title, other) in (
+        await _signatures(db, entity_type, candidates)
+    ).items():
+        score = similarity(sig, other) if other else 0.0
+        if score >= DUPLICATE_THRESHOLD:
+            matches.append(
+                DuplicateMatch(
+                    entity_type=entity_type, id=candidate_id, title=title, similarity=score
+                )
+            )
+    return sorted(matches, key=lambda m: m.similarity, reverse=True)
+
+
+async def find_duplicate_groups(
+    db: AsyncSession, user_id: str, entity_type: str
+) -> list[DuplicateGroup]:
+    """Clusters of near-duplicates among all of a user's items.
+
+    Candidate pairs come from a self-join on shared buckets, so only
+    items that collide in some band are ever compared.
+    """
+    a, b = aliased(LshBucket), aliased(LshBucket)
+    result = await db.execute(
+        select(a.entity_id, b.entity_id)
+        .join(
+            b,
+            and_(
+                a.user_id == b.user_id,
+                a.entity_type == b.entity_type,
+                a.band == b.band,
+                a.bucket == b.bucket,
+                a.entity_id < b.entity_id,
+            ),
+        )
+        .where(a.user_id == user_id, a.entity_type == entity_type)
+        .distinct()
+    )
+    pairs = result.all()
+    if not pairs:
+        return []
+
+    signatures = await _signatures(
+        db, entity_type, {i for pair in pairs for i in pair}
+    )
+    parent: dict[str, str] = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    best: dict[str, float] = defaultdict(float)
+    for left, right in pairs:
+        if left not in signatures or right not in signatures:
+            continue
+        score = similarity(signatures[left][1], signatures[right][1])
+        if score >= DUPLICATE_THRESHOLD:
+            parent[find(left)] = find(right)
+            best[left] = max(best[left], score)
+            best[right] = max(best[right], score)
+
+    groups: dict[str, list[str]] = defaultdict(list)
+    for item in best:
+        groups[find(item)].append(item)
+    return [
+        DuplicateGroup(
+            entity_type=entity_type,
+            items=[
+                DuplicateMatch(
+                    entity_type=entity_type,
+                    id=item,
+                    title=signatures[item][0],
+                    similarity=best[item],
+                )
+                for item in sorted(members, key=lambda i: best[i], reverse=True)
+            ],
+        )
+        for members in groups.values()
+    ]
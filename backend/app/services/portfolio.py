@@ -0,0 +1,226 @@
+import asyncio
+import hashlib
+import html
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.core.config import PORTFOLIO_DIR, settings
+from app.core.events import ChangeEvent, broker
+from app.db.session import AsyncSessionLocal, shard_info
+from app.models.certification import Certification
+from app.models.experience import Experience
+from app.models.problem import Problem
+from app.models.user import User
+from app.schemas.portfolio import PublicPortfolio
+
+logger = logging.getLogger(__name__)
+
+_TAG = re.compile(r"<[^>]+>")
+
+# Entity types whose changes can alter a public portfolio
+PORTFOLIO_ENTITIES = {"problems", "experiences", "certifications"}
+
+
+@dataclass
+class Snapshot:
+    etag: str
+    json_body: bytes
+    html_body: bytes
+    mtime_ns: int
+
+
+# slug -> rendered snapshot. Entries are revalidated against the file's
+# mtime so a snapshot regenerated by another worker is picked up.
+_snapshots: dict[str, Snapshot] = {}
+
+
+def _paths(slug: str):
+    return PORTFOLIO_DIR / f"{slug}.json", PORTFOLIO_DIR / f"{slug}.html"
+
+
+def _etag(json_body: bytes) -> str:
+    return '"' + hashlib.sha256(json_body).hexdigest()[:32] + '"'
+
+
+def _plain_text(value: str) -> str:
+    return html.unescape(_TAG.sub(" ", value)).strip()
+
+
+def render_html(portfolio: PublicPortfolio) -> str:
+    esc = html.escape
+    parts = [
+        "<!doctype html>",
+        '<html lang="en"><head><meta charset="utf-8">',
+        f"<title>{esc(portfolio.full_name)} - CarrerLog</title>",
+        "</head><body>",
+        f"<h1>{esc(portfolio.full_name)}</h1>",
+    ]
+    if portfolio.experiences:
+        parts.append("<h2>Experience</h2><ul>")
+        for exp in portfolio.experiences:
+            end = exp.end_date.isoformat() if exp.end_date else "Present"
+            parts.append(
+                f"<li><strong>{esc(exp.role)}</strong> at {esc(exp.company)} "
+                f"({exp.start_date.isoformat()} &ndash; {end})"
+            )
+            if exp.description:
+                parts.append(f"<p>{esc(_plain_text(exp.description))}</p>")
+            parts.append("</li>")
+        parts.append("</ul>")
+    if portfolio.certifications:
+        parts.append("<h2>Certifications</h2><ul>")
+        for cert in portfolio.certifications:
+            parts.append(
+                f"<li>{esc(cert.name)} &middot; {esc(cert.issuer)} "
+                f"({cert.issue_date.isoformat()})</li>"
+            )
+        parts.append("</ul>")
+    if portfolio.problems:
+        parts.append("<h2>Selected problems</h2>")
+        for problem in portfolio.problems:
+            parts.append(
+                f"<article><h3>{esc(problem.title)}</h3>"
+                f"<p>{esc(problem.difficulty)} &middot; "
+                f"{esc(', '.join(problem.tags or []))}</p>"
+            )
+            for label, text in (
+                ("Situation", problem.situation),
+                ("Task", problem.task),
+                ("Action", problem.action),
+                ("Result", problem.result),
+            ):
+                parts.append(
+                    f"<h4>{label}</h4><p>{esc(_plain_text(text))}</p>"
+                )
+            parts.append("</article>")
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def _write_atomic(path, data: bytes) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _store(slug: str, json_body: bytes, html_body: bytes) -> Snapshot:
+    PORTFOLIO_DIR.mkdir(parents=True, exist_ok=True)
+    json_path, html_path = _paths(slug)
+    _write_atomic(html_path, html_body)
+    _write_atomic(json_path, json_body)
+    return Snapshot(
+        _etag(json_body), json_body, html_body, json_path.stat().st_mtime_ns
+    )
+
+
+def _remove(slug: str) -> None:
+    for path in _paths(slug):
+        path.unlink(missing_ok=True)
+
+
+async def regenerate_snapshot(user_id: str) -> None:
+    async with AsyncSessionLocal(info=await shard_info(user_id)) as db:
+        user = await db.get(User, user_id)
+        if user is None or not user.portfolio_public or not user.portfolio_slug:
+            return
+        problems = await db.execute(
+            select(Problem)
+            .where(Problem.user_id == user_id, Problem.is_featured.is_(True))
+            .order_by(Problem.solved_at.desc())
+        )
+        experiences = await db.execute(
+            select(Experience)
+            .where(Experience.user_id == user_id)
+            .order_by(Experience.start_date.desc())
+        )
+        certifications = await db.execute(
+            select(Certification)
+            .where(Certification.user_id == user_id)
+            .order_by(Certification.issue_date.desc())
+        )
+        portfolio = PublicPortfolio(
+            slug=user.portfolio_slug,
+            full_name=user.full_name,
+            generated_at=datetime.utcnow(),
+            problems=problems.scalars().all(),
+            experiences=experiences.scalars().all(),
+            certifications=certifications.scalars().all(),
+        )
+
+    json_body = portfolio.model_dump_json().encode()
+    html_body = render_html(portfolio).encode()
+    snapshot = await asyncio.to_thread(_store, portfolio.slug, json_body, html_body)
+    _snapshots[portfolio.slug] = snapshot
+
+
+async def remove_snapshot(slug: str) -> None:
+    _snapshots.pop(slug, None)
+    await asyncio.to_thread(_remove, slug)
+
+
+async def load_snapshot(slug: str) -> Snapshot | None:
+    """Return a snapshot from memory or disk; never touches the database."""
+    json_path, html_path = _paths(slug)
+    try:
+        mtime_ns = json_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        _snapshots.pop(slug, None)
+        return None
+
+    snapshot = _snapshots.get(slug)
+    if snapshot is not None and snapshot.mtime_ns == mtime_ns:
+        return snapshot
+
+    def _read():
+        try:
+            return json_path.read_bytes(), html_path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    bodies = await asyncio.to_thread(_read)
+    if bodies is None:
+        return None
+    snapshot = Snapshot(_etag(bodies[0]), *bodies, mtime_ns)
+    _snapshots[slug] = snapshot
+    return snapshot
+
+
+class SnapshotScheduler:
+    """Coalesces bursts of writes into one background regeneration per user."""
+
+    def __init__(self, delay: float):
+        self._delay = delay
+        self._dirty: set[str] = set()
+        self._task: asyncio.Task | None = None
+
+    def schedule(self, user_id: str) -> None:
+        self._dirty.add(user_id)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        await asyncio.sleep(self._delay)
+        while self._dirty:
+            user_ids = list(self._dirty)
+            self._dirty.clear()
+            for user_id in user_ids:
+                try:
+                    await regenerate_snapshot(user_id)
+                except Exception:
+                    logger.exception("Portfolio snapshot failed for %s", user_id)
+
+
+scheduler = SnapshotScheduler(settings.PORTFOLIO_REFRESH_DELAY_SECONDS)
+
+
+def _on_change(change: ChangeEvent) -> None:
+    if change.entity_type in PORTFOLIO_ENTITIES:
+        scheduler.schedule(change.user_id)
+
+
+broker.add_publish_hook(_on_change)
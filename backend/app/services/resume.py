@@ -0,0 +1,271 @@
+import asyncio
+import hashlib
+import html
+import json
+import os
+import re
+import textwrap
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.config import RESUME_CACHE_DIR, settings
+
+# Bump whenever the layout below changes so cached PDFs are regenerated
+TEMPLATE_VERSION = "1"
+
+_TAG = re.compile(r"<[^>]+>")
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 54
+# (font resource, size, leading, wrap width in characters)
+STYLES = {
+    "title": ("F2", 20, 26, 48),
+    "heading": ("F2", 13, 20, 70),
+    "subheading": ("F2", 10.5, 15, 90),
+    "body": ("F1", 10, 13, 100),
+}
+
+
+def _plain_text(value: str | None) -> str:
+    if not value:
+        return ""
+    return " ".join(html.unescape(_TAG.sub(" ", value)).split())
+
+
+def _pdf_string(text: str) -> str:
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _layout(payload: dict) -> list[tuple[str, str]]:
+    lines = [("title", payload["full_name"]), ("body", payload["email"])]
+
+    if payload["experiences"]:
+        lines.append(("heading", "Experience"))
+        for exp in payload["experiences"]:
+            end = exp["end_date"] or "Present"
+            lines.append(
+                ("subheading", f"{exp['role']} - {exp['company']} ({exp['start_date']} to {end})")
+            )
+            lines.append(("body", _plain_text(exp["description"])))
+
+    if payload["certifications"]:
+        lines.append(("heading", "Certifications"))
+        for cert in payload["certifications"]:
+            lines.append(
+                ("body", f"{cert['name']}, {cert['issuer']} ({cert['issue_date']})")
+            )
+
+    if payload["problems"]:
+        lines.append(("heading", "Selected problems"))
+        for problem in payload["problems"]:
+            tags = ", ".join(problem["tags"] or [])
+            lines.append(
+                ("subheading", f"{problem['title']} [{problem['difficulty']}]")
+            )
+            if tags:
+                lines.append(("body", tags))
+            for label in ("situation", "task", "action", "result"):
+                lines.append(
+                    ("body", f"{label.title()}: {_plain_text(problem[label])}")
+                )
+    return lines
+
+
+def render_resume_pdf(payload: dict) -> bytes:
+    """Render the resume as a minimal text-only PDF.
+
+    Runs in a worker process, so it takes and returns plain data only.
+    """
+    pages: list[list[str]] = [[]]
+    y = PAGE_HEIGHT - MARGIN
+    for style, text in _layout(payload):
+        if not text:
+            continue
+        font, size, leading, width = STYLES[style]
+        if style in ("heading", "subheading"):
+            y -= leading / 3
+        for line in textwrap.wrap(text, width) or [""]:
+            if y - leading < MARGIN:
+                pages.append([])
+                y = PAGE_HEIGHT - MARGIN
+            y -= leading
+            pages[-1].append(
+                f"BT /{font} {size} Tf {MARGIN} {y:.1f} Td ({_pdf_string(line)}) Tj ET"
+            )
+
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page object numbers are known
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    page_refs = []
+    for content in pages:
+        stream = "\n".join(content).encode("latin-1")
+        objects.append(
+            f"<< /Length {len(stream)} >>\nstream\n".encode("latin-1")
+            + stream
+            + b"\nendstream"
+        )
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> "
+            f"/Contents {len(objects)} 0 R >>"
+        )
+        page_refs.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(page_refs)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        body = obj if isinstance(obj, bytes) else obj.encode("latin-1")
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    return bytes(out)
+
+
+def content_hash(payload: dict) -> str:
+    canonical = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(f"{TEMPLATE_VERSION}:{canonical}".encode()).hexdigest()
+
+
+class ResumeRenderer:
+    """Renders resumes in a bounded process pool, cached by content hash.
+
+    The hash covers every input row and the template version, so a cached
+    PDF is reused until the user edits something that appears on it.
+    Recent PDFs are kept in memory and more of them on disk, where the
+    cache is pruned by age and total size (``RESUME_CACHE_MAX_*``).
+    """
+
+    PRUNE_INTERVAL_SECONDS = 300
+
+    def __init__(self, max_workers: int, memory_items: int = 64):
+        self._max_workers = max_workers
+        self._pool: ProcessPoolExecutor | None = None
+        # Bound queued work too, not just running work
+        self._slots = asyncio.Semaphore(max_workers * 2)
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_items = memory_items
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._pruned_at: float | None = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _remember(self, digest: str, pdf: bytes) -> None:
+        self._memory[digest] = pdf
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self._memory_items:
+            self._memory.popitem(last=False)
+
+    async def render(self, payload: dict) -> tuple[str, bytes]:
+        digest = content_hash(payload)
+        pdf = self._memory.get(digest)
+        if pdf is not None:
+            self._memory.move_to_end(digest)
+            return digest, pdf
+
+        path = RESUME_CACHE_DIR / f"{digest}.pdf"
+        try:
+            pdf = await asyncio.to_thread(_read_cache, path)
+        except FileNotFoundError:
+            pdf = None
+        if pdf is not None:
+            self._remember(digest, pdf)
+            return digest, pdf
+
+        # Concurrent downloads of the same resume share one render
+        inflight = self._inflight.get(digest)
+        if inflight is not None:
+            return digest, await inflight
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[digest] = future
+        try:
+            async with self._slots:
+                pdf = await asyncio.get_running_loop().run_in_executor(
+                    self._executor(), render_resume_pdf, payload
+                )
+            await asyncio.to_thread(_write_cache, path, pdf)
+            now = time.monotonic()
+            if self._pruned_at is None or now - self._pruned_at > self.PRUNE_INTERVAL_SECONDS:
+                self._pruned_at = now
+                await asyncio.to_thread(
+                    prune_cache,
+                    settings.RESUME_CACHE_MAX_BYTES,
+                    settings.RESUME_CACHE_MAX_AGE_DAYS * 86400,
+                )
+            self._remember(digest, pdf)
+            future.set_result(pdf)
+            return digest, pdf
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Avoid "exception was never retrieved" when nobody else waited
+            future.exception()
+            raise
+        finally:
+            del self._inflight[digest]
+
+
+def _read_cache(path) -> bytes:
+    pdf = path.read_bytes()
+    # The mtime doubles as the last-used time for pruning
+    os.utime(path)
+    return pdf
+
+
+def _write_cache(path, pdf: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(pdf)
+    tmp.replace(path)
+
+
+def prune_cache(max_bytes: int, max_age_seconds: float) -> int:
+    """Delete PDFs unused for ``max_age_seconds``, then the least recently
+    used until the rest fit in ``max_bytes``; returns how many went."""
+    entries = []
+    for path in RESUME_CACHE_DIR.glob("*.pdf"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+
+    cutoff = time.time() - max_age_seconds
+    total = sum(size for _, size, _ in entries)
+    deleted = 0
+    for mtime, size, path in entries:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        try:
+            # Another worker may have pruned it already
+            path.unlink(missing_ok=True)
+        except OSError:
+            continue
+        total -= size
+        deleted += 1
+    return deleted
+
+
+renderer = ResumeRenderer(max_workers=settings.RESUME_RENDER_WORKERS)
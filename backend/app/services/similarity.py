@@ -0,0 +1,246 @@
+import html
+import math
+import re
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.interview_question import InterviewQuestion
+from app.models.problem import Problem
+
+# Hashed feature space; collisions are rare enough at this size for
+# ranking and keep the per-user document-frequency table at 256 KB.
+DIMENSIONS = 1 << 16
+TITLE_WEIGHT = 2
+
+_TAG = re.compile(r"<[^>]+>")
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i in is it its of on or "
+    "that the this to was we were will with".split()
+)
+
+
+def tokenize(text: str | None) -> list[str]:
+    if not text:
+        return []
+    text = html.unescape(_TAG.sub(" ", text)).lower()
+    return [w for w in _WORD.findall(text) if w not in _STOPWORDS]
+
+
+def vectorize(title: str, body: list[str | None]) -> tuple[np.ndarray, np.ndarray]:
+    """Hashed, sublinear term frequencies as (indices, values) arrays."""
+    counts: Counter[int] = Counter()
+    for token in tokenize(title):
+        counts[zlib.crc32(token.encode()) % DIMENSIONS] += TITLE_WEIGHT
+    for text in body:
+        for token in tokenize(text):
+            counts[zlib.crc32(token.encode()) % DIMENSIONS] += 1
+    indices = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+    values = np.fromiter(
+        (1.0 + math.log(c) for c in counts.values()),
+        dtype=np.float32,
+        count=len(counts),
+    )
+    return indices, values
+
+
+def problem_vector(problem) -> tuple[np.ndarray, np.ndarray]:
+    return vectorize(
+        problem.title,
+        [problem.situation, problem.task, problem.action, problem.result],
+    )
+
+
+def question_vector(question) -> tuple[np.ndarray, np.ndarray]:
+    return vectorize(question.question, [question.answer])
+
+
+class UserIndex:
+    """TF-IDF index over one user's problems and interview questions.
+
+    Documents are sparse hashed vectors; document frequencies are a dense
+    int32 array so IDF weights are a single vectorized expression. The
+    flattened CSR view used for scoring is rebuilt lazily after changes.
+    """
+
+    def __init__(self):
+        self.docs: dict[tuple[str, str], tuple[np.ndarray, np.ndarray, str]] = {}
+        self.df = np.zeros(DIMENSIONS, dtype=np.int32)
+        self.count = {"problems": 0, "interview_questions": 0}
+        self.max_updated: dict[str, datetime | None] = {
+            "problems": None,
+            "interview_questions": None,
+        }
+        self._flat = None
+
+    def upsert(self, entity_type, entity_id, vector, label, updated_at) -> None:
+        key = (entity_type, str(entity_id))
+        old = self.docs.get(key)
+        if old is not None:
+            self.df[old[0]] -= 1
+        else:
+            self.count[entity_type] += 1
+        self.docs[key] = (vector[0], vector[1], label)
+        self.df[vector[0]] += 1
+        current = self.max_updated[entity_type]
+        if updated_at and (current is None or updated_at > current):
+            self.max_updated[entity_type] = updated_at
+        self._flat = None
+
+    def remove(self, entity_type, entity_id) -> None:
+        old = self.docs.pop((entity_type, str(entity_id)), None)
+        if old is not None:
+            self.df[old[0]] -= 1
+            self.count[entity_type] -= 1
+            self._flat = None
+
+    def _flatten(self):
+        if self._flat is None:
+            keys = [k for k, doc in self.docs.items() if len(doc[0])]
+            if keys:
+                indices = np.concatenate([self.docs[k][0] for k in keys])
+                values = np.concatenate([self.docs[k][1] for k in keys])
+                lengths = np.fromiter(
+                    (len(self.docs[k][0]) for k in keys), dtype=np.int64, count=len(keys)
+                )
+                offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            else:
+                indices = np.zeros(0, dtype=np.int32)
+                values = np.zeros(0, dtype=np.float32)
+                offsets = np.zeros(0, dtype=np.int64)
+            self._flat = (keys, indices, values, offsets)
+        return self._flat
+
+    def similar(self, entity_type, entity_id, limit: int):
+        query = self.docs.get((entity_type, str(entity_id)))
+        if query is None or not len(query[0]):
+            return []
+        keys, indices, values, offsets = self._flatten()
+        if not keys:
+            return []
+
+        n_docs = len(self.docs)
+        idf = (np.log((1.0 + n_docs) / (1.0 + self.df)) + 1.0).astype(np.float32)
+        weighted = values * idf[indices]
+        query_dense = np.zeros(DIMENSIONS, dtype=np.float32)
+        query_dense[query[0]] = query[1] * idf[query[0]]
+
+        dots = np.add.reduceat(query_dense[indices] * weighted, offsets)
+        norms = np.sqrt(np.add.reduceat(weighted * weighted, offsets))
+        query_norm = np.linalg.norm(query_dense)
+        scores = dots / (norms * query_norm + 1e-12)
+
+        self_key = (entity_type, str(entity_id))
+        take = min(limit + 1, len(keys))
+        best = np.argpartition(-scores, take - 1)[:take]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        results = []
+        for i in best:
+            if keys[i] == self_key or scores[i] <= 0:
+                continue
+            results.append((keys[i][0], keys[i][1], self.docs[keys[i]][2], float(scores[i])))
+            if len(results) == limit:
+                break
+        return results
+
+
+class SimilarityIndex:
+    """Per-user indexes kept in memory (LRU) and updated on write.
+
+    Each index remembers the row count and newest ``updated_at`` it has
+    applied per table. Queries compare that with the database, so an
+    index that missed writes (another worker, a rolled-back request) is
+    rebuilt instead of serving stale neighbours.
+    """
+
+    def __init__(self, max_users: int = 128):
+        self._lock = threading.Lock()
+        self._users: OrderedDict[str, UserIndex] = OrderedDict()
+        self._max_users = max_users
+
+    def _get(self, user_id: str) -> UserIndex | None:
+        index = self._users.get(user_id)
+        if index is not None:
+            self._users.move_to_end(user_id)
+        return index
+
+    def upsert_problem(self, problem) -> None:
+        with self._lock:
+            index = self._get(str(problem.user_id))
+            if index is not None:
+                index.upsert("problems", problem.id, problem_vector(problem), problem.title, problem.updated_at)
+
+    def upsert_question(self, question) -> None:
+        with self._lock:
+            index = self._get(str(question.user_id))
+            if index is not None:
+                index.upsert("interview_questions", question.id, question_vector(question), question.question, question.updated_at)
+
+    def remove(self, user_id: str, entity_type: str, entity_id: str) -> None:
+        with self._lock:
+            index = self._get(str(user_id))
+            if index is not None:
+                index.remove(entity_type, entity_id)
+
+    async def _db_version(self, db: AsyncSession, user_id: str):
+        version = {}
+        for name, model in (
+            ("problems", Problem),
+            ("interview_questions", InterviewQuestion),
+        ):
+            result = await db.execute(
+                select(func.count(), func.max(model.updated_at)).where(
+                    model.user_id == user_id
+                )
+            )
+            version[name] = tuple(result.one())
+        return version
+
+    async def _build(self, db: AsyncSession, user_id: str) -> UserIndex:
+        index = UserIndex()
+        problems = await db.execute(
+            select(
+                Problem.id, Problem.title, Problem.situation, Problem.task,
+                Problem.action, Problem.result, Problem.updated_at,
+            ).where(Problem.user_id == user_id)
+        )
+        for row in problems.all():
+            index.upsert("problems", row.id, problem_vector(row), row.title, row.updated_at)
+        questions = await db.execute(
+            select(
+                InterviewQuestion.id, InterviewQuestion.question,
+                InterviewQuestion.answer, InterviewQuestion.updated_at,
+            ).where(InterviewQuestion.user_id == user_id)
+        )
+        for row in questions.all():
+            index.upsert("interview_questions", row.id, question_vector(row), row.question, row.updated_at)
+        return index
+
+    async def similar(
+        self, db: AsyncSession, user_id: str, entity_type: str, entity_id: str, limit: int
+    ):
+        version = await self._db_version(db, user_id)
+        with self._lock:
+            index = self._get(user_id)
+        fresh = index is not None and all(
+            version[name] == (index.count[name], index.max_updated[name])
+            for name in version
+        )
+        if not fresh:
+            index = await self._build(db, user_id)
+            with self._lock:
+                self._users[user_id] = index
+                self._users.move_to_end(user_id)
+                while len(self._users) > self._max_users:
+                    self._users.popitem(last=False)
+        with self._lock:
+            return index.similar(entity_type, entity_id, limit)
+
+
+similarity_index = SimilarityIndex()
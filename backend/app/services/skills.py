@@ -0,0 +1,175 @@
+import asyncio
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.learning import Learning
+from app.models.problem import Problem
+
+# Tags beyond this many (by frequency) are counted but left out of the
+# co-occurrence matrix, which is quadratic in the number of tags.
+MAX_GRAPH_TAGS = 300
+MATRIX_TAGS = 30
+TIMELINE_TAGS = 10
+RELATED_LIMIT = 5
+
+
+def compute_skill_graph(rows: list[tuple[list | None, date | None]]) -> dict:
+    """Frequencies, monthly timeline, co-occurrence and related skills.
+
+    ``rows`` are (tags, date) pairs from every tagged item. The work is
+    done on flat COO arrays (one entry per item/tag pair) so the cost is
+    a handful of vectorized passes regardless of how many items there are.
+    """
+    vocab: dict[str, int] = {}
+    item_idx: list[int] = []
+    tag_idx: list[int] = []
+    months: list[int] = []
+    for item, (tags, day) in enumerate(rows):
+        if not tags:
+            continue
+        month = day.year * 12 + day.month - 1 if day else -1
+        for tag in set(tags):
+            tag_idx.append(vocab.setdefault(tag, len(vocab)))
+            item_idx.append(item)
+            months.append(month)
+
+    if not vocab:
+        return {
+            "tags": [],
+            "timeline": {"months": [], "series": {}},
+            "cooccurrence": {"tags": [], "matrix": []},
+            "related": {},
+        }
+
+    names = np.array(list(vocab))
+    items = np.asarray(item_idx, dtype=np.int64)
+    tags = np.asarray(tag_idx, dtype=np.int64)
+    month_arr = np.asarray(months, dtype=np.int64)
+
+    freq = np.bincount(tags, minlength=len(vocab))
+    order = np.lexsort((names, -freq))
+
+    # Re-index so the most frequent tags get the smallest ids
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    tags = rank[tags]
+    names = names[order]
+    freq = freq[order]
+    n = min(len(names), MAX_GRAPH_TAGS)
+
+    # Monthly timeline of the top tags
+    dated = (month_arr >= 0) & (tags < TIMELINE_TAGS)
+    timeline = {"months": [], "series": {}}
+    if dated.any():
+        first, last = month_arr[dated].min(), month_arr[dated].max()
+        span = int(last - first + 1)
+        k = min(TIMELINE_TAGS, len(names))
+        counts = np.bincount(
+            tags[dated] * span + (month_arr[dated] - first), minlength=k * span
+        ).reshape(k, span)
+        timeline = {
+            "months": [f"{m // 12:04d}-{m % 12 + 1:02d}" for m in range(first, last + 1)],
+            "series": {str(names[i]): counts[i].tolist() for i in range(k)},
+        }
+
+    # Co-occurrence = X^T X for the item x tag incidence matrix X, built by
+    # enumerating every tag pair within each item.
+    keep = tags < n
+    items, tags = items[keep], tags[keep]
+    by_item = np.argsort(items, kind="stable")
+    items, tags = items[by_item], tags[by_item]
+    _, starts, sizes = np.unique(items, return_index=True, return_counts=True)
+    group = np.repeat(np.arange(len(sizes)), sizes)
+    left = np.repeat(np.arange(len(tags)), sizes[group])
+    block_start = np.repeat(np.cumsum(sizes[group]) - sizes[group], sizes[group])
+    right = starts[group[left]] + (np.arange(len(left)) - block_start)
+    cooc = np.bincount(
+        tags[left] * n + tags[right], minlength=n * n
+    ).reshape(n, n)
+
+    # Jaccard similarity between tags, ignoring each tag's own diagonal
+    top_freq = freq[:n]
+    union = top_freq[:, None] + top_freq[None, :] - cooc
+    with np.errstate(divide="ignore", invalid="ignore"):
+        jaccard = np.where(union > 0, cooc / union, 0.0)
+    np.fill_diagonal(jaccard, 0.0)
+    limit = min(RELATED_LIMIT, n - 1)
+    related = {}
+    if limit > 0:
+        best = np.argpartition(-jaccard, limit - 1, axis=1)[:, :limit]
+        for i in range(n):
+            ranked = best[i][np.argsort(-jaccard[i, best[i]], kind="stable")]
+            related[str(names[i])] = [
+                {"tag": str(names[j]), "score": round(float(jaccard[i, j]), 4), "count": int(cooc[i, j])}
+                for j in ranked
+                if j != i and cooc[i, j] > 0
+            ]
+
+    m = min(MATRIX_TAGS, n)
+    return {
+        "tags": [{"tag": str(name), "count": int(count)} for name, count in zip(names, freq)],
+        "timeline": timeline,
+        "cooccurrence": {"tags": names[:m].tolist(), "matrix": cooc[:m, :m].tolist()},
+        "related": related,
+    }
+
+
+class SkillGraphCache:
+    """Per-user results keyed by a cheap version of the underlying rows."""
+
+    def __init__(self, max_users: int = 256):
+        self._entries: OrderedDict[str, tuple[tuple, dict]] = OrderedDict()
+        self._max_users = max_users
+
+    def get(self, user_id: str, version: tuple) -> dict | None:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(user_id)
+        return entry[1]
+
+    def put(self, user_id: str, version: tuple, graph: dict) -> None:
+        self._entries[user_id] = (version, graph)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self._max_users:
+            self._entries.popitem(last=False)
+
+
+skill_graph_cache = SkillGraphCache()
+
+
+async def get_skill_graph(db: AsyncSession, user_id: str) -> dict:
+    # Row counts catch deletes, max(updated_at) catches inserts and edits;
+    # both are answered from the (user_id, updated_at) indexes.
+    version_rows = []
+    for model in (Problem, Learning):
+        result = await db.execute(
+            select(func.count(), func.max(model.updated_at)).where(
+                model.user_id == user_id
+            )
+        )
+        version_rows.append(tuple(result.one()))
+    version = tuple(version_rows)
+
+    graph = skill_graph_cache.get(user_id, version)
+    if graph is not None:
+        return graph
+
+    problems = await db.execute(
+        select(Problem.tags, Problem.solved_at).where(Problem.user_id == user_id)
+    )
+    learnings = await db.execute(
+        select(Learning.tags, Learning.learned_date).where(
+            Learning.user_id == user_id
+        )
+    )
+    rows = [tuple(row) for row in problems.all()] + [
+        tuple(row) for row in learnings.all()
+    ]
+    graph = await asyncio.to_thread(compute_skill_graph, rows)
+    skill_graph_cache.put(user_id, version, graph)
+    return graph
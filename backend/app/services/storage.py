@@ -0,0 +1,238 @@
+"""Where uploaded files live.
+
+Clients upload straight to storage: ``POST /uploads/presign`` hands out
+a short-lived upload URL for one key, the client sends the file there,
+then ``POST /uploads/finalize`` checks what arrived and returns the URL
+to store. With S3 (or anything speaking its API, e.g. MinIO) the bytes
+never pass through the API workers, and every node sees the same files.
+
+``LocalStorage`` keeps files in UPLOAD_DIR for development and single
+node deployments; its "presigned" URL is a token-authenticated PUT on
+the API itself.
+"""
+
+import asyncio
+import mimetypes
+import os
+import re
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+
+import aiofiles
+
+from app.core.config import UPLOAD_DIR, settings
+from app.core.security import create_upload_token
+
+
+@dataclass
+class PresignedUpload:
+    method: str
+    url: str
+    # Form fields to send before the file (POST) or headers to send (PUT)
+    fields: dict[str, str] = field(default_factory=dict)
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class StoredObject:
+    size: int
+    content_type: str | None
+
+
+def _extension(content_type: str) -> str:
+    return mimetypes.guess_extension(content_type) or ""
+
+
+def new_key(user_id: str, content_type: str) -> str:
+    """A fresh key for one upload of an already validated ``content_type``.
+
+    The extension comes from the type, never from the client's filename:
+    storage serves files with the type their extension implies, so a
+    ``.html`` name on an image upload would be served as a page.
+    """
+    return f"{user_id}/{uuid.uuid4().hex}{_extension(content_type)}"
+
+
+def is_user_key(user_id: str, key: str) -> bool:
+    """Whether ``key`` is one ``new_key`` could have made for the user."""
+    prefix, _, name = key.partition("/")
+    stem, dot, ext = name.partition(".")
+    return (
+        prefix == str(user_id)
+        and re.fullmatch(r"[0-9a-f]{32}", stem) is not None
+        and dot + ext in {"", *map(_extension, settings.ALLOWED_IMAGE_TYPES)}
+    )
+
+
+class StorageBackend(ABC):
+    @abstractmethod
+    async def presign_upload(
+        self, key: str, content_type: str, max_bytes: int, expires_in: int
+    ) -> PresignedUpload: ...
+
+    @abstractmethod
+    async def stat(self, key: str) -> StoredObject | None: ...
+
+    @abstractmethod
+    async def put(self, key: str, data: bytes, content_type: str) -> None: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def public_url(self, key: str) -> str: ...
+
+
+class LocalStorage(StorageBackend):
+    def __init__(self, root: Path, base_url: str):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    def path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Key escapes the upload directory: {key}")
+        return path
+
+    async def presign_upload(self, key, content_type, max_bytes, expires_in):
+        token = create_upload_token(
+            key, content_type, max_bytes, timedelta(seconds=expires_in)
+        )
+        return PresignedUpload(
+            method="PUT",
+            url=f"{self.base_url}/direct/{key}?token={token}",
+            headers={"Content-Type": content_type},
+        )
+
+    async def stat(self, key):
+        try:
+            size = (await asyncio.to_thread(self.path(key).stat)).st_size
+        except FileNotFoundError:
+            return None
+        # The direct upload endpoint only accepts the presigned type
+        return StoredObject(size=size, content_type=None)
+
+    async def put(self, key, data, content_type):
+        async def chunks():
+            yield data
+
+        await self.write(key, chunks())
+
+    async def write(self, key: str, chunks: AsyncIterator[bytes]) -> None:
+        """Write atomically, so a half-received file is never visible."""
+        path = self.path(key)
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            async with aiofiles.open(tmp, "wb") as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+            await asyncio.to_thread(os.replace, tmp, path)
+        finally:
+            await asyncio.to_thread(tmp.unlink, missing_ok=True)
+
+    async def delete(self, key):
+        await asyncio.to_thread(self.path(key).unlink, missing_ok=True)
+
+    def public_url(self, key):
+        return f"{self.base_url}/{key}"
+
+
+class S3Storage(StorageBackend):
+    """S3 or an S3-compatible service such as MinIO (set S3_ENDPOINT_URL).
+
+    Uploads use presigned POSTs, whose policy makes S3 itself reject the
+    wrong content type or a file over the size limit.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        region: str | None,
+        endpoint_url: str | None,
+        access_key_id: str | None,
+        secret_access_key: str | None,
+        public_url: str | None,
+    ):
+        import boto3
+        from botocore.config import Config
+
+        self.bucket = bucket
+        self._client = boto3.client(
+            "s3",
+            region_name=region,
+            endpoint_url=endpoint_url,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            config=Config(
+                signature_version="s3v4",
+                # MinIO and most stand-ins don't do virtual-hosted buckets
+                s3={"addressing_style": "path" if endpoint_url else "auto"},
+            ),
+        )
+        base = public_url or f"{endpoint_url or 'https://s3.amazonaws.com'}/{bucket}"
+        self._public_base = base.rstrip("/")
+
+    async def presign_upload(self, key, content_type, max_bytes, expires_in):
+        # Signing is local computation; no request to S3
+        post = self._client.generate_presigned_post(
+            Bucket=self.bucket,
+            Key=key,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, max_bytes],
+            ],
+            ExpiresIn=expires_in,
+        )
+        return PresignedUpload(method="POST", url=post["url"], fields=post["fields"])
+
+    async def stat(self, key):
+        from botocore.exceptions import ClientError
+
+        try:
+            head = await asyncio.to_thread(
+                self._client.head_object, Bucket=self.bucket, Key=key
+            )
+        except ClientError as exc:
+            if exc.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return StoredObject(size=head["ContentLength"], content_type=head.get("ContentType"))
+
+    async def put(self, key, data, content_type):
+        await asyncio.to_thread(
+            self._client.put_object,
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+        )
+
+    async def delete(self, key):
+        await asyncio.to_thread(self._client.delete_object, Bucket=self.bucket, Key=key)
+
+    def public_url(self, key):
+        return f"{self._public_base}/{key}"
+
+
+def create_storage() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "s3":
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            region=settings.S3_REGION,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            public_url=settings.S3_PUBLIC_URL,
+        )
+    if settings.STORAGE_BACKEND != "local":
+        raise ValueError(f"Unknown STORAGE_BACKEND {settings.STORAGE_BACKEND!r}")
+    return LocalStorage(UPLOAD_DIR, "/api/v1/uploads")
+
+
+storage = create_storage()
@@ -0,0 +1,119 @@
+"""Shared fixtures.
+
+The app builds its engines when ``app.db.session`` is first imported,
+so the test settings have to be in the environment before any test
+module imports ``app``. Every test runs against one in-memory SQLite
+database on a single event loop.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+_TMP = Path(tempfile.mkdtemp(prefix="carrerlog-tests-"))
+
+os.environ.update(
+    {
+        "DATABASE_URL": "sqlite+aiosqlite://",
+        "DATABASE_REPLICA_URLS": "[]",
+        "DATABASE_SHARD_URLS": "[]",
+        "EVENTS_PG_BRIDGE": "false",
+        "BCRYPT_ROUNDS": "4",
+        # Seeding writes far faster than any user would
+        "RATE_LIMIT_ENABLED": "false",
+        # Sessions on the in-memory database share its one connection, so
+        # a snapshot refresh closing its session in the background would
+        # roll back whatever request happened to be mid-transaction
+        "PORTFOLIO_REFRESH_DELAY_SECONDS": "86400",
+    }
+)
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _scratch_dirs():
+    """Keep snapshots and rendered files out of the source tree."""
+    from app.services import portfolio, resume, storage
+
+    portfolio.PORTFOLIO_DIR = _TMP / "portfolios"
+    resume.RESUME_CACHE_DIR = _TMP / "resume_cache"
+    storage.storage.root = _TMP / "uploads"
+    yield
+    resume.renderer.shutdown()
+
+
+@pytest.fixture(scope="session")
+async def database(anyio_backend):
+    from app.db.base import Base
+    from app.db.session import engine
+    from app.services.portfolio import scheduler
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    if scheduler._task is not None:
+        scheduler._task.cancel()
+
+
+async def create_user(email: str) -> str:
+    from app.db.session import AsyncSessionLocal
+    from app.models.user import User
+
+    async with AsyncSessionLocal() as db:
+        user = User(email=email, full_name=email.split("@")[0].title())
+        db.add(user)
+        await db.commit()
+        return user.id
+
+
+def api_client(user_id: str | None = None):
+    """An ``httpx`` client for the app, authenticated as ``user_id``."""
+    import httpx
+
+    from app.core.security import create_access_token
+    from app.main import app
+
+    headers = {}
+    if user_id is not None:
+        headers["Authorization"] = f"Bearer {create_access_token(user_id)}"
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://test/api/v1",
+        headers=headers,
+    )
+
+
+@pytest.fixture
+def query_budget():
+    """Assert that a block stays within a statement and DB-time budget.
+
+    ::
+
+        with query_budget(statements=2):
+            await client.get("/problems")
+
+    Captures statements through the engine events in
+    ``app.db.instrumentation``; on failure the message lists the SQL.
+    """
+    from app.db.instrumentation import record_queries
+
+    @contextmanager
+    def check(statements: int, db_ms: float = 100.0):
+        with record_queries() as recorder:
+            yield recorder
+        assert recorder.count <= statements, (
+            f"{recorder.count} statements, budget {statements}\n{recorder.report()}"
+        )
+        assert recorder.total_ms <= db_ms, (
+            f"{recorder.total_ms:.1f} ms in the DB, budget {db_ms:.0f} ms\n"
+            f"{recorder.report()}"
+        )
+
+    return check
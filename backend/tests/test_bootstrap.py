@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.v1.endpoints import bootstrap
+from app.core.config import settings
+from app.db import session
+from app.db.base import Base
+from app.models.user import User
+from conftest import api_client
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(params=[2, 11], ids=["no-permits", "two-permits"])
+async def small_pool(request, database, tmp_path, monkeypatch):
+    """Route read-only sessions to a file database with a small pool."""
+    pool = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        pool_size=request.param,
+        max_overflow=0,
+        pool_timeout=5,
+    )
+    async with pool.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            User.__table__.insert().values(
+                id="bootstrap-user", email="bootstrap@example.com", full_name="Boot"
+            )
+        )
+    monkeypatch.setattr(session, "read_engine", pool)
+    monkeypatch.setitem(
+        session._read_only_engines,
+        id(pool),
+        pool.sync_engine.execution_options(postgresql_readonly=True),
+    )
+    yield request.param
+    await pool.dispose()
+
+
+async def test_concurrent_bootstraps_fit_a_small_pool(small_pool, monkeypatch):
+    siblings = []
+    on_sibling = bootstrap._on_sibling
+
+    async def counting(db, load, *args):
+        siblings.append(load)
+        return await on_sibling(db, load, *args)
+
+    monkeypatch.setattr(bootstrap, "_on_sibling", counting)
+    # The point is the pool, not admission control
+    monkeypatch.setattr(settings, "MAX_IN_FLIGHT_REQUESTS", 0)
+    requests = small_pool * 4
+    # Far more sign-ins at once than the pool has connections: only as
+    # many as the permits allow may wait for sibling connections
+    async with api_client("bootstrap-user") as client:
+        responses = await asyncio.wait_for(
+            asyncio.gather(*(client.get("/bootstrap") for _ in range(requests))),
+            timeout=30,
+        )
+
+    assert [r.status_code for r in responses] == [200] * requests
+    assert {r.json()["user"]["id"] for r in responses} == {"bootstrap-user"}
+    permits = (small_pool - 1) // bootstrap.CONNECTIONS_PER_BOOTSTRAP
+    if permits:
+        assert siblings, "no bootstrap loaded concurrently"
+    else:
+        assert siblings == []
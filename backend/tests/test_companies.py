@@ -0,0 +1,80 @@
+from datetime import date
+
+import pytest
+
+from app.db.session import AsyncSessionLocal
+from app.models.interview_question import InterviewQuestion
+from app.services.companies import resolve_company
+from conftest import api_client, create_user
+
+pytestmark = pytest.mark.anyio
+
+
+def _question(company: str) -> dict:
+    return {
+        "question": f"Why {company}?",
+        "answer": "Because",
+        "company": company,
+        "asked_date": "2024-05-01",
+    }
+
+
+async def _suggest(client, prefix: str) -> list[str]:
+    response = await client.get("/interview-questions/companies", params={"prefix": prefix})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.fixture
+async def user_id(database, request):
+    return await create_user(f"{request.node.name}@example.com")
+
+
+@pytest.mark.parametrize("company,found", [("acme", 1), (" ", 0), ("!!!", 0), ("%", 0)])
+async def test_company_filter(company, found, user_id):
+    async with api_client(user_id) as client:
+        await client.post("/interview-questions", json=_question("Acme Inc."))
+        response = await client.get("/interview-questions", params={"company": company})
+    assert response.status_code == 200
+    assert len(response.json()) == found
+
+
+async def test_suggestions_follow_deletes(user_id):
+    async with api_client(user_id) as client:
+        created = await client.post("/interview-questions", json=_question("Globex"))
+        assert await _suggest(client, "glo") == ["Globex"]
+
+        await client.delete(f"/interview-questions/{created.json()['id']}")
+        assert await _suggest(client, "glo") == []
+
+
+async def test_suggestions_skip_rolled_back_creates(user_id, monkeypatch):
+    from app.services import similarity
+
+    def fail(question):
+        raise RuntimeError("index update failed")
+
+    async with api_client(user_id) as client:
+        assert await _suggest(client, "ini") == []
+        # Fails after the company is resolved, so the request rolls back
+        monkeypatch.setattr(similarity.similarity_index, "upsert_question", fail)
+        with pytest.raises(RuntimeError):
+            await client.post("/interview-questions", json=_question("Initech"))
+        monkeypatch.undo()
+        assert await _suggest(client, "ini") == []
+
+
+async def test_suggestions_see_writes_from_elsewhere(user_id):
+    async with api_client(user_id) as client:
+        assert await _suggest(client, "umb") == []
+        # As another worker would: straight to the database
+        async with AsyncSessionLocal() as db:
+            company = await resolve_company(db, "Umbrella Corp")
+            db.add(
+                InterviewQuestion(
+                    user_id=user_id, question="q", answer="a", company="Umbrella Corp",
+                    company_id=company.id, asked_date=date(2024, 5, 1),
+                )
+            )
+            await db.commit()
+        assert await _suggest(client, "umb") == ["Umbrella Corp"]
@@ -0,0 +1,26 @@
+import pytest
+
+from app.core.logging import SAFE_ID, redact
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ('{"password": "hunter22"}', '{"password": "[redacted]"}'),
+        ('{"token": "a\\"b", "x": 1}', '{"token": "[redacted]", "x": 1}'),
+        ("{'password': 'hunter22', 'email': 'a@b.c'}", "{'password': '[redacted]', 'email': 'a@b.c'}"),
+        ("{'refresh_token': \"it's\"}", "{'refresh_token': \"[redacted]\"}"),
+        ("code=abc&state=xyz", "code=[redacted]&state=xyz"),
+        ("Authorization: Bearer abc.def", "Authorization: Bearer [redacted]"),
+        ("{'title': 'password reset'}", "{'title': 'password reset'}"),
+    ],
+)
+def test_redact(text, expected):
+    assert redact(text) == expected
+
+
+@pytest.mark.parametrize(
+    "value,safe", [("a1b2-c3_d4", True), ("", False), ("../etc", False), ("x" * 65, False)]
+)
+def test_safe_id(value, safe):
+    assert (SAFE_ID.match(value) is not None) == safe
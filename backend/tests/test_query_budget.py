@@ -0,0 +1,240 @@
+"""Per-endpoint query budgets.
+
+Seeds one user with a few dozen rows of everything, calls each endpoint
+once and checks its statement count and total DB time. An endpoint that
+goes over budget fails with the SQL it ran, so an accidental N+1 fails
+the suite. Every route in the app needs a case here or in ``EXEMPT``.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+
+import pytest
+
+from conftest import api_client, create_user
+
+SEED_ROWS = 25
+
+
+@dataclass
+class Case:
+    method: str
+    path: str
+    statements: int
+    db_ms: float = 100.0
+    params: dict = field(default_factory=dict)
+    json: dict | None = None
+    data: dict | None = None
+    status: int = 200
+
+
+# Budgets are the current statement counts; raise one only together with
+# the change that needs it. Path placeholders are filled from seeded ids.
+BUDGETS = [
+    Case("GET", "/auth/me", 1),
+    Case(
+        "POST",
+        "/auth/register",
+        2,
+        json={"email": "new@example.com", "full_name": "New User", "password": "hunter22"},
+        status=201,
+    ),
+    Case("POST", "/auth/login", 1, data={"username": "new@example.com", "password": "hunter22"}),
+    Case("GET", "/problems", 2, params={"size": 20}),
+    Case("GET", "/problems", 2, params={"search": "cache", "tag": "redis"}),
+    Case("GET", "/problems", 2, params={"page": 2, "include_total": False}),
+    Case("GET", "/problems/{problem_id}", 2),
+    Case("GET", "/problems/{problem_id}/similar", 6),
+    Case("GET", "/problems/{missing_id}/similar", 2, status=404),
+    Case("PUT", "/problems/{problem_id}", 5, json={"title": "Rebuilt cache warmer"}),
+    Case(
+        "POST",
+        "/problems",
+        5,
+        params={"check_duplicates": True},
+        json={
+            "title": "Cache stampede on deploy",
+            "difficulty": "Hard",
+            "situation": "Every deploy emptied the cache",
+            "task": "Stop the thundering herd",
+            "action": "Added request coalescing",
+            "result": "p99 flat through deploys",
+            "tags": ["redis", "caching"],
+        },
+        status=201,
+    ),
+    Case("GET", "/dashboard/stats", 7),
+    Case("GET", "/bootstrap", 10),
+    Case("GET", "/dashboard/activity", 2),
+    Case("GET", "/dashboard/skills", 5),
+    Case("GET", "/experiences", 2),
+    Case(
+        "POST",
+        "/experiences",
+        2,
+        json={"company": "Acme", "role": "Engineer", "start_date": "2024-01-01"},
+        status=201,
+    ),
+    Case("GET", "/certifications", 2),
+    Case(
+        "POST",
+        "/certifications",
+        2,
+        json={"name": "CKA", "issuer": "CNCF", "issue_date": "2024-03-01"},
+        status=201,
+    ),
+    Case("GET", "/interview-questions", 2),
+    Case("GET", "/interview-questions", 2, params={"company": "Acme"}),
+    Case("GET", "/interview-questions/companies", 3, params={"prefix": "ac"}),
+    Case(
+        "POST",
+        "/interview-questions",
+        5,
+        json={
+            "question": "How would you shard a sessions table?",
+            "answer": "By user id",
+            "company": "Acme",
+            "asked_date": "2024-05-01",
+        },
+        status=201,
+    ),
+    Case("GET", "/learnings", 2),
+    Case("GET", "/learnings", 2, params={"tag": "postgres", "size": 5}),
+    Case(
+        "POST",
+        "/learnings",
+        3,
+        json={"topic": "Postgres partitioning", "tags": ["postgres"]},
+        status=201,
+    ),
+    Case("GET", "/sync", 8),
+    Case("GET", "/duplicates", 5),
+    Case("PUT", "/portfolio/settings", 3, json={"slug": "budget-user", "public": True}),
+    Case("GET", "/portfolio/{slug}", 0),
+    Case("GET", "/portfolio/{slug}.html", 0),
+    Case("GET", "/resume", 5),
+    Case("GET", "/diagnostics/slow-queries", 1, status=403),
+    Case("DELETE", "/diagnostics/slow-queries", 1, status=403),
+    Case("GET", "/diagnostics/tables", 1, status=403),
+    Case("GET", "/diagnostics/admission", 1, status=403),
+    Case(
+        "POST",
+        "/uploads/presign",
+        1,
+        json={"filename": "avatar.png", "content_type": "image/png", "size": 2048},
+    ),
+    Case("POST", "/uploads/finalize", 1, json={"key": "missing.png"}, status=404),
+    Case("DELETE", "/problems/{problem_id}", 6, status=204),
+    Case("DELETE", "/interview-questions/{question_id}", 6, status=204),
+    Case("DELETE", "/learnings/{learning_id}", 5, status=204),
+]
+
+# Endpoints that can't run in-process: OAuth round trips to Google, an
+# endless event stream, and uploads of file bodies that never touch the DB.
+EXEMPT = {
+    ("GET", "/auth/google/login"),
+    ("POST", "/auth/google/callback"),
+    ("GET", "/events"),
+    ("POST", "/uploads"),
+    ("PUT", "/uploads/direct/{key}"),
+}
+
+
+def _seed_payloads(i: int) -> dict[str, dict]:
+    tags = [["redis", "caching"], ["postgres", "indexing"], ["kafka"]][i % 3]
+    return {
+        "/problems": {
+            "title": f"Problem {i}: cache invalidation across regions",
+            "difficulty": ("Easy", "Medium", "Hard")[i % 3],
+            "situation": f"Situation {i} with stale reads",
+            "task": "Keep reads consistent",
+            "action": "Versioned keys and write-through",
+            "result": "No more stale reads",
+            "tags": tags,
+            "solved_at": f"2024-{i % 12 + 1:02d}-10",
+        },
+        "/learnings": {
+            "topic": f"Learning {i}",
+            "tags": tags,
+            "learned_date": f"2024-{i % 12 + 1:02d}-12",
+        },
+        "/interview-questions": {
+            "question": f"Question {i}: how does MVCC work?",
+            "answer": "Row versions and snapshots",
+            "company": ("Acme", "Globex", "Initech")[i % 3],
+            "asked_date": f"2024-{i % 12 + 1:02d}-15",
+        },
+        "/experiences": {
+            "company": f"Company {i}",
+            "role": "Engineer",
+            "start_date": f"20{10 + i % 10}-01-01",
+        },
+        "/certifications": {
+            "name": f"Cert {i}",
+            "issuer": "Issuer",
+            "issue_date": f"20{10 + i % 10}-06-01",
+        },
+    }
+
+
+@pytest.fixture(scope="module")
+async def seeded(database):
+    """Ids the case paths are formatted with; the user is ``ids["user_id"]``."""
+    from app.services.portfolio import regenerate_snapshot
+
+    user_id = await create_user("budget@example.com")
+    ids = {"user_id": user_id, "slug": "budget-user", "missing_id": str(uuid.uuid4())}
+    async with api_client(user_id) as client:
+        for i in range(SEED_ROWS):
+            for path, payload in _seed_payloads(i).items():
+                response = await client.post(path, json=payload)
+                response.raise_for_status()
+                key = {
+                    "/problems": "problem_id",
+                    "/learnings": "learning_id",
+                    "/interview-questions": "question_id",
+                }.get(path)
+                if key:
+                    ids.setdefault(key, response.json()["id"])
+        # Public portfolio pages are served from a snapshot rendered in the
+        # background; render it up front instead of waiting for the scheduler
+        response = await client.put(
+            "/portfolio/settings", json={"slug": ids["slug"], "public": True}
+        )
+        response.raise_for_status()
+    await regenerate_snapshot(user_id)
+    return ids
+
+
+# Cases run in list order and later ones depend on earlier ones (login
+# after register, deletes last)
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "case",
+    BUDGETS,
+    ids=[f"{c.method} {c.path} {c.params or ''}".strip() for c in BUDGETS],
+)
+async def test_endpoint_within_budget(case, seeded, query_budget):
+    async with api_client(seeded["user_id"]) as client:
+        with query_budget(case.statements, case.db_ms):
+            response = await client.request(
+                case.method,
+                case.path.format(**seeded),
+                params=case.params,
+                json=case.json,
+                data=case.data,
+            )
+    assert response.status_code == case.status, response.text[:200]
+
+
+def test_every_endpoint_has_a_budget():
+    from app.main import app
+
+    covered = {(case.method, case.path) for case in BUDGETS} | EXEMPT
+    missing = [
+        f"{method.upper()} {path.removeprefix('/api/v1')}"
+        for path, operations in app.openapi()["paths"].items()
+        for method in operations
+        if (method.upper(), path.removeprefix("/api/v1")) not in covered
+    ]
+    assert not missing, f"no query budget for {missing}"
@@ -0,0 +1,66 @@
+import pytest
+
+from app.core import ratelimit
+from app.core.config import settings
+from app.core.ratelimit import Limit, MemoryBuckets, client_address
+from conftest import api_client
+
+pytestmark = pytest.mark.anyio
+
+
+def _scope(peer: str, *forwarded: str) -> dict:
+    return {
+        "client": (peer, 50000),
+        "headers": [(b"x-forwarded-for", value.encode()) for value in forwarded],
+    }
+
+
+@pytest.mark.parametrize(
+    "scope,expected",
+    [
+        (_scope("203.0.113.7"), "203.0.113.7"),
+        # Only a trusted proxy's header counts
+        (_scope("203.0.113.7", "198.51.100.1"), "203.0.113.7"),
+        (_scope("127.0.0.1", "198.51.100.1"), "198.51.100.1"),
+        # Whatever the client wrote itself sits left of the real address
+        (_scope("127.0.0.1", "10.9.9.9, 198.51.100.1"), "198.51.100.1"),
+        (_scope("127.0.0.1", "10.9.9.9", "198.51.100.1"), "198.51.100.1"),
+        (_scope("127.0.0.1", "198.51.100.1, 10.0.0.5"), "198.51.100.1"),
+        (_scope("127.0.0.1"), "127.0.0.1"),
+    ],
+)
+def test_client_address(scope, expected, monkeypatch):
+    monkeypatch.setattr(settings, "FORWARDED_ALLOW_IPS", "127.0.0.1, 10.0.0.0/24")
+    assert client_address(scope) == expected
+
+
+@pytest.fixture
+def limited(database, monkeypatch):
+    """Rate limiting on, with two reads per client before a 429."""
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(ratelimit, "buckets", MemoryBuckets())
+    monkeypatch.setitem(ratelimit.LIMITS, "read", Limit(per_second=0.01, burst=2))
+
+
+async def _statuses(client, path: str, forwarded: str, times: int = 3) -> list[int]:
+    return [
+        (await client.get(path, headers={"X-Forwarded-For": forwarded})).status_code
+        for _ in range(times)
+    ]
+
+
+async def test_anonymous_clients_get_their_own_buckets(limited):
+    async with api_client() as client:
+        first = await _statuses(client, "/auth/me", "198.51.100.1")
+        second = await _statuses(client, "/auth/me", "198.51.100.2")
+    assert first == [401, 401, 429]
+    assert second == [401, 401, 429]
+
+
+@pytest.mark.parametrize(
+    "path", ["/uploads/someone/0123456789abcdef0123456789abcdef.png", "/portfolio/nobody"]
+)
+async def test_static_and_public_reads_are_not_limited(path, limited):
+    async with api_client() as client:
+        statuses = await _statuses(client, path, "198.51.100.3", times=5)
+    assert 429 not in statuses
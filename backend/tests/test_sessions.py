@@ -0,0 +1,66 @@
+import re
+
+import pytest
+from sqlalchemy import event
+
+from app.db.session import RoutingSession
+from conftest import api_client, create_user
+
+pytestmark = pytest.mark.anyio
+
+# Anywhere in the statement: a WITH can wrap any of them
+WRITE = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+CREATES = [
+    ("/experiences", {"company": "Acme", "role": "Engineer", "start_date": "2024-01-01"}),
+    ("/certifications", {"name": "CKA", "issuer": "CNCF", "issue_date": "2024-03-01"}),
+]
+
+
+@pytest.fixture
+def commits():
+    count = []
+
+    def on_commit(session):
+        count.append(session)
+
+    event.listen(RoutingSession, "after_commit", on_commit)
+    yield count
+    event.remove(RoutingSession, "after_commit", on_commit)
+
+
+@pytest.fixture(scope="module")
+async def user_id(database):
+    return await create_user("sessions@example.com")
+
+
+@pytest.mark.parametrize("path,payload", CREATES, ids=[path for path, _ in CREATES])
+async def test_create_is_one_insert(path, payload, user_id, query_budget):
+    async with api_client(user_id) as client:
+        # The current user lookup, then the INSERT; no refresh after it
+        with query_budget(statements=2) as recorder:
+            response = await client.post(path, json=payload)
+    assert response.status_code == 201, response.text
+    assert recorder.statements[-1].sql.lstrip().upper().startswith("INSERT")
+
+
+@pytest.mark.parametrize(
+    "path", ["/problems", "/experiences", "/dashboard/stats", "/bootstrap"]
+)
+async def test_get_runs_no_writes_and_never_commits(path, user_id, query_budget, commits):
+    async with api_client(user_id) as client:
+        with query_budget(statements=10) as recorder:
+            response = await client.get(path)
+    assert response.status_code == 200, response.text
+    assert all(
+        s.sql.lstrip().upper().startswith(("SELECT", "WITH")) and not WRITE.search(s.sql)
+        for s in recorder.statements
+    ), recorder.report()
+    assert commits == []
+
+
+async def test_write_commits_once(user_id, commits):
+    async with api_client(user_id) as client:
+        response = await client.post("/experiences", json=CREATES[0][1])
+    assert response.status_code == 201
+    assert len(commits) == 1
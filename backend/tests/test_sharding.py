@@ -0,0 +1,178 @@
+import uuid
+from collections import Counter
+
+import httpx
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.db import rebalance, session
+from app.db.base import Base
+from app.db.session import ShardRouter
+from app.models.company import CompanyAlias
+from app.models.interview_question import InterviewQuestion
+from app.models.problem import Problem
+from app.models.shard_directory import ShardDirectory
+
+pytestmark = pytest.mark.anyio
+
+QUESTION = {
+    "question": "How would you shard a sessions table?",
+    "answer": "By user id",
+    "company": "Acme Inc.",
+    "asked_date": "2024-05-01",
+}
+
+
+@pytest.fixture
+async def shards(database, tmp_path, monkeypatch):
+    """The in-memory primary plus two SQLite files as shards 1 and 2."""
+    from app.api.v1.endpoints import auth
+
+    extra = [
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path / f'shard{i}.db'}")
+        for i in (1, 2)
+    ]
+    for shard_engine in extra:
+        async with shard_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        monkeypatch.setitem(
+            session._read_only_engines,
+            id(shard_engine),
+            shard_engine.sync_engine.execution_options(postgresql_readonly=True),
+        )
+    engines = [session.engine, *extra]
+    router = ShardRouter(engines)
+    for module in (session, rebalance):
+        monkeypatch.setattr(module, "shard_engines", engines)
+    for module in (session, rebalance, auth):
+        monkeypatch.setattr(module, "shard_router", router)
+    monkeypatch.setattr(settings, "SHARD_DIRECTORY_CACHE_SECONDS", 0)
+    monkeypatch.setattr(rebalance, "DRAIN_SECONDS", 0)
+    yield engines
+    for shard_engine in extra:
+        await shard_engine.dispose()
+
+
+async def _register(email: str) -> tuple[str, httpx.AsyncClient]:
+    from conftest import api_client
+
+    async with api_client() as anonymous:
+        response = await anonymous.post(
+            "/auth/register",
+            json={"email": email, "full_name": "Sharded", "password": "hunter22"},
+        )
+    assert response.status_code == 201, response.text
+    body = response.json()
+    client = api_client()
+    client.headers["Authorization"] = f"Bearer {body['access_token']}"
+    return body["user"]["id"], client
+
+
+async def _count(shard_engine, model, user_id: str) -> int:
+    async with shard_engine.connect() as conn:
+        return (
+            await conn.execute(
+                select(func.count()).select_from(model).where(model.user_id == user_id)
+            )
+        ).scalar()
+
+
+def test_ring_is_stable_and_balanced():
+    users = [str(uuid.uuid4()) for _ in range(3000)]
+    three = ShardRouter([None] * 3)
+    placements = [three.ring_shard(user) for user in users]
+
+    assert placements == [ShardRouter([None] * 3).ring_shard(user) for user in users]
+    for shard, count in Counter(placements).items():
+        assert 0.2 < count / len(users) < 0.47, (shard, count)
+
+    # A fourth shard only takes users over; nobody moves between old shards
+    four = ShardRouter([None] * 4)
+    moved = [
+        (before, four.ring_shard(user))
+        for user, before in zip(users, placements)
+        if four.ring_shard(user) != before
+    ]
+    assert 0.1 < len(moved) / len(users) < 0.4
+    assert all(after == 3 for _, after in moved)
+
+
+async def test_directory_overrides_ring(shards):
+    router = session.shard_router
+    user_id = str(uuid.uuid4())
+    ring = router.ring_shard(user_id)
+    override = (ring + 1) % len(shards)
+    async with session.engine.begin() as conn:
+        await conn.execute(
+            ShardDirectory.__table__.insert().values(user_id=user_id, shard=override)
+        )
+
+    placement = await router.lookup(user_id)
+
+    assert placement.shard == override
+    assert not placement.moving
+
+
+async def test_new_users_are_pinned_to_their_ring_shard(shards):
+    user_id, client = await _register("pinned@example.com")
+    async with client:
+        response = await client.post("/problems", json={
+            "title": "Pinned",
+            "difficulty": "Easy",
+            "situation": "s",
+            "task": "t",
+            "action": "a",
+            "result": "r",
+            "tags": [],
+        })
+    assert response.status_code == 201
+
+    shard = session.shard_router.ring_shard(user_id)
+    assert (await session.shard_router.lookup(user_id)).shard == shard
+    assert await _count(shards[shard], Problem, user_id) == 1
+
+
+async def test_move_user_copies_rows_and_company_aliases(shards):
+    user_id, client = await _register("mover@example.com")
+    async with client:
+        created = await client.post("/interview-questions", json=QUESTION)
+        assert created.status_code == 201
+        source = (await session.shard_router.lookup(user_id)).shard
+        target = (source + 1) % len(shards)
+
+        await rebalance.move_user(user_id, target)
+
+        assert (await session.shard_router.lookup(user_id)).shard == target
+        assert await _count(shards[source], InterviewQuestion, user_id) == 0
+        assert await _count(shards[target], InterviewQuestion, user_id) == 1
+        listed = await client.get("/interview-questions")
+        assert [q["id"] for q in listed.json()] == [created.json()["id"]]
+
+        async with shards[target].connect() as conn:
+            aliases = dict(
+                (await conn.execute(select(CompanyAlias.alias, CompanyAlias.company_id))).all()
+            )
+        company_id = listed.json()[0]["company_id"]
+        assert aliases["Acme Inc."] == aliases["acme"] == company_id
+
+        # The moved company is found by alias, not created again
+        again = await client.post("/interview-questions", json=QUESTION)
+        assert again.json()["company_id"] == company_id
+
+
+async def test_writes_refused_while_moving(shards):
+    user_id, client = await _register("moving@example.com")
+    shard = (await session.shard_router.lookup(user_id)).shard
+    await rebalance._set_placement(user_id, shard, moving=True)
+    try:
+        async with client:
+            refused = await client.post("/learnings", json={"topic": "WAL", "tags": []})
+            read = await client.get("/learnings")
+    finally:
+        await rebalance._set_placement(user_id, shard, moving=False)
+
+    assert refused.status_code == 503
+    assert refused.headers["Retry-After"] == "1"
+    assert read.status_code == 200
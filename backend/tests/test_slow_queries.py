@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from app.db.slow_queries import SlowQueryLog, normalize_sql
+
+WITH_UPDATE = (
+    "WITH v (id, n) AS (VALUES (1, 1)) "
+    "UPDATE counters SET n = counters.n + v.n FROM v WHERE counters.id = v.id"
+)
+
+
+class _Cursor:
+    def __init__(self, executed: list[str]):
+        self.executed = executed
+
+    def execute(self, sql, parameters=None):
+        self.executed.append(sql)
+
+    def fetchall(self):
+        return [("Seq Scan on counters",)]
+
+    def close(self):
+        pass
+
+
+def _postgres_connection(executed: list[str]):
+    return SimpleNamespace(
+        dialect=SimpleNamespace(name="postgresql"),
+        connection=SimpleNamespace(cursor=lambda: _Cursor(executed)),
+    )
+
+
+@pytest.mark.parametrize(
+    "statement,prefix",
+    [
+        ("SELECT * FROM counters", "EXPLAIN (ANALYZE, BUFFERS) SELECT"),
+        (WITH_UPDATE, "EXPLAIN WITH"),
+        ("WITH v AS (SELECT 1) SELECT * FROM v", "EXPLAIN WITH"),
+    ],
+)
+def test_postgres_explain_never_keeps_side_effects(statement, prefix):
+    executed = []
+    plan = SlowQueryLog(0, 1.0)._explain(_postgres_connection(executed), statement, {})
+
+    assert plan == "Seq Scan on counters"
+    assert executed[0] == "SAVEPOINT slow_query_explain"
+    assert executed[1].startswith(prefix)
+    # Rolled back even though the EXPLAIN succeeded
+    assert executed[2:] == [
+        "ROLLBACK TO SAVEPOINT slow_query_explain",
+        "RELEASE SAVEPOINT slow_query_explain",
+    ]
+
+
+def test_slow_with_update_runs_once():
+    engine = create_engine("sqlite://")
+    log = SlowQueryLog(threshold_ms=0, explain_rate=1.0)
+    event.listen(engine, "before_cursor_execute", log.before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", log.after_cursor_execute)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE counters (id INTEGER PRIMARY KEY, n INTEGER)"))
+        conn.execute(text("INSERT INTO counters VALUES (1, 0)"))
+        conn.execute(text(WITH_UPDATE))
+        assert conn.execute(text("SELECT n FROM counters")).scalar() == 1
+
+    stats = {s.sql: s for s in log.top(10)}
+    assert stats[normalize_sql(WITH_UPDATE)].count == 1
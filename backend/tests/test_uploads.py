@@ -0,0 +1,64 @@
+import pytest
+
+from app.services.storage import StorageBackend, is_user_key, new_key
+from conftest import api_client, create_user
+
+pytestmark = pytest.mark.anyio
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * 64
+
+
+@pytest.fixture(scope="module")
+async def user_id(database):
+    return await create_user("uploads@example.com")
+
+
+def test_key_extension_comes_from_content_type():
+    key = new_key("u1", "image/png")
+    assert key.startswith("u1/") and key.endswith(".png")
+    assert is_user_key("u1", key)
+    assert not is_user_key("u2", key)
+
+
+@pytest.mark.parametrize("name", ["x.html", "x.svg", "x.js", "x.png.html"])
+def test_keys_with_other_extensions_are_not_user_keys(name):
+    stem = new_key("u1", "image/png").split("/")[1].split(".")[0]
+    assert not is_user_key("u1", f"u1/{stem}.{name.split('.', 1)[1]}")
+
+
+async def test_client_filename_does_not_pick_the_extension(user_id):
+    async with api_client(user_id) as client:
+        ticket = await client.post(
+            "/uploads/presign",
+            json={"filename": "avatar.html", "content_type": "image/png", "size": len(PNG)},
+        )
+        assert ticket.status_code == 200, ticket.text
+        key = ticket.json()["key"]
+        assert key.endswith(".png")
+
+        upload = ticket.json()["upload"]
+        sent = await client.put(
+            upload["url"].removeprefix("/api/v1"), content=PNG, headers=upload["headers"]
+        )
+        assert sent.status_code == 204
+        finalized = await client.post("/uploads/finalize", json={"key": key})
+    assert finalized.status_code == 200
+    assert finalized.json()["url"].endswith(".png")
+
+
+async def test_multipart_upload_ignores_filename(user_id):
+    async with api_client(user_id) as client:
+        response = await client.post(
+            "/uploads", files={"file": ("page.html", PNG, "image/png")}
+        )
+    assert response.status_code == 200
+    assert response.json()["url"].endswith(".png")
+
+
+def test_backend_must_implement_every_operation():
+    class Partial(StorageBackend):
+        def public_url(self, key):
+            return key
+
+    with pytest.raises(TypeError):
+        Partial()
@@ -2,9 +2,12 @@ import { Outlet, Navigate } from "react-router-dom";
 import { Sidebar } from "./sidebar";
 import { Header } from "./header";
 import { useAuthStore } from "@/store/auth-store";
+import { useBootstrap } from "@/hooks/use-bootstrap";
 
 export function DashboardLayout() {
   const token = useAuthStore((s) => s.token);
+  // Pages render once it settles; if it fails they fetch their own data
+  const bootstrap = useBootstrap();
 
   if (!token) {
     return <Navigate to="/landing" replace />;
@@ -16,7 +19,13 @@ export function DashboardLayout() {
       <div className="flex flex-1 flex-col overflow-hidden">
         <Header />
         <main className="flex-1 overflow-y-auto p-4 md:p-6">
-          <Outlet />
+          {bootstrap.isPending ? (
+            <div className="flex h-full items-center justify-center">
+              <div className="h-8 w-8 animate-spin rounded-full border-4 border-primary border-t-transparent" />
+            </div>
+          ) : (
+            <Outlet />
+          )}
         </main>
       </div>
     </div>
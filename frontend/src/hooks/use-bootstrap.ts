@@ -0,0 +1,40 @@
+import { useQuery, useQueryClient } from "@tanstack/react-query";
+import api from "@/lib/axios";
+import { useAuthStore } from "@/store/auth-store";
+import type { Bootstrap } from "@/types";
+
+/**
+ * Loads what the first screen needs in one request and seeds the caches
+ * the individual hooks read, so they don't each fetch on first load
+ */
+export function useBootstrap() {
+  const token = useAuthStore((s) => s.token);
+  const setUser = useAuthStore((s) => s.setUser);
+  const queryClient = useQueryClient();
+
+  return useQuery({
+    // Per sign-in, so another account never sees the previous one's data
+    queryKey: ["bootstrap", token],
+    queryFn: async () => {
+      const res = await api.get<Bootstrap>("/bootstrap");
+      const data = res.data;
+      setUser(data.user);
+      queryClient.setQueryData(["me"], data.user);
+      queryClient.setQueryData(["dashboard", "stats"], data.stats);
+      queryClient.setQueryData(
+        ["problems", { page: 1, size: data.problems.size }],
+        data.problems
+      );
+      queryClient.setQueryData(
+        ["learnings", { page: 1, size: data.learnings.size }],
+        data.learnings
+      );
+      queryClient.setQueryData(["experiences"], data.experiences);
+      queryClient.setQueryData(["certifications"], data.certifications);
+      return data;
+    },
+    enabled: !!token,
+    staleTime: Infinity,
+    retry: false,
+  });
+}
@@ -53,6 +53,7 @@ export interface ProblemUpdate {
 export interface ProblemListResponse {
   items: Problem[];
   total: number;
+  has_more: boolean;
   page: number;
   size: number;
 }
@@ -130,6 +131,7 @@ export interface LearningCreate {
 export interface LearningListResponse {
   items: Learning[];
   total: number;
+  has_more: boolean;
   page: number;
   size: number;
 }
@@ -141,3 +143,12 @@ export interface DashboardStats {
   problems_by_difficulty: Record<string, number>;
   recent_problems: Problem[];
 }
+
+export interface Bootstrap {
+  user: User;
+  stats: DashboardStats;
+  problems: ProblemListResponse;
+  learnings: LearningListResponse;
+  experiences: Experience[];
+  certifications: Certification[];
+}